@@ -2,11 +2,10 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
 
-# Import the database module to ensure the database is created
-import infra.db  # noqa: F401
 from alembic import context
 from configs import db
 from infra import models
+from infra.db import ensure_database
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -14,6 +13,9 @@ config = context.config
 
 config.set_main_option("sqlalchemy.url", db.configs.connection_string)
 
+# The database is not created on import, so create it before migrating
+ensure_database()
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -0,0 +1,55 @@
+"""Add embedding cache
+
+Revision ID: 3f1c2a7d9b41
+Revises: b69824333701
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a7d9b41"
+down_revision: Union[str, None] = "b69824333701"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade"""
+    op.create_table(
+        "embedding_cache",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("num_dim", sa.Integer(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        schema="public",
+    )
+    op.create_index(
+        op.f("ix_public_embedding_cache_created_at"),
+        "embedding_cache",
+        ["created_at"],
+        unique=False,
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade"""
+    op.drop_index(
+        op.f("ix_public_embedding_cache_created_at"),
+        table_name="embedding_cache",
+        schema="public",
+    )
+    op.drop_table("embedding_cache", schema="public")
@@ -0,0 +1,132 @@
+"""Store recipe fields as JSONB
+
+Revision ID: 8c2e5d4a7f10
+Revises: 3f1c2a7d9b41
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+
+from typing import Any, Dict, List, Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from infra import models
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2e5d4a7f10"
+down_revision: Union[str, None] = "3f1c2a7d9b41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["ingredients", "directions", "tips", "utensils", "nutrition"]
+BATCH_SIZE = 500
+
+
+def ingredients_to_json(ingredients: List[Any]) -> List[Dict[str, Any]]:
+    """Convert the pickled ingredients to JSON"""
+    return [
+        {
+            "name": ingredient.name,
+            "quantity": ingredient.quantity,
+            "unit": ingredient.unit,
+        }
+        for ingredient in ingredients
+    ]
+
+
+def nutrition_to_json(nutrition: Any) -> Dict[str, str]:
+    """Convert the pickled nutrition to JSON"""
+    return {
+        "calories": str(nutrition.calories),
+        "fat": str(nutrition.fat),
+        "protein": str(nutrition.protein),
+        "carbs": str(nutrition.carbs),
+    }
+
+
+def convert(old_type: sa.types.TypeEngine, new_type: sa.types.TypeEngine):
+    """Copy every recipe column into a column of the new type"""
+    for column in COLUMNS:
+        op.add_column(
+            "recipe",
+            sa.Column(f"{column}_new", new_type, nullable=True),
+            schema="public",
+        )
+
+    recipe = sa.table(
+        "recipe",
+        sa.column("id", sa.Integer()),
+        *(sa.column(column, old_type) for column in COLUMNS),
+        *(sa.column(f"{column}_new", new_type) for column in COLUMNS),
+        schema="public",
+    )
+
+    connection = op.get_bind()
+    ids = connection.execute(sa.select(recipe.c.id)).scalars().all()
+
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = connection.execute(
+            sa.select(recipe.c.id, *(recipe.c[column] for column in COLUMNS))
+            .where(recipe.c.id.in_(ids[start : start + BATCH_SIZE]))
+        ).all()
+
+        for row in rows:
+            connection.execute(
+                recipe.update()
+                .where(recipe.c.id == row.id)
+                .values(**convert_row(row, old_type))
+            )
+
+    for column in COLUMNS:
+        op.drop_column("recipe", column, schema="public")
+        op.alter_column(
+            "recipe",
+            f"{column}_new",
+            new_column_name=column,
+            nullable=False,
+            schema="public",
+        )
+
+
+def convert_row(row: sa.Row, old_type: sa.types.TypeEngine) -> Dict[str, Any]:
+    """Convert the recipe columns of a row to the other storage"""
+    if isinstance(old_type, sa.PickleType):
+        return {
+            "ingredients_new": ingredients_to_json(row.ingredients),
+            "directions_new": list(row.directions),
+            "tips_new": list(row.tips),
+            "utensils_new": list(row.utensils),
+            "nutrition_new": nutrition_to_json(row.nutrition),
+        }
+
+    return {
+        "ingredients_new": [
+            models.RecipeModelIngredient.from_dict(ingredient)
+            for ingredient in row.ingredients
+        ],
+        "directions_new": row.directions,
+        "tips_new": row.tips,
+        "utensils_new": row.utensils,
+        "nutrition_new": models.RecipeModelNutrition.from_dict(row.nutrition),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade"""
+    convert(sa.PickleType(), postgresql.JSONB())
+    op.create_index(
+        "ix_recipe_nutrition",
+        "recipe",
+        ["nutrition"],
+        unique=False,
+        schema="public",
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade"""
+    op.drop_index("ix_recipe_nutrition", table_name="recipe", schema="public")
+    convert(postgresql.JSONB(), sa.PickleType())
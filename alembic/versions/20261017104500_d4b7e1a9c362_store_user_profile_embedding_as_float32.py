@@ -0,0 +1,88 @@
+"""Store user profile embedding as float32
+
+Revision ID: d4b7e1a9c362
+Revises: 8c2e5d4a7f10
+Create Date: 2026-10-17 10:45:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4b7e1a9c362"
+down_revision: Union[str, None] = "8c2e5d4a7f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def convert(old_type: sa.types.TypeEngine, new_type: sa.types.TypeEngine):
+    """Copy the embedding column into a column of the new type"""
+    op.add_column(
+        "user_profile",
+        sa.Column("embedding_new", new_type, nullable=True),
+        schema="public",
+    )
+
+    user_profile = sa.table(
+        "user_profile",
+        sa.column("username", sa.String()),
+        sa.column("embedding", old_type),
+        sa.column("embedding_new", new_type),
+        schema="public",
+    )
+
+    connection = op.get_bind()
+    usernames = (
+        connection.execute(sa.select(user_profile.c.username)).scalars().all()
+    )
+
+    for start in range(0, len(usernames), BATCH_SIZE):
+        rows = connection.execute(
+            sa.select(user_profile.c.username, user_profile.c.embedding).where(
+                user_profile.c.username.in_(
+                    usernames[start : start + BATCH_SIZE]
+                )
+            )
+        ).all()
+
+        for row in rows:
+            if isinstance(old_type, sa.PickleType):
+                embedding = np.asarray(
+                    row.embedding, dtype=np.float32
+                ).tobytes()
+            else:
+                embedding = np.frombuffer(
+                    row.embedding, dtype=np.float32
+                ).tolist()
+
+            connection.execute(
+                user_profile.update()
+                .where(user_profile.c.username == row.username)
+                .values(embedding_new=embedding)
+            )
+
+    op.drop_column("user_profile", "embedding", schema="public")
+    op.alter_column(
+        "user_profile",
+        "embedding_new",
+        new_column_name="embedding",
+        nullable=False,
+        schema="public",
+    )
+
+
+def upgrade() -> None:
+    """Upgrade"""
+    convert(sa.PickleType(), sa.LargeBinary())
+
+
+def downgrade() -> None:
+    """Downgrade"""
+    convert(sa.LargeBinary(), sa.PickleType())
@@ -0,0 +1,33 @@
+"""Add recipe content hash
+
+Revision ID: 5e8a3c1f7b92
+Revises: d4b7e1a9c362
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8a3c1f7b92"
+down_revision: Union[str, None] = "d4b7e1a9c362"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade"""
+    op.add_column(
+        "recipe",
+        sa.Column("content_hash", sa.String(), nullable=True),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade"""
+    op.drop_column("recipe", "content_hash", schema="public")
@@ -0,0 +1,48 @@
+import asyncio
+from typing import AsyncIterator
+
+import grpc
+from sqlalchemy.exc import NoResultFound
+
+from apis.servicer import RecipeSearchServicer
+from domain import controllers
+from protos.chat_by_recipe_pb2 import (
+    ChatByRecipeRequest,
+    ChatByRecipeStreamResponse,
+)
+
+
+class AsyncRecipeSearchServicer(RecipeSearchServicer):
+    """Service class to implement the recipe search service on asyncio
+
+    Chat streams are served on the event loop, so they do not hold a thread
+    while waiting for the model. The other methods are inherited and run on
+    the migration thread pool of the server.
+    """
+
+    async def ChatByRecipeStream(
+        self,
+        request: ChatByRecipeRequest,
+        context: grpc.aio.ServicerContext,
+    ) -> AsyncIterator[ChatByRecipeStreamResponse]:
+        """Chat with the model by recipe and return a stream of messages"""
+        try:
+            recipe, profile = await asyncio.to_thread(
+                controllers.get_recipe_and_user_profile,
+                request.id,
+                request.username,
+            )
+        except NoResultFound:
+            await context.abort(
+                grpc.StatusCode.NOT_FOUND,
+                f"Recipe with ID {request.id} not found",
+            )
+
+        messages = self._chat_messages_from_proto(request.messages)
+
+        async for message in controllers.chat_by_recipe_stream_async(
+            request.name, request.username, recipe, profile, messages
+        ):
+            response = self._chat_stream_model_to_proto(message)
+            if response is not None:
+                yield response
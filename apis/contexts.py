@@ -0,0 +1,20 @@
+from typing import NoReturn
+
+import grpc
+
+
+def abort(
+    context: grpc.ServicerContext, code: grpc.StatusCode, details: str
+) -> NoReturn:
+    """Abort the RPC with a status, also from a synchronous method on aio.
+
+    The context of a synchronous method run by a grpc.aio server sends the
+    status without raising, so the method is ended here instead.
+
+    Arguments:
+        context (grpc.ServicerContext): The context of the RPC.
+        code (grpc.StatusCode): The status code.
+        details (str): The status details.
+    """
+    context.abort(code, details)
+    raise grpc.RpcError(details)
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from concurrent import futures
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from protos.health_pb2 import HealthCheck, HealthStatus
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """Concurrent health checks with deadlines and cached results
+
+    Each check runs in its own thread. A check that fails or misses the
+    deadline is UNHEALTHY, and a check that passes slower than the latency
+    threshold is DEGRADED. A check still running from an earlier round is not
+    started again, so a hung dependency holds one thread at most. Results are
+    cached, so a flood of probes checks the dependencies once per window.
+    Non-critical checks, e.g. of third-party services the process cannot
+    fix by restarting, only degrade the overall status when they fail.
+    """
+
+    checks: Sequence[Tuple[str, Callable[[], bool]]]
+    timeout: float
+    degraded: float
+    ttl: float
+    non_critical: Set[str]
+    executor: futures.ThreadPoolExecutor
+    _pending: Dict[str, futures.Future]
+    _results: Optional[List[HealthCheck]]
+    _expires: float
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        checks: Sequence[Tuple[str, Callable[[], bool]]],
+        timeout: float,
+        degraded: float,
+        ttl: float,
+        non_critical: Iterable[str] = (),
+    ):
+        self.checks = checks
+        self.timeout = timeout
+        self.degraded = degraded
+        self.ttl = ttl
+        self.non_critical = set(non_critical)
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=len(checks), thread_name_prefix="health"
+        )
+        self._pending = {}
+        self._results = None
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def check(self) -> List[HealthCheck]:
+        """Get the results of the checks, running them if not cached.
+
+        Concurrent callers wait for the same round of checks.
+
+        Returns:
+            List[HealthCheck]: The results, in the order of the checks.
+        """
+        with self._lock:
+            if self._results is None or time.monotonic() >= self._expires:
+                self._results = self._run()
+                self._expires = time.monotonic() + self.ttl
+
+            return self._results
+
+    def status(self, checks: Iterable[HealthCheck]) -> HealthStatus:
+        """Get the overall status of check results.
+
+        Arguments:
+            checks (Iterable[HealthCheck]): The check results.
+
+        Returns:
+            HealthStatus: UNHEALTHY if a critical check is unhealthy, DEGRADED
+                if any other check is not healthy, HEALTHY otherwise.
+        """
+        status = HealthStatus.HEALTHY
+
+        for check in checks:
+            if check.status == HealthStatus.HEALTHY:
+                continue
+            if (
+                check.status == HealthStatus.UNHEALTHY
+                and check.name not in self.non_critical
+            ):
+                return HealthStatus.UNHEALTHY
+            status = HealthStatus.DEGRADED
+
+        return status
+
+    def _run(self) -> List[HealthCheck]:
+        """Run the checks and wait for them until the deadline.
+
+        Returns:
+            List[HealthCheck]: The results, in the order of the checks.
+        """
+        for name, check in self.checks:
+            pending = self._pending.get(name)
+            if pending is None or pending.done():
+                self._pending[name] = self.executor.submit(self._timed, check)
+
+        futures.wait(self._pending.values(), timeout=self.timeout)
+
+        return [
+            HealthCheck(name=name, status=self._status(name))
+            for name, _ in self.checks
+        ]
+
+    def _status(self, name: str) -> HealthStatus:
+        """Get the status of a check from its latest run.
+
+        Arguments:
+            name (str): The name of the check.
+
+        Returns:
+            HealthStatus: The status.
+        """
+        pending = self._pending[name]
+        if not pending.done():
+            logger.warning(
+                f"Health check {name} timed out after {self.timeout}s"
+            )
+            return HealthStatus.UNHEALTHY
+
+        try:
+            healthy, latency = pending.result()
+        except Exception as e:
+            logger.error(f"Health check {name} failed: {e}")
+            return HealthStatus.UNHEALTHY
+
+        if not healthy:
+            return HealthStatus.UNHEALTHY
+        if latency > self.degraded:
+            logger.warning(f"Health check {name} took {latency:.2f}s")
+            return HealthStatus.DEGRADED
+        return HealthStatus.HEALTHY
+
+    @staticmethod
+    def _timed(check: Callable[[], bool]) -> Tuple[bool, float]:
+        """Run a check and measure its latency.
+
+        Arguments:
+            check (Callable[[], bool]): The check.
+
+        Returns:
+            Tuple[bool, float]: Whether it passed, and its latency in seconds.
+        """
+        start = time.monotonic()
+        healthy = check()
+        return healthy, time.monotonic() - start
@@ -0,0 +1,150 @@
+import functools
+import inspect
+import logging
+import threading
+from enum import StrEnum
+from typing import Any, Callable, Dict
+
+import grpc
+
+from apis import contexts
+from configs import api
+
+logger = logging.getLogger(__name__)
+
+
+class RpcLane(StrEnum):
+    """Lane of the RPCs"""
+
+    FAST = "fast"
+    SLOW = "slow"
+
+
+SLOW_RPCS = {
+    "ChatByRecipe",
+    "ChatByRecipeStream",
+    "AddRecipes",
+    "AddRecipesStream",
+    "ResetData",
+}
+"""RPCs that wait for the language model or do bulk work, every other RPC
+runs in the fast lane"""
+
+UNLIMITED_RPCS = {"GetHealth"}
+"""RPCs outside of the lanes, so health probes are answered under load"""
+
+
+class RpcLimiter:
+    """Concurrency limit of one lane
+
+    The RPCs run on the server thread that received them. An RPC arriving
+    when the lane already runs its limit waits for a slot up to the timeout,
+    then is rejected with RESOURCE_EXHAUSTED, so a burst in one lane cannot
+    take over the server threads needed by the other lane.
+    """
+
+    name: str
+    capacity: int
+    timeout: float
+    _slots: threading.BoundedSemaphore
+
+    def __init__(self, name: str, capacity: int, timeout: float = 0):
+        self.name = name
+        self.capacity = capacity
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(capacity)
+
+    def wrap(self, method: Callable) -> Callable:
+        """Wrap a servicer method to run within the limit of the lane.
+
+        Arguments:
+            method (Callable): The servicer method.
+
+        Returns:
+            Callable: The wrapped method.
+        """
+        if inspect.isgeneratorfunction(method):
+
+            @functools.wraps(method)
+            def stream(request: Any, context: grpc.ServicerContext):
+                self._acquire(context)
+                try:
+                    yield from method(request, context)
+                finally:
+                    self._slots.release()
+
+            return stream
+
+        @functools.wraps(method)
+        def unary(request: Any, context: grpc.ServicerContext):
+            self._acquire(context)
+            try:
+                return method(request, context)
+            finally:
+                self._slots.release()
+
+        return unary
+
+    def _acquire(self, context: grpc.ServicerContext):
+        """Take a slot in the lane or abort the RPC if it stays full.
+
+        Arguments:
+            context (grpc.ServicerContext): The context of the RPC.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            logger.warning(f"RPC lane {self.name} is full, rejecting RPC")
+            contexts.abort(
+                context,
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                "Server is busy, please try again later",
+            )
+
+
+class IsolatedServicer:
+    """Servicer proxy limiting each synchronous method by its lane
+
+    Coroutine and asynchronous generator methods are passed through as they
+    do not block a thread, and so are the RPCs outside of the lanes.
+    """
+
+    lanes: Dict[RpcLane, RpcLimiter]
+    _servicer: Any
+
+    def __init__(self, servicer: Any, lanes: Dict[RpcLane, RpcLimiter]):
+        self._servicer = servicer
+        self.lanes = lanes
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._servicer, name)
+
+        if (
+            not name[:1].isupper()
+            or name in UNLIMITED_RPCS
+            or not callable(method)
+            or inspect.iscoroutinefunction(method)
+            or inspect.isasyncgenfunction(method)
+        ):
+            return method
+
+        lane = RpcLane.SLOW if name in SLOW_RPCS else RpcLane.FAST
+        return self.lanes[lane].wrap(method)
+
+
+def create_lanes() -> Dict[RpcLane, RpcLimiter]:
+    """Create the lane limiters from the API configuration.
+
+    Returns:
+        Dict[RpcLane, RpcLimiter]: The limiter of each lane.
+    """
+    return {
+        RpcLane.FAST: RpcLimiter(
+            RpcLane.FAST,
+            api.configs.api_fast_rpc_limit,
+            timeout=api.configs.api_rpc_wait_seconds,
+        ),
+        RpcLane.SLOW: RpcLimiter(
+            RpcLane.SLOW,
+            api.configs.api_slow_rpc_limit,
+            timeout=api.configs.api_rpc_wait_seconds,
+        ),
+    }
@@ -1,25 +1,27 @@
+import asyncio
 import logging
 from concurrent import futures
+from typing import Dict
 
 import grpc
 from grpc_reflection.v1alpha import reflection
 
+from apis import lanes
+from apis.async_servicer import AsyncRecipeSearchServicer
 from apis.servicer import RecipeSearchServicer
 from configs import api
+from domain import controllers
 from protos import service_pb2, service_pb2_grpc
 
 logger = logging.getLogger(__name__)
 
 
-def start():
-    """Start the API server."""
-    port = api.configs.api_port
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    service_pb2_grpc.add_RecipeSearchServiceServicer_to_server(
-        RecipeSearchServicer(), server
-    )
+def enable_reflection(server: grpc.Server | grpc.aio.Server):
+    """Enable the server reflection.
 
-    # Reflection
+    Arguments:
+        server (grpc.Server | grpc.aio.Server): The server.
+    """
     SERVICE_NAMES = (
         service_pb2.DESCRIPTOR.services_by_name[
             "RecipeSearchService"
@@ -28,8 +30,78 @@ def start():
     )
     reflection.enable_server_reflection(SERVICE_NAMES, server)
 
+
+def create_thread_pool(
+    rpc_lanes: Dict[lanes.RpcLane, lanes.RpcLimiter],
+) -> futures.ThreadPoolExecutor:
+    """Create the thread pool receiving the RPCs.
+
+    The RPCs run on the server threads, so by default there is one for
+    every RPC the lanes can run, and one for every RPC waiting for a lane
+    or exempt from them.
+
+    Arguments:
+        rpc_lanes (Dict[lanes.RpcLane, lanes.RpcLimiter]): The lanes.
+
+    Returns:
+        futures.ThreadPoolExecutor: The thread pool.
+    """
+    return futures.ThreadPoolExecutor(
+        max_workers=(
+            api.configs.api_max_workers
+            or 2 * sum(lane.capacity for lane in rpc_lanes.values())
+        ),
+    )
+
+
+def start():
+    """Start the API server."""
+    if api.configs.api_async:
+        asyncio.run(start_async())
+        return
+
+    port = api.configs.api_port
+    rpc_lanes = lanes.create_lanes()
+    server = grpc.server(
+        create_thread_pool(rpc_lanes),
+        options=api.configs.server_options,
+        maximum_concurrent_rpcs=api.configs.api_maximum_concurrent_rpcs,
+    )
+    service_pb2_grpc.add_RecipeSearchServiceServicer_to_server(
+        lanes.IsolatedServicer(RecipeSearchServicer(), rpc_lanes), server
+    )
+
+    # Reflection
+    enable_reflection(server)
+
     # Start the server
     server.add_insecure_port(f"[::]:{port}")
     server.start()
     logger.info(f"Server started, listening on {port}")
+    controllers.start_up()
     server.wait_for_termination()
+
+
+async def start_async():
+    """Start the API server on asyncio."""
+    port = api.configs.api_port
+    rpc_lanes = lanes.create_lanes()
+    server = grpc.aio.server(
+        create_thread_pool(rpc_lanes),
+        options=api.configs.server_options,
+        maximum_concurrent_rpcs=api.configs.api_maximum_concurrent_rpcs,
+    )
+    service_pb2_grpc.add_RecipeSearchServiceServicer_to_server(
+        lanes.IsolatedServicer(AsyncRecipeSearchServicer(), rpc_lanes),
+        server,
+    )
+
+    # Reflection
+    enable_reflection(server)
+
+    # Start the server
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    logger.info(f"Async server started, listening on {port}")
+    controllers.start_up()
+    await server.wait_for_termination()
@@ -1,16 +1,24 @@
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import grpc
 from sqlalchemy.exc import NoResultFound
 
+from apis import contexts
+from apis.health import HealthChecker
+from configs.api import configs as api_configs
 from configs.domain import configs as domain_configs
 from domain import controllers
+from domain.caches import LRUCache
+from domain.model_types import StartupState
 from infra import db, models
 from protos.add_recipes_pb2 import (
     AddRecipesRecipeIngredient,
     AddRecipesRequest,
+    AddRecipesRequestRecipe,
     AddRecipesResponse,
     AddRecipesResponseRecipe,
+    AddRecipesStreamRequest,
+    AddRecipesStreamResponse,
 )
 from protos.chat_by_recipe_pb2 import (
     ChatByRecipeFunctionCall,
@@ -53,43 +61,50 @@ from protos.user_profile_pb2 import UserProfileRequest, UserProfileResponse
 class RecipeSearchServicer(RecipeSearchServiceServicer):
     """Service class to implement the recipe search service"""
 
+    health_checker: HealthChecker
+    recipe_responses: LRUCache[int, Tuple[models.RecipeModel, RecipeResponse]]
+
+    def __init__(self):
+        self.health_checker = HealthChecker(
+            [
+                ("PostgreSQL", db.check_health),
+                ("Typesense", controllers.is_typesense_healthy),
+                ("Ollama", controllers.is_ollama_healthy),
+                ("Azure OpenAI", controllers.is_azure_openai_healthy),
+            ],
+            timeout=api_configs.api_health_check_timeout_seconds,
+            degraded=api_configs.api_health_check_degraded_seconds,
+            ttl=api_configs.api_health_check_cache_seconds,
+            non_critical=["Ollama", "Azure OpenAI"],
+        )
+        self.recipe_responses = LRUCache(
+            domain_configs.domain_recipe_cache_size
+        )
+
     def GetHealth(
         self,
         request: HealthRequest,
         context: grpc.ServicerContext,
     ) -> HealthResponse:
         """Get the health status of the service"""
-        status = HealthStatus.HEALTHY
         checks: List[HealthCheck] = []
 
         checks.append(
             HealthCheck(
-                name="PostgreSQL",
-                status=(
-                    HealthStatus.HEALTHY
-                    if db.check_health()
-                    else HealthStatus.UNHEALTHY
-                ),
-            )
-        )
-
-        checks.append(
-            HealthCheck(
-                name="Typesense",
+                name="Startup",
                 status=(
                     HealthStatus.HEALTHY
-                    if controllers.is_typesense_healthy()
-                    else HealthStatus.UNHEALTHY
+                    if controllers.get_startup_state() == StartupState.READY
+                    else HealthStatus.DEGRADED
                 ),
             )
         )
 
-        if any(check.status == HealthStatus.UNHEALTHY for check in checks):
-            status = HealthStatus.UNHEALTHY
-        elif any(check.status == HealthStatus.DEGRADED for check in checks):
-            status = HealthStatus.DEGRADED
+        checks.extend(self.health_checker.check())
 
-        return HealthResponse(status=status, checks=checks)
+        return HealthResponse(
+            status=self.health_checker.status(checks), checks=checks
+        )
 
     def GetRecipe(
         self,
@@ -100,12 +115,17 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
         try:
             recipe = controllers.get_recipe(request.id)
         except NoResultFound:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.NOT_FOUND,
                 f"Recipe with ID {request.id} not found",
             )
 
-        return RecipeResponse(
+        cached = self.recipe_responses.get(recipe.id)
+        if cached is not None and cached[0] is recipe:
+            return cached[1]
+
+        response = RecipeResponse(
             id=recipe.id,
             title=recipe.title,
             description=recipe.description,
@@ -127,6 +147,9 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
                 carbs=recipe.nutrition.carbs.to_proto(),
             ),
         )
+        self.recipe_responses.set(recipe.id, (recipe, response))
+
+        return response
 
     def SearchRecipes(
         self,
@@ -135,7 +158,8 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
     ) -> SearchRecipesResponse:
         """Search for recipes given the query"""
         if not request.ingredients:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "Ingredients cannot be empty",
             )
@@ -144,7 +168,8 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
             request.page = 1
 
         if request.page <= 0:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "Page must be a positive integer",
             )
@@ -153,7 +178,8 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
             request.per_page = domain_configs.domain_default_search_per_page
 
         if request.per_page <= 0:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "Per page must be a positive integer",
             )
@@ -229,74 +255,57 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
     ) -> AddRecipesResponse:
         """Add the recipes to the database"""
         if not request.recipes:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "Recipes cannot be empty",
             )
 
         recipes = controllers.add_recipes(
             [
-                models.RecipeModel(
-                    title=recipe.title,
-                    description=recipe.description,
-                    ingredients=[
-                        models.RecipeModelIngredient(
-                            name=ingredient.name,
-                            quantity=ingredient.quantity,
-                            unit=ingredient.unit,
-                        )
-                        for ingredient in recipe.ingredients
-                    ],
-                    directions=list(recipe.directions),
-                    tips=list(recipe.tips),
-                    utensils=list(recipe.utensils),
-                    nutrition=models.RecipeModelNutrition(
-                        calories=models.RecipeModelNutritionValue.from_proto(
-                            recipe.nutrition.calories
-                        ),
-                        fat=models.RecipeModelNutritionValue.from_proto(
-                            recipe.nutrition.fat
-                        ),
-                        protein=models.RecipeModelNutritionValue.from_proto(
-                            recipe.nutrition.protein
-                        ),
-                        carbs=models.RecipeModelNutritionValue.from_proto(
-                            recipe.nutrition.carbs
-                        ),
-                    ),
-                )
+                self._add_recipes_recipe_from_proto(recipe)
                 for recipe in request.recipes
             ],
         )
 
         return AddRecipesResponse(
             recipes=[
-                AddRecipesResponseRecipe(
-                    id=recipe.id,
-                    title=recipe.title,
-                    description=recipe.description,
-                    ingredients=[
-                        AddRecipesRecipeIngredient(
-                            name=ingredient.name,
-                            quantity=ingredient.quantity,
-                            unit=ingredient.unit,
-                        )
-                        for ingredient in recipe.ingredients
-                    ],
-                    directions=recipe.directions,
-                    tips=recipe.tips,
-                    utensils=recipe.utensils,
-                    nutrition=RecipeNutrition(
-                        calories=recipe.nutrition.calories.to_proto(),
-                        fat=recipe.nutrition.fat.to_proto(),
-                        protein=recipe.nutrition.protein.to_proto(),
-                        carbs=recipe.nutrition.carbs.to_proto(),
-                    ),
-                )
+                self._add_recipes_recipe_to_proto(recipe)
                 for recipe in recipes
             ]
         )
 
+    def AddRecipesStream(
+        self,
+        request_iterator: Iterator[AddRecipesStreamRequest],
+        context: grpc.ServicerContext,
+    ) -> Iterable[AddRecipesStreamResponse]:
+        """Add the streamed recipes to the database in batches"""
+        recipes = (
+            self._add_recipes_recipe_from_proto(recipe)
+            for request in request_iterator
+            for recipe in request.recipes
+        )
+
+        batch = 0
+        for batch, added in enumerate(
+            controllers.add_recipes_stream(recipes), start=1
+        ):
+            yield AddRecipesStreamResponse(
+                batch=batch,
+                recipes=[
+                    self._add_recipes_recipe_to_proto(recipe)
+                    for recipe in added
+                ],
+            )
+
+        if not batch:
+            contexts.abort(
+                context,
+                grpc.StatusCode.INVALID_ARGUMENT,
+                "Recipes cannot be empty",
+            )
+
     def ChatByRecipe(
         self,
         request: ChatByRecipeRequest,
@@ -304,23 +313,20 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
     ) -> ChatByRecipeResponse:
         """Chat with the model by recipe"""
         try:
-            recipe = controllers.get_recipe(request.id)
+            recipe, profile = controllers.get_recipe_and_user_profile(
+                request.id, request.username
+            )
         except NoResultFound:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.NOT_FOUND,
                 f"Recipe with ID {request.id} not found",
             )
 
-        messages = [
-            models.ChatMessageModel(
-                role=models.ChatRoleModel.from_proto(message.role),
-                text=message.text,
-            )
-            for message in request.messages
-        ]
+        messages = self._chat_messages_from_proto(request.messages)
 
         response = controllers.chat_by_recipe(
-            request.name, request.username, recipe, messages
+            request.name, request.username, recipe, profile, messages
         )
 
         return ChatByRecipeResponse(
@@ -342,36 +348,24 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
     ) -> Iterable[ChatByRecipeStreamResponse]:
         """Chat with the model by recipe and return a stream of messages"""
         try:
-            recipe = controllers.get_recipe(request.id)
+            recipe, profile = controllers.get_recipe_and_user_profile(
+                request.id, request.username
+            )
         except NoResultFound:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.NOT_FOUND,
                 f"Recipe with ID {request.id} not found",
             )
 
-        messages = [
-            models.ChatMessageModel(
-                role=models.ChatRoleModel.from_proto(message.role),
-                text=message.text,
-            )
-            for message in request.messages
-        ]
+        messages = self._chat_messages_from_proto(request.messages)
 
         for message in controllers.chat_by_recipe_stream(
-            request.name, request.username, recipe, messages
+            request.name, request.username, recipe, profile, messages
         ):
-            if isinstance(message, models.ChatStreamHeaderModel):
-                yield ChatByRecipeStreamResponse(
-                    header=ChatByRecipeStreamHeader(
-                        role=message.role.to_proto(),
-                    ),
-                )
-            elif isinstance(message, models.ChatStreamContentModel):
-                yield ChatByRecipeStreamResponse(
-                    content=ChatByRecipeStreamContent(
-                        text=message.text,
-                    ),
-                )
+            response = self._chat_stream_model_to_proto(message)
+            if response is not None:
+                yield response
 
     def ResetData(
         self,
@@ -418,7 +412,8 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
         profile = controllers.get_user_profile(request.username)
 
         if not profile:
-            context.abort(
+            contexts.abort(
+                context,
                 grpc.StatusCode.NOT_FOUND,
                 f"User profile with username {request.username} not found",
             )
@@ -429,3 +424,132 @@ class RecipeSearchServicer(RecipeSearchServiceServicer):
             prefer=profile.prefer,
             dislike=profile.dislike,
         )
+
+    def _add_recipes_recipe_from_proto(
+        self, recipe: AddRecipesRequestRecipe
+    ) -> models.RecipeModel:
+        """Convert a proto recipe to a recipe model.
+
+        Arguments:
+            recipe (AddRecipesRequestRecipe): The proto recipe.
+
+        Returns:
+            models.RecipeModel: The recipe model.
+        """
+        return models.RecipeModel(
+            title=recipe.title,
+            description=recipe.description,
+            ingredients=[
+                models.RecipeModelIngredient(
+                    name=ingredient.name,
+                    quantity=ingredient.quantity,
+                    unit=ingredient.unit,
+                )
+                for ingredient in recipe.ingredients
+            ],
+            directions=list(recipe.directions),
+            tips=list(recipe.tips),
+            utensils=list(recipe.utensils),
+            nutrition=models.RecipeModelNutrition(
+                calories=models.RecipeModelNutritionValue.from_proto(
+                    recipe.nutrition.calories
+                ),
+                fat=models.RecipeModelNutritionValue.from_proto(
+                    recipe.nutrition.fat
+                ),
+                protein=models.RecipeModelNutritionValue.from_proto(
+                    recipe.nutrition.protein
+                ),
+                carbs=models.RecipeModelNutritionValue.from_proto(
+                    recipe.nutrition.carbs
+                ),
+            ),
+        )
+
+    def _add_recipes_recipe_to_proto(
+        self, recipe: models.RecipeModel
+    ) -> AddRecipesResponseRecipe:
+        """Convert a recipe model to a proto added recipe.
+
+        Arguments:
+            recipe (models.RecipeModel): The recipe model.
+
+        Returns:
+            AddRecipesResponseRecipe: The proto added recipe.
+        """
+        return AddRecipesResponseRecipe(
+            id=recipe.id,
+            title=recipe.title,
+            description=recipe.description,
+            ingredients=[
+                AddRecipesRecipeIngredient(
+                    name=ingredient.name,
+                    quantity=ingredient.quantity,
+                    unit=ingredient.unit,
+                )
+                for ingredient in recipe.ingredients
+            ],
+            directions=recipe.directions,
+            tips=recipe.tips,
+            utensils=recipe.utensils,
+            nutrition=RecipeNutrition(
+                calories=recipe.nutrition.calories.to_proto(),
+                fat=recipe.nutrition.fat.to_proto(),
+                protein=recipe.nutrition.protein.to_proto(),
+                carbs=recipe.nutrition.carbs.to_proto(),
+            ),
+        )
+
+    def _chat_messages_from_proto(
+        self, messages: Iterable[ChatByRecipeMessage]
+    ) -> List[models.ChatMessageModel]:
+        """Convert the proto chat messages to message models.
+
+        Arguments:
+            messages (Iterable[ChatByRecipeMessage]): The proto messages.
+
+        Returns:
+            List[models.ChatMessageModel]: The message models.
+        """
+        return [
+            models.ChatMessageModel(
+                role=models.ChatRoleModel.from_proto(message.role),
+                text=message.text,
+            )
+            for message in messages
+        ]
+
+    def _chat_stream_model_to_proto(
+        self, message: models.ChatStreamModel
+    ) -> Optional[ChatByRecipeStreamResponse]:
+        """Convert a chat stream model to a proto stream response.
+
+        Arguments:
+            message (models.ChatStreamModel): The chat stream model.
+
+        Returns:
+            Optional[ChatByRecipeStreamResponse]: The proto stream response,
+                or None if the model has no proto representation.
+        """
+        if isinstance(message, models.ChatStreamHeaderModel):
+            return ChatByRecipeStreamResponse(
+                header=ChatByRecipeStreamHeader(
+                    role=message.role.to_proto(),
+                ),
+            )
+
+        if isinstance(message, models.ChatStreamContentModel):
+            return ChatByRecipeStreamResponse(
+                content=ChatByRecipeStreamContent(
+                    text=message.text,
+                ),
+            )
+
+        if isinstance(message, models.ChatStreamFunctionCallModel):
+            return ChatByRecipeStreamResponse(
+                function_call=ChatByRecipeFunctionCall(
+                    **message.function_call.to_proto()
+                ),
+            )
+
+        return None
@@ -1,3 +1,5 @@
+from typing import List, Optional, Tuple
+
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
 
@@ -8,6 +10,28 @@ class APIConfigs(BaseConfigs):
     """API server configuration"""
 
     api_port: str = Field("2505")
+    api_async: bool = Field(False)
+    api_max_workers: Optional[int] = Field(None)
+    api_maximum_concurrent_rpcs: Optional[int] = Field(None)
+    api_max_send_message_length: int = Field(-1)
+    api_max_receive_message_length: int = Field(4 * 1024 * 1024)
+    api_fast_rpc_limit: int = Field(16)
+    api_slow_rpc_limit: int = Field(8)
+    api_rpc_wait_seconds: float = Field(1)
+    api_health_check_timeout_seconds: float = Field(2)
+    api_health_check_degraded_seconds: float = Field(1)
+    api_health_check_cache_seconds: float = Field(5)
+
+    @property
+    def server_options(self) -> List[Tuple[str, int]]:
+        """Get the gRPC channel options of the server"""
+        return [
+            ("grpc.max_send_message_length", self.api_max_send_message_length),
+            (
+                "grpc.max_receive_message_length",
+                self.api_max_receive_message_length,
+            ),
+        ]
 
     model_config = SettingsConfigDict(
         env_file=".env",
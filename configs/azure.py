@@ -11,6 +11,9 @@ class AzureConfigs(BaseConfigs):
 
     azure_openai_api_key: Optional[str] = Field(None)
     azure_openai_base_url: Optional[str] = Field(None)
+    azure_openai_max_connections: int = Field(100)
+    azure_openai_max_keepalive_connections: int = Field(20)
+    azure_openai_keepalive_expiry_seconds: float = Field(60)
 
     model_config = SettingsConfigDict(
         env_file=".env",
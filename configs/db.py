@@ -14,6 +14,15 @@ class DBConfigs(BaseConfigs):
     db_user: Optional[str] = Field(None)
     db_password: Optional[str] = Field(None)
     db_override_connection_string: Optional[str] = Field(None)
+    db_pool_size: int = Field(10)
+    db_pool_max_overflow: int = Field(20)
+    db_pool_timeout_seconds: float = Field(30)
+    db_pool_recycle_seconds: int = Field(1800)
+    db_pool_pre_ping: bool = Field(True)
+    db_pool_slow_checkout_seconds: float = Field(0.1)
+    db_use_psycopg_pool: bool = Field(False)
+    db_notify_channel: str = Field("recipe_search")
+    db_listen_retry_seconds: float = Field(5)
 
     @property
     def connection_string(self) -> str:
@@ -21,7 +30,10 @@ class DBConfigs(BaseConfigs):
         if self.db_override_connection_string:
             return self.db_override_connection_string
 
-        if all(v is None for v in self.model_dump().values()):
+        if all(
+            getattr(self, name) is None
+            for name in ("db_host", "db_name", "db_user", "db_password")
+        ):
             return "sqlite+pysqlite:///:memory:"
         return (
             f"postgresql+psycopg://{self.db_user}:{self.db_password}"
@@ -1,8 +1,10 @@
+from typing import Optional
+
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
 
 from configs.base import BaseConfigs
-from domain.model_types import ChatModelType
+from domain.model_types import ChatModelType, SearchEngineType
 
 
 class DomainConfigs(BaseConfigs):
@@ -13,6 +15,27 @@ class DomainConfigs(BaseConfigs):
     domain_default_search_per_page: int = Field(10)
     domain_chat_message_limit: int = Field(10)
     domain_chat_model: ChatModelType
+    domain_chat_speculative: bool = Field(False)
+    domain_chat_speculative_workers: int = Field(16)
+    domain_embedding_cache_size: int = Field(10000)
+    domain_embedding_bulk_cache_size: int = Field(10000)
+    domain_embedding_cache_persistent: bool = Field(False)
+    domain_embedding_cache_persistent_size: int = Field(1000000)
+    domain_add_recipes_batch_size: int = Field(100)
+    domain_add_recipes_queue_size: int = Field(2)
+    domain_search_cache_size: int = Field(10000)
+    domain_search_cache_ttl_seconds: float = Field(60)
+    domain_search_engine: SearchEngineType = Field(SearchEngineType.TYPESENSE)
+    domain_local_index_lists: int = Field(0)
+    domain_local_index_probes: int = Field(8)
+    domain_local_index_batch_size: int = Field(256)
+    domain_local_index_unlisted_fraction: float = Field(0.1)
+    domain_startup_retry_seconds: float = Field(5)
+    domain_stats_log_seconds: Optional[float] = Field(60)
+    domain_recipe_cache_size: int = Field(1000)
+    domain_user_profile_cache_size: int = Field(10000)
+    domain_user_profile_cache_ttl_seconds: float = Field(300)
+    domain_generations_size: int = Field(100000)
 
     model_config = SettingsConfigDict(
         env_file=".env",
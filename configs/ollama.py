@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import Field
 from pydantic_settings import SettingsConfigDict
@@ -10,8 +10,21 @@ class OllamaConfigs(BaseConfigs):
     """Ollama configuration"""
 
     ollama_base_url: Optional[str] = Field("http://localhost:2607")
+    ollama_base_urls: List[str] = Field([])
     ollama_model: Optional[str] = Field("nomic-embed-text")
     ollama_num_dim: Optional[int] = Field(768)
+    ollama_embed_batch_size: int = Field(64)
+    ollama_embed_workers: int = Field(4)
+    ollama_embed_max_retries: int = Field(3)
+    ollama_embed_retry_backoff_seconds: float = Field(0.5)
+    ollama_max_connections: int = Field(100)
+    ollama_max_keepalive_connections: int = Field(20)
+    ollama_keepalive_expiry_seconds: float = Field(60)
+
+    @property
+    def hosts(self) -> List[str]:
+        """Get the Ollama base URLs to spread the embedding requests over"""
+        return self.ollama_base_urls or [self.ollama_base_url]
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -11,6 +11,12 @@ class TypesenseConfigs(BaseConfigs):
 
     typesense_host: Optional[str] = Field(None)
     typesense_api_key: Optional[str] = Field(None)
+    typesense_document_count_ttl_seconds: float = Field(60)
+    typesense_vector_query_precision: int = Field(6)
+    typesense_vector_query_cache_size: int = Field(1000)
+    typesense_reconcile_batch_size: int = Field(500)
+    typesense_reconcile_interval_seconds: Optional[float] = Field(None)
+    typesense_alias_swap_attempts: int = Field(5)
 
     model_config = SettingsConfigDict(
         env_file=".env",
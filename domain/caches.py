@@ -0,0 +1,190 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe least recently used cache with an optional time-to-live"""
+
+    max_size: int
+    ttl: Optional[float]
+    hits: int
+    misses: int
+    _entries: "OrderedDict[K, Tuple[V, float]]"
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the ratio of lookups that were served from the cache.
+
+        Returns:
+            float: The hit rate, 0 if there was no lookup yet.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(
+        self, key: K, default: Optional[V] = None, count: bool = True
+    ) -> Optional[V]:
+        """Get a value from the cache.
+
+        Arguments:
+            key (K): The key of the value.
+            default (Optional[V]): The value to return if the key is missing
+                or expired. Defaults to None.
+            count (bool): Whether to count the lookup in the hit and miss
+                counters. Defaults to True.
+
+        Returns:
+            Optional[V]: The cached value, or the default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_expired(entry):
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: K, value: V):
+        """Set a value in the cache, evicting the least recently used value
+        if the cache is full.
+
+        Arguments:
+            key (K): The key of the value.
+            value (V): The value to cache.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove a value from the cache.
+
+        Arguments:
+            key (K): The key of the value.
+
+        Returns:
+            Optional[V]: The removed value, or None if it was not cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        return entry[0] if entry is not None else None
+
+    def clear(self):
+        """Remove all values from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache statistics.
+
+        Returns:
+            Dict[str, Any]: The size, hits, misses and hit rate of the cache.
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _is_expired(self, entry: Tuple[V, float]) -> bool:
+        """Check if a cache entry has outlived the time-to-live.
+
+        Arguments:
+            entry (Tuple[V, float]): The value and the time it was set.
+
+        Returns:
+            bool: True if expired, False otherwise.
+        """
+        return self.ttl is not None and time.monotonic() - entry[1] > self.ttl
+
+
+class Generations:
+    """Thread-safe version counters for invalidating cache keys
+
+    Cache keys include the generation of the data they were computed from,
+    bumping a generation makes every key built from the old one unreachable
+    without scanning the cache, even for values still being computed.
+
+    Only the most recently bumped generations are kept. The generations are
+    drawn from one increasing counter, and a generation that is not kept
+    reads as the latest one evicted, which differs from every older
+    generation of its key, so evicting never makes a stale key reachable.
+    """
+
+    max_size: int
+    _generations: "OrderedDict[Hashable, int]"
+    _counter: "itertools.count[int]"
+    _floor: int
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._generations = OrderedDict()
+        self._counter = itertools.count(1)
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._generations)
+
+    def get(self, key: Hashable) -> int:
+        """Get the current generation.
+
+        Arguments:
+            key (Hashable): The key of the generation.
+
+        Returns:
+            int: The generation, 0 if no generation was bumped and evicted.
+        """
+        return self._generations.get(key, self._floor)
+
+    def bump(self, key: Hashable):
+        """Move to a new generation, evicting the least recently bumped one
+        if there are too many.
+
+        Arguments:
+            key (Hashable): The key of the generation.
+        """
+        with self._lock:
+            self._generations[key] = next(self._counter)
+            self._generations.move_to_end(key)
+
+            while len(self._generations) > self.max_size:
+                _, generation = self._generations.popitem(last=False)
+                self._floor = max(self._floor, generation)
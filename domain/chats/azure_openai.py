@@ -1,14 +1,19 @@
 import json
 import logging
-from dataclasses import dataclass
+import threading
+from concurrent import futures
+from dataclasses import dataclass, field
 from enum import Enum, StrEnum, auto
-from typing import Dict, Iterable, Optional, Union
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Union
 
 import openai
+from openai.types import CompletionUsage as OpenAICompletionUsage
 from openai.types.chat import (
     ChatCompletionAssistantMessageParam as OpenAIAssistantMessageParam,
 )
+from openai.types.chat import ChatCompletionChunk as OpenAIChatCompletionChunk
 from openai.types.chat import ChatCompletionMessage as OpenAICompletionMessage
+from openai.types.chat import ChatCompletionMessageParam as OpenAIMessageParam
 from openai.types.chat import (
     ChatCompletionMessageToolCall as OpenAIChatCompletionMessageToolCall,
 )
@@ -24,19 +29,83 @@ from openai.types.chat import (
 from openai.types.chat.chat_completion_chunk import (
     ChoiceDelta as OpenAIStreamChoiceDelta,
 )
+from openai.types.chat.chat_completion_chunk import (
+    ChoiceDeltaToolCall as OpenAIStreamChoiceDeltaToolCall,
+)
 from openai.types.shared.function_definition import (
     FunctionDefinition as OpenAIFuncDef,
 )
 from pydantic import BaseModel
 
-from configs.azure import configs
-from domain import controllers
+from configs.domain import configs as domain_configs
+from domain import clients
 from domain.chats.base import BaseChat
 from infra import models
 
 
+class PromptUsage:
+    """Prompt tokens of the completions, and how many were cached
+
+    Azure OpenAI reuses the computation of a prompt prefix it has seen
+    recently, which makes the cached tokens cheaper and faster. The cached
+    share shows how well the prompts keep a stable prefix.
+    """
+
+    completions: int
+    prompt_tokens: int
+    cached_tokens: int
+    _lock: threading.Lock
+
+    def __init__(self):
+        self.completions = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage: Optional[OpenAICompletionUsage]):
+        """Record the usage of a completion.
+
+        Arguments:
+            usage (Optional[OpenAICompletionUsage]): The usage, if returned.
+        """
+        if usage is None:
+            return
+
+        details = usage.prompt_tokens_details
+        cached_tokens = (details.cached_tokens or 0) if details else 0
+
+        with self._lock:
+            self.completions += 1
+            self.prompt_tokens += usage.prompt_tokens
+            self.cached_tokens += cached_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the usage statistics.
+
+        Returns:
+            Dict[str, Any]: The completions, prompt and cached tokens, and the
+                cached share of the prompt tokens.
+        """
+        with self._lock:
+            return {
+                "completions": self.completions,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_rate": (
+                    self.cached_tokens / self.prompt_tokens
+                    if self.prompt_tokens
+                    else 0.0
+                ),
+            }
+
+
 class AzureOpenAIChat(BaseChat):
-    """Chat class for Azure OpenAI chat model"""
+    """Chat class for Azure OpenAI chat model
+
+    An instance only holds the state of one conversation, i.e. the prompts
+    prepared by set_user and set_recipe, so it is cheap to create per
+    request. The OpenAI clients are shared through domain.clients.
+    """
 
     @dataclass
     class Configs:
@@ -45,6 +114,13 @@ class AzureOpenAIChat(BaseChat):
         api_version: str
         model: str
 
+    @dataclass
+    class StreamToolCall:
+        """Tool call assembled from the deltas of a stream"""
+
+        name: str = ""
+        arguments: List[str] = field(default_factory=list)
+
     class SystemPromptKey(Enum):
         """System prompt format key enumeration"""
 
@@ -63,26 +139,28 @@ class AzureOpenAIChat(BaseChat):
         FUNCTION_ENUM_PROMPT = auto()
         FUNCTION_CALL_PROMPT = auto()
 
+    # The prompts start with the same intro and recipe, and the user comes
+    # last, so the conversations about a recipe share a cacheable prefix.
     SYSTEM_PROMPT_ORDER = [
         SystemPromptKey.INTRO,
-        SystemPromptKey.USER,
         SystemPromptKey.RECIPE,
         SystemPromptKey.FUNCTION_CALL,
         SystemPromptKey.END,
+        SystemPromptKey.USER,
     ]
 
     SYSTEM_FUNCTION_ENUM_PROMPT_ORDER = [
         SystemPromptKey.INTRO,
-        SystemPromptKey.USER,
         SystemPromptKey.RECIPE,
         SystemPromptKey.FUNCTION_ENUM_END,
+        SystemPromptKey.USER,
     ]
 
     SYSTEM_FUNCTION_CALL_PROMPT_ORDER = [
         SystemPromptKey.INTRO,
-        SystemPromptKey.USER,
         SystemPromptKey.RECIPE,
         SystemPromptKey.FUNCTION_CALL_END,
+        SystemPromptKey.USER,
     ]
 
     SYSTEM_PROMPT_FORMATS = {
@@ -198,17 +276,28 @@ class AzureOpenAIChat(BaseChat):
         ),
     }
 
+    usage = PromptUsage()
+
+    speculation_executor = futures.ThreadPoolExecutor(
+        max_workers=domain_configs.domain_chat_speculative_workers,
+        thread_name_prefix="chat-speculation",
+    )
+
     logger: logging.Logger
     configs: Configs
     username: Optional[str]
+    user_profile: Optional[models.UserProfileModel]
     system_prompts: Dict[SystemPromptKey, Optional[str]]
     system_function_enum_prompts: Dict[SystemPromptKey, Optional[str]]
-    system_function_call_prompt: Dict[SystemPromptKey, Optional[str]]
+    system_function_call_prompts: Dict[SystemPromptKey, Optional[str]]
     client: openai.AzureOpenAI
+    async_client: openai.AsyncAzureOpenAI
 
     def __init__(self, init_configs: Configs):
         self.logger = logging.getLogger(__name__)
         self.configs = init_configs
+        self.username = None
+        self.user_profile = None
 
         self.system_prompts = {key: None for key in self.SystemPromptKey}
         self.system_prompts[self.SystemPromptKey.INTRO] = (
@@ -227,12 +316,6 @@ class AzureOpenAIChat(BaseChat):
         self.system_function_enum_prompts[self.SystemPromptKey.INTRO] = (
             self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.INTRO]
         )
-        self.system_function_enum_prompts[self.SystemPromptKey.USER] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.USER]
-        )
-        self.system_function_enum_prompts[self.SystemPromptKey.RECIPE] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.RECIPE]
-        )
         self.system_function_enum_prompts[
             self.SystemPromptKey.FUNCTION_ENUM_END
         ] = self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.FUNCTION_ENUM_END]
@@ -247,12 +330,26 @@ class AzureOpenAIChat(BaseChat):
             self.SystemPromptKey.FUNCTION_CALL_END
         ] = self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.FUNCTION_CALL_END]
 
-        self.client = openai.AzureOpenAI(
-            api_version=self.configs.api_version,
-            azure_endpoint=configs.azure_openai_base_url,
+        self.client = clients.azure_openai_client(self.configs.api_version)
+        self.async_client = clients.async_azure_openai_client(
+            self.configs.api_version
         )
 
-        self.logger.info(f"{self.configs.model} initialized")
+    def is_healthy(self) -> bool:
+        """Check if the chat model is healthy.
+
+        The check lists the models instead of completing, so it is free.
+        Failures are not retried, the health checks are repeated anyway.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        try:
+            self.client.with_options(max_retries=0).models.list()
+            return True
+        except Exception as e:
+            self.logger.error(f"Azure OpenAI health check failed: {e}")
+            return False
 
     def get_system_prompt(self) -> str:
         """Get the system prompt.
@@ -326,35 +423,36 @@ class AzureOpenAIChat(BaseChat):
             user (str): The user to prepare.
             username (Optional[str]): The username to prepare.
         """
-        self.system_prompts[self.SystemPromptKey.USER] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.USER].format(
-                name=user
-            )
-        )
-        self.system_function_call_prompts[self.SystemPromptKey.USER] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.USER].format(
-                name=user
-            )
-        )
+        key = self.SystemPromptKey.USER
+        prompt = self.SYSTEM_PROMPT_FORMATS[key].format(name=user)
+        self.system_prompts[key] = prompt
+        self.system_function_enum_prompts[key] = prompt
+        self.system_function_call_prompts[key] = prompt
 
         self.username = username
 
+    def set_user_profile(self, profile: Optional[models.UserProfileModel]):
+        """Prepare the chat model for a user profile.
+
+        Arguments:
+            profile (Optional[models.UserProfileModel]): The user profile, if
+                it exists.
+        """
+        self.user_profile = profile
+
     def set_recipe(self, recipe: models.RecipeModel):
         """Prepare the chat model for a recipe.
 
         Arguments:
             recipe (RecipeModel): The recipe to prepare.
         """
-        self.system_prompts[self.SystemPromptKey.RECIPE] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.RECIPE].format(
-                title=recipe.title, json=json.dumps(recipe.as_dict())
-            )
-        )
-        self.system_function_call_prompts[self.SystemPromptKey.RECIPE] = (
-            self.SYSTEM_PROMPT_FORMATS[self.SystemPromptKey.RECIPE].format(
-                title=recipe.title, json=json.dumps(recipe.as_dict())
-            )
+        key = self.SystemPromptKey.RECIPE
+        prompt = self.SYSTEM_PROMPT_FORMATS[key].format(
+            title=recipe.title, json=recipe.json
         )
+        self.system_prompts[key] = prompt
+        self.system_function_enum_prompts[key] = prompt
+        self.system_function_call_prompts[key] = prompt
 
     def get_user_profile_prompt(self) -> str:
         """Get the user profile prompt.
@@ -365,7 +463,7 @@ class AzureOpenAIChat(BaseChat):
         if self.username is None:
             raise Exception("Username is not set")
 
-        profile = controllers.get_user_profile(self.username)
+        profile = self.user_profile
 
         return (
             "If the user wants to change their identity to vegan or"
@@ -380,6 +478,11 @@ class AzureOpenAIChat(BaseChat):
     ) -> models.ChatResponseModel:
         """Chat with the model.
 
+        The function to call is picked first, and the plain reply is only
+        needed if there is none. With domain_chat_speculative, the plain
+        reply is requested at the same time as the function, and discarded
+        if a function is called, trading tokens for latency.
+
         Arguments:
             messages (Iterable[models.ChatMessageModel]): The messages to chat
                 with.
@@ -392,6 +495,44 @@ class AzureOpenAIChat(BaseChat):
             for message in messages
         ]
 
+        speculative_reply: Optional[futures.Future] = None
+        if domain_configs.domain_chat_speculative:
+            speculative_reply = self.speculation_executor.submit(
+                self._reply, openai_messages
+            )
+
+        try:
+            function = self._function_enum(openai_messages)
+            if function is not None:
+                response = self._function_call(function, openai_messages)
+                if response is not None:
+                    return response
+
+            # A speculative reply still queued behind other requests is
+            # cancelled and made inline rather than waited for
+            if (
+                speculative_reply is not None
+                and not speculative_reply.cancel()
+            ):
+                return speculative_reply.result()
+            return self._reply(openai_messages)
+        finally:
+            if speculative_reply is not None:
+                speculative_reply.cancel()
+
+    def _function_enum(
+        self, openai_messages: List[OpenAIMessageParam]
+    ) -> Optional[models.ChatResponseFunctionCallModel]:
+        """Pick the function to call for the messages.
+
+        Arguments:
+            openai_messages (List[OpenAIMessageParam]): The messages.
+
+        Returns:
+            Optional[models.ChatResponseFunctionCallModel]: The function, or
+                None if no function is required.
+        """
+
         class FunctionFormat(BaseModel):
             """The function to call."""
 
@@ -413,75 +554,94 @@ class AzureOpenAIChat(BaseChat):
         )
 
         self.logger.debug(f"Function enum response: {function_enum_response}")
+        self.usage.record(function_enum_response.usage)
 
         function_enum = function_enum_response.choices[0].message
-        if function_enum.parsed and function_enum.parsed.function is not None:
-            function_schema = self.FUNCTION_CALLS[
-                function_enum.parsed.function
-            ]
+        if not function_enum.parsed:
+            return None
+        return function_enum.parsed.function
 
-            additional_prompt = ""
-            if (
-                function_enum.parsed.function
-                == models.ChatResponseFunctionCallModel.SET_USER_PROFILE
-            ):
-                additional_prompt = " " + self.get_user_profile_prompt()
-
-            function_call_response = self.client.chat.completions.create(
-                model=self.configs.model,
-                messages=[
-                    self.get_system_payload(
-                        type=self.SystemPromptType.FUNCTION_CALL_PROMPT,
-                        additional=additional_prompt,
-                    ),
-                    *openai_messages,
-                ],
-                tools=[
-                    OpenAIChatCompletionToolParam(
-                        function=function_schema,
-                        type="function",
-                    )
-                ],
-                tool_choice="required",
-            )
+    def _function_call(
+        self,
+        function: models.ChatResponseFunctionCallModel,
+        openai_messages: List[OpenAIMessageParam],
+    ) -> Optional[models.ChatResponseModel]:
+        """Get the arguments of a function call for the messages.
 
-            self.logger.debug(
-                f"Function call response: {function_call_response}"
-            )
+        Arguments:
+            function (models.ChatResponseFunctionCallModel): The function.
+            openai_messages (List[OpenAIMessageParam]): The messages.
 
-            if not function_call_response.choices:
-                raise Exception("Function call response choices is empty")
+        Returns:
+            Optional[models.ChatResponseModel]: The response with the function
+                call, or None if the model did not call the function.
+        """
+        function_schema = self.FUNCTION_CALLS[function]
 
-            function_call_choice = function_call_response.choices[0]
+        additional_prompt = ""
+        if function == models.ChatResponseFunctionCallModel.SET_USER_PROFILE:
+            additional_prompt = " " + self.get_user_profile_prompt()
 
-            if function_call_choice.finish_reason not in (
-                "length",
-                "stop",
-                "tool_calls",
-            ):
-                raise Exception(
-                    "Invalid function call finish reason:"
-                    f" {function_call_choice.finish_reason}"
+        function_call_response = self.client.chat.completions.create(
+            model=self.configs.model,
+            messages=[
+                self.get_system_payload(
+                    type=self.SystemPromptType.FUNCTION_CALL_PROMPT,
+                    additional=additional_prompt,
+                ),
+                *openai_messages,
+            ],
+            tools=[
+                OpenAIChatCompletionToolParam(
+                    function=function_schema,
+                    type="function",
                 )
+            ],
+            tool_choice="required",
+        )
 
-            tool_calls = function_call_choice.message.tool_calls
+        self.logger.debug(f"Function call response: {function_call_response}")
+        self.usage.record(function_call_response.usage)
 
-            if tool_calls:
-                tool_call = tool_calls[0]
+        if not function_call_response.choices:
+            raise Exception("Function call response choices is empty")
 
-                return models.ChatResponseModel(
-                    message=models.ChatMessageModel(
-                        role=models.ChatRoleModel.ASSISTANT,
-                        text=(
-                            "I can help you with it. Are the following options"
-                            " okay?"
-                        ),
-                    ),
-                    function_call=self._openai_function_call_to_model(
-                        tool_call
-                    ),
-                )
+        function_call_choice = function_call_response.choices[0]
+
+        if function_call_choice.finish_reason not in (
+            "length",
+            "stop",
+            "tool_calls",
+        ):
+            raise Exception(
+                "Invalid function call finish reason:"
+                f" {function_call_choice.finish_reason}"
+            )
+
+        tool_calls = function_call_choice.message.tool_calls
+
+        if not tool_calls:
+            return None
+
+        return models.ChatResponseModel(
+            message=models.ChatMessageModel(
+                role=models.ChatRoleModel.ASSISTANT,
+                text="I can help you with it. Are the following options okay?",
+            ),
+            function_call=self._openai_function_call_to_model(tool_calls[0]),
+        )
+
+    def _reply(
+        self, openai_messages: List[OpenAIMessageParam]
+    ) -> models.ChatResponseModel:
+        """Get the plain reply to the messages.
+
+        Arguments:
+            openai_messages (List[OpenAIMessageParam]): The messages.
 
+        Returns:
+            models.ChatResponseModel: The response.
+        """
         response = self.client.chat.completions.create(
             model=self.configs.model,
             messages=[
@@ -491,6 +651,7 @@ class AzureOpenAIChat(BaseChat):
         )
 
         self.logger.debug(f"Response: {response}")
+        self.usage.record(response.usage)
 
         if not response.choices:
             raise Exception("Response choices is empty")
@@ -513,6 +674,9 @@ class AzureOpenAIChat(BaseChat):
     ) -> Iterable[models.ChatStreamModel]:
         """Chat with the model and return a stream of messages.
 
+        The text is streamed as it arrives, and a function call is streamed
+        once its arguments are complete.
+
         Arguments:
             messages (Iterable[models.ChatMessageModel]): The messages to chat
                 with.
@@ -521,34 +685,86 @@ class AzureOpenAIChat(BaseChat):
             Iterable[models.ChatStreamModel]: The response stream of messages.
         """
         stream = self.client.chat.completions.create(
-            model=self.configs.model,
-            messages=[
-                self.get_system_payload(),
-                *(
-                    self._message_model_to_openai_message_param(message)
-                    for message in messages
-                ),
-            ],
-            stream=True,
+            **self._get_stream_params(messages)
         )
 
+        tool_calls: Dict[int, AzureOpenAIChat.StreamToolCall] = {}
         for chunk in stream:
-            if not chunk.choices or not chunk.choices[0].delta:
-                self.logger.debug(f"No delta in chunk: chunk={chunk}")
-                continue
-
-            delta = chunk.choices[0].delta
-            stream_model = self._openai_stream_choice_delta_to_stream_model(
-                delta
+            yield from self._openai_stream_chunk_to_stream_models(
+                chunk, tool_calls
             )
 
-            if stream_model is None:
-                self.logger.debug(
-                    f"Did not convert delta to stream model: delta={delta}"
-                )
-                continue
+    async def chat_stream_async(
+        self, messages: Iterable[models.ChatMessageModel]
+    ) -> AsyncIterator[models.ChatStreamModel]:
+        """Chat with the model and return a stream of messages, without
+        blocking the event loop.
 
-            yield stream_model
+        The text is streamed as it arrives, and a function call is streamed
+        once its arguments are complete.
+
+        Arguments:
+            messages (Iterable[models.ChatMessageModel]): The messages to chat
+                with.
+
+        Returns:
+            AsyncIterator[models.ChatStreamModel]: The response stream of
+                messages.
+        """
+        stream = await self.async_client.chat.completions.create(
+            **self._get_stream_params(messages)
+        )
+
+        tool_calls: Dict[int, AzureOpenAIChat.StreamToolCall] = {}
+        async for chunk in stream:
+            for stream_model in self._openai_stream_chunk_to_stream_models(
+                chunk, tool_calls
+            ):
+                yield stream_model
+
+    def _get_stream_params(
+        self, messages: Iterable[models.ChatMessageModel]
+    ) -> Dict[str, Any]:
+        """Get the parameters of a streamed completion.
+
+        The stream answers and calls the functions in one completion, so the
+        function enum instructions and the user profile are added to the
+        system prompt, and every function is offered as a tool.
+
+        Arguments:
+            messages (Iterable[models.ChatMessageModel]): The messages to chat
+                with.
+
+        Returns:
+            Dict[str, Any]: The parameters.
+        """
+        additional_prompt = " " + self.SYSTEM_PROMPT_FORMATS[
+            self.SystemPromptKey.FUNCTION_ENUM_END
+        ]
+        if self.username is not None:
+            additional_prompt += " " + self.get_user_profile_prompt()
+
+        return {
+            "model": self.configs.model,
+            "messages": [
+                self.get_system_payload(additional=additional_prompt),
+                *(
+                    self._message_model_to_openai_message_param(message)
+                    for message in messages
+                ),
+            ],
+            "tools": [
+                OpenAIChatCompletionToolParam(
+                    function=function_schema,
+                    type="function",
+                )
+                for function_schema in self.FUNCTION_CALLS.values()
+            ],
+            "tool_choice": "auto",
+            "parallel_tool_calls": False,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
 
     def identify_recipe_veggie_identity(
         self, recipe: models.RecipeModel
@@ -583,7 +799,7 @@ class AzureOpenAIChat(BaseChat):
                         " as not containing any animal products or"
                         " by-products. Non-vegetarian is defined as"
                         " containing meat, fish, or poultry. The recipe to"
-                        f" determine is: {json.dumps(recipe.as_dict())}"
+                        f" determine is: {recipe.json}"
                     ),
                 ),
             ],
@@ -592,6 +808,7 @@ class AzureOpenAIChat(BaseChat):
         )
 
         self.logger.debug(f"Response: {response}")
+        self.usage.record(response.usage)
 
         if not response.choices:
             raise Exception("Response choices is empty")
@@ -636,6 +853,114 @@ class AzureOpenAIChat(BaseChat):
             text=message.content,
         )
 
+    def _openai_stream_chunk_to_stream_models(
+        self,
+        chunk: OpenAIChatCompletionChunk,
+        tool_calls: Dict[int, StreamToolCall],
+    ) -> List[models.ChatStreamModel]:
+        """Convert OpenAI stream chunk to stream models.
+
+        The tool call deltas of the chunk are added to the tool calls, which
+        are converted once the choice finishes.
+
+        Arguments:
+            chunk (OpenAIChatCompletionChunk): The chunk from OpenAI.
+            tool_calls (Dict[int, StreamToolCall]): The tool calls assembled
+                so far, by index.
+
+        Returns:
+            List[models.ChatStreamModel]: The stream models, empty if the
+                chunk has nothing to stream.
+        """
+        if chunk.usage is not None:
+            self.usage.record(chunk.usage)
+
+        if not chunk.choices:
+            self.logger.debug(f"No choices in chunk: chunk={chunk}")
+            return []
+
+        choice = chunk.choices[0]
+        stream_models = []
+
+        if choice.delta:
+            stream_model = self._openai_stream_choice_delta_to_stream_model(
+                choice.delta
+            )
+
+            if stream_model is not None:
+                stream_models.append(stream_model)
+            if choice.delta.tool_calls:
+                self._add_openai_tool_call_deltas(
+                    tool_calls, choice.delta.tool_calls
+                )
+            if stream_model is None and not choice.delta.tool_calls:
+                self.logger.debug(
+                    f"Did not convert delta to stream model:"
+                    f" delta={choice.delta}"
+                )
+
+        if choice.finish_reason is not None and tool_calls:
+            if choice.finish_reason in ("stop", "tool_calls"):
+                stream_models.extend(
+                    models.ChatStreamFunctionCallModel(
+                        function_call=self._stream_tool_call_to_model(call)
+                    )
+                    for _, call in sorted(tool_calls.items())
+                )
+            else:
+                self.logger.warning(
+                    "Dropped incomplete function calls, finish reason:"
+                    f" {choice.finish_reason}"
+                )
+
+            tool_calls.clear()
+
+        return stream_models
+
+    def _add_openai_tool_call_deltas(
+        self,
+        tool_calls: Dict[int, StreamToolCall],
+        deltas: List[OpenAIStreamChoiceDeltaToolCall],
+    ):
+        """Add OpenAI tool call deltas to the tool calls.
+
+        Arguments:
+            tool_calls (Dict[int, StreamToolCall]): The tool calls assembled
+                so far, by index.
+            deltas (List[OpenAIStreamChoiceDeltaToolCall]): The deltas.
+        """
+        for delta in deltas:
+            call = tool_calls.setdefault(delta.index, self.StreamToolCall())
+
+            if delta.function is None:
+                continue
+            if delta.function.name:
+                call.name += delta.function.name
+            if delta.function.arguments:
+                call.arguments.append(delta.function.arguments)
+
+    def _stream_tool_call_to_model(
+        self,
+        call: StreamToolCall,
+    ) -> Union[
+        models.ChatSetUserProfileFunctionCallModel,
+        models.ChatSearchRecipeFunctionCallModel,
+    ]:
+        """Convert an assembled tool call to function args model.
+
+        Arguments:
+            call (StreamToolCall): The tool call.
+
+        Returns:
+            Union[
+                models.ChatSetUserProfileFunctionArgsModel,
+                models.ChatSearchRecipeFunctionArgsModel,
+            ]: The function arguments model.
+        """
+        return self._function_call_to_model(
+            call.name, "".join(call.arguments)
+        )
+
     def _openai_stream_choice_delta_to_stream_model(
         self,
         delta: OpenAIStreamChoiceDelta,
@@ -706,12 +1031,33 @@ class AzureOpenAIChat(BaseChat):
                 models.ChatSearchRecipeFunctionArgsModel,
             ]: The function arguments model.
         """
-        args = json.loads(call.function.arguments)
+        return self._function_call_to_model(
+            call.function.name, call.function.arguments
+        )
 
-        if (
-            call.function.name
-            == models.ChatResponseFunctionCallModel.SET_USER_PROFILE
-        ):
+    def _function_call_to_model(
+        self,
+        name: str,
+        arguments: str,
+    ) -> Union[
+        models.ChatSetUserProfileFunctionCallModel,
+        models.ChatSearchRecipeFunctionCallModel,
+    ]:
+        """Convert a function name and JSON arguments to function args model.
+
+        Arguments:
+            name (str): The function name.
+            arguments (str): The JSON arguments.
+
+        Returns:
+            Union[
+                models.ChatSetUserProfileFunctionArgsModel,
+                models.ChatSearchRecipeFunctionArgsModel,
+            ]: The function arguments model.
+        """
+        args = json.loads(arguments)
+
+        if name == models.ChatResponseFunctionCallModel.SET_USER_PROFILE:
             return models.ChatSetUserProfileFunctionCallModel(
                 veggie_identity=models.UserProfileModelVeggieIdentity(
                     args["veggie_identity"]
@@ -720,13 +1066,10 @@ class AzureOpenAIChat(BaseChat):
                 dislike=args["dislike"],
             )
 
-        if (
-            call.function.name
-            == models.ChatResponseFunctionCallModel.SEARCH_RECIPES
-        ):
+        if name == models.ChatResponseFunctionCallModel.SEARCH_RECIPES:
             return models.ChatSearchRecipeFunctionCallModel(
                 ingredients=args["ingredients"],
                 extra_terms=args["extra_terms"],
             )
 
-        raise Exception(f"Invalid function name: {call.function.name}")
+        raise Exception(f"Invalid function name: {name}")
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import AsyncIterator, Iterable, Optional
 
 from infra import models
 
@@ -7,6 +7,14 @@ from infra import models
 class BaseChat(ABC):
     """Base class for chat models"""
 
+    @abstractmethod
+    def is_healthy(self) -> bool:
+        """Check if the chat model is healthy.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+
     @abstractmethod
     def set_user(self, user: str, username: Optional[str] = None):
         """Prepare the chat model for a user.
@@ -15,6 +23,15 @@ class BaseChat(ABC):
             user (str): The user to prepare.
         """
 
+    @abstractmethod
+    def set_user_profile(self, profile: Optional[models.UserProfileModel]):
+        """Prepare the chat model for a user profile.
+
+        Arguments:
+            profile (Optional[models.UserProfileModel]): The user profile, if
+                it exists.
+        """
+
     @abstractmethod
     def set_recipe(self, recipe: models.RecipeModel):
         """Prepare the chat model for a recipe.
@@ -51,6 +68,22 @@ class BaseChat(ABC):
             Iterable[models.ChatStreamModel]: The response stream of messages.
         """
 
+    @abstractmethod
+    def chat_stream_async(
+        self, messages: Iterable[models.ChatMessageModel]
+    ) -> AsyncIterator[models.ChatStreamModel]:
+        """Chat with the model and return a stream of messages, without
+        blocking the event loop.
+
+        Arguments:
+            messages (Iterable[models.ChatMessageModel]): The messages to chat
+                with.
+
+        Returns:
+            AsyncIterator[models.ChatStreamModel]: The response stream of
+                messages.
+        """
+
     @abstractmethod
     def identify_recipe_veggie_identity(
         self, recipe: models.RecipeModel
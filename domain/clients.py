@@ -0,0 +1,133 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import httpx
+import ollama
+import openai
+
+from configs.azure import configs as azure_configs
+from configs.ollama import configs as ollama_configs
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Hashable, Any] = {}
+_lock = threading.Lock()
+
+
+def _get_or_create(key: Hashable, create: Callable[[], Any]) -> Any:
+    """Get a client from the registry, creating it on first use.
+
+    Arguments:
+        key (Hashable): The registry key of the client.
+        create (Callable[[], Any]): The factory of the client.
+
+    Returns:
+        Any: The client.
+    """
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = create()
+            _clients[key] = client
+            logger.info(f"Client created: {key}")
+
+    return client
+
+
+def ollama_client(host: Optional[str] = None) -> ollama.Client:
+    """Get the shared Ollama client.
+
+    The client keeps a pool of keep-alive connections and is safe to use
+    from multiple threads.
+
+    Arguments:
+        host (Optional[str]): The Ollama base URL. Defaults to None, in which
+            case configs.ollama.configs.ollama_base_url is used.
+
+    Returns:
+        ollama.Client: The Ollama client.
+    """
+    host = host or ollama_configs.ollama_base_url
+
+    return _get_or_create(
+        ("ollama", host),
+        lambda: ollama.Client(
+            host=host,
+            limits=httpx.Limits(
+                max_connections=ollama_configs.ollama_max_connections,
+                max_keepalive_connections=(
+                    ollama_configs.ollama_max_keepalive_connections
+                ),
+                keepalive_expiry=(
+                    ollama_configs.ollama_keepalive_expiry_seconds
+                ),
+            ),
+        ),
+    )
+
+
+def _azure_openai_limits() -> httpx.Limits:
+    """Get the connection pool limits of the Azure OpenAI clients.
+
+    Returns:
+        httpx.Limits: The connection pool limits.
+    """
+    return httpx.Limits(
+        max_connections=azure_configs.azure_openai_max_connections,
+        max_keepalive_connections=(
+            azure_configs.azure_openai_max_keepalive_connections
+        ),
+        keepalive_expiry=azure_configs.azure_openai_keepalive_expiry_seconds,
+    )
+
+
+def azure_openai_client(api_version: str) -> openai.AzureOpenAI:
+    """Get the shared Azure OpenAI client for an API version.
+
+    The client keeps a pool of keep-alive connections and is safe to use
+    from multiple threads.
+
+    Arguments:
+        api_version (str): The Azure OpenAI API version.
+
+    Returns:
+        openai.AzureOpenAI: The Azure OpenAI client.
+    """
+    return _get_or_create(
+        ("azure_openai", api_version),
+        lambda: openai.AzureOpenAI(
+            api_version=api_version,
+            azure_endpoint=azure_configs.azure_openai_base_url,
+            http_client=openai.DefaultHttpxClient(
+                limits=_azure_openai_limits(),
+            ),
+        ),
+    )
+
+
+def async_azure_openai_client(api_version: str) -> openai.AsyncAzureOpenAI:
+    """Get the shared asynchronous Azure OpenAI client for an API version.
+
+    The client must only be used from the event loop of the API server.
+
+    Arguments:
+        api_version (str): The Azure OpenAI API version.
+
+    Returns:
+        openai.AsyncAzureOpenAI: The asynchronous Azure OpenAI client.
+    """
+    return _get_or_create(
+        ("async_azure_openai", api_version),
+        lambda: openai.AsyncAzureOpenAI(
+            api_version=api_version,
+            azure_endpoint=azure_configs.azure_openai_base_url,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=_azure_openai_limits(),
+            ),
+        ),
+    )
@@ -1,29 +1,121 @@
+import itertools
 import logging
-from typing import Iterable, List, Optional
+from typing import (
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from sqlalchemy import delete, select, text
 from sqlalchemy.orm import Session
 
 from configs.domain import configs
-from domain import chats, embeddings
-from domain.searches import typesense
-from infra import models
-from infra.db import engine
+from domain import chats, embeddings, searches
+from domain.caches import Generations, LRUCache
+from domain.embeddings.cache import cache as embedding_cache
+from domain.model_types import StartupState
+from domain.pipelines import Pipeline
+from domain.startup import startup
+from domain.stats import StatsReporter
+from infra import models, notifications
+from infra.db import engine, get_session, pool_stats, unit_of_work
 
 logger = logging.getLogger(__name__)
 
+RECIPES_GENERATION = "recipes"
+RECIPE_DETAILS_GENERATION = "recipe_details"
+USER_PROFILES_GENERATION = models.UserProfileModel.__tablename__
+
+_MISSING = object()
+
+search_cache: LRUCache[Tuple[Hashable, ...], List[models.TypesenseResult]] = (
+    LRUCache(
+        configs.domain_search_cache_size,
+        ttl=configs.domain_search_cache_ttl_seconds,
+    )
+)
+recipe_cache: LRUCache[Tuple[int, int], models.RecipeModel] = LRUCache(
+    configs.domain_recipe_cache_size
+)
+user_profile_cache: LRUCache[
+    Tuple[Hashable, ...], Optional[models.UserProfileModel]
+] = LRUCache(
+    configs.domain_user_profile_cache_size,
+    ttl=configs.domain_user_profile_cache_ttl_seconds,
+)
+generations = Generations(configs.domain_generations_size)
+stats = StatsReporter(
+    [
+        ("Database pool", pool_stats),
+        ("Search cache", search_cache.stats),
+        ("Embedding cache", embedding_cache.stats),
+        ("Chat prompt usage", chats.model.usage.stats),
+    ],
+    configs.domain_stats_log_seconds,
+)
+
+
+def start_up():
+    """Warm up the connections and the search engine in the background.
+
+    The statistics of the pools and caches are logged periodically from then
+    on.
+    """
+    startup.start()
+    stats.start()
+
+
+def get_startup_state() -> StartupState:
+    """Get the state of the startup.
+
+    Returns:
+        StartupState: The state of the startup.
+    """
+    return startup.state
+
 
 def is_typesense_healthy() -> bool:
-    """Check if the Typesense search engine is healthy.
+    """Check if the search engine is healthy.
+
+    The search engine is not initialized by the check, so it is reported
+    unhealthy until the startup initializes it.
 
     Returns:
         bool: True if healthy, False otherwise.
     """
-    return typesense.search_engine.is_healthy()
+    if not searches.is_initialized():
+        return False
+
+    return searches.get_search_engine().is_healthy()
+
+
+def is_ollama_healthy() -> bool:
+    """Check if the embedding model is healthy.
+
+    Returns:
+        bool: True if healthy, False otherwise.
+    """
+    return embeddings.model().is_healthy()
+
+
+def is_azure_openai_healthy() -> bool:
+    """Check if the chat model is healthy.
+
+    Returns:
+        bool: True if healthy, False otherwise.
+    """
+    return chats.model().is_healthy()
 
 
 def get_recipe(id: int) -> models.RecipeModel:
-    """Get the recipe details.
+    """Get the recipe details, from the recipe cache if possible.
+
+    The cached recipes are shared, so they must not be modified.
 
     Arguments:
         id (int): The ID of the recipe.
@@ -31,17 +123,67 @@ def get_recipe(id: int) -> models.RecipeModel:
     Returns:
         models.RecipeModel: The recipe details.
     """
-    with Session(engine) as session:
-        stmt = select(models.RecipeModel).where(models.RecipeModel.id == id)
-        recipe = session.execute(stmt).scalar_one()
+    key = _recipe_cache_key(id)
+    recipe = recipe_cache.get(key)
+    if recipe is not None:
+        return recipe
+
+    with get_session() as session:
+        recipe = session.get_one(models.RecipeModel, id)
+        _cache_recipe(session, key, recipe)
 
     return recipe
 
 
+def get_recipe_and_user_profile(
+    id: int, username: str
+) -> Tuple[models.RecipeModel, Optional[models.UserProfileModel]]:
+    """Get the recipe details and the user profile in one query.
+
+    Cached recipes and user profiles are not queried again. NoResultFound is
+    raised if the recipe does not exist.
+
+    Arguments:
+        id (int): The ID of the recipe.
+        username (str): The username.
+
+    Returns:
+        Tuple[models.RecipeModel, Optional[models.UserProfileModel]]: The
+            recipe details, and the user profile if it exists.
+    """
+    recipe_key = _recipe_cache_key(id)
+    recipe = recipe_cache.get(recipe_key)
+    profile_key = _user_profile_cache_key(username)
+    profile = user_profile_cache.get(profile_key, _MISSING)
+
+    if recipe is not None:
+        return recipe, (
+            get_user_profile(username) if profile is _MISSING else profile
+        )
+    if profile is not _MISSING:
+        return get_recipe(id), profile
+
+    with get_session() as session:
+        stmt = (
+            select(models.RecipeModel, models.UserProfileModel)
+            .outerjoin(
+                models.UserProfileModel,
+                models.UserProfileModel.username == username,
+            )
+            .where(models.RecipeModel.id == id)
+        )
+        recipe, profile = session.execute(stmt).one()
+        _cache_recipe(session, recipe_key, recipe)
+        _cache_user_profile(session, profile_key, profile)
+
+    return recipe, profile
+
+
 def get_recipes(ids: Iterable[int]) -> List[models.RecipeModel]:
-    """Get the recipe details.
+    """Get the recipe details, from the recipe cache if possible.
 
-    This function does not guarantee the order of the recipes.
+    This function does not guarantee the order of the recipes. The recipes
+    missing from the cache are fetched in one query.
 
     Arguments:
         ids (Iterable[int]): The IDs of the recipes.
@@ -49,9 +191,26 @@ def get_recipes(ids: Iterable[int]) -> List[models.RecipeModel]:
     Returns:
         List[models.RecipeModel]: The recipe details.
     """
-    with Session(engine) as session:
-        stmt = select(models.RecipeModel).where(models.RecipeModel.id.in_(ids))
-        recipes = session.execute(stmt).scalars().all()
+    recipes: List[models.RecipeModel] = []
+    missing_keys: Dict[int, Tuple[int, int]] = {}
+    for id in ids:
+        key = _recipe_cache_key(id)
+        recipe = recipe_cache.get(key)
+        if recipe is None:
+            missing_keys[id] = key
+        else:
+            recipes.append(recipe)
+
+    if not missing_keys:
+        return recipes
+
+    with get_session() as session:
+        stmt = select(models.RecipeModel).where(
+            models.RecipeModel.id.in_(missing_keys)
+        )
+        for recipe in session.execute(stmt).scalars().all():
+            _cache_recipe(session, missing_keys[recipe.id], recipe)
+            recipes.append(recipe)
 
     return recipes
 
@@ -67,6 +226,69 @@ def add_recipes(
     Returns:
         List[models.RecipeModel]: The added recipes.
     """
+    recipes = _insert_recipes(recipes)
+
+    searches.get_search_engine().add_recipes(recipes)
+    invalidate_search_cache()
+
+    return recipes
+
+
+def add_recipes_stream(
+    recipes: Iterable[models.RecipeModel],
+) -> Iterator[List[models.RecipeModel]]:
+    """Add the recipes to the database in batches.
+
+    Batches are inserted into the database, embedded and added to the search
+    engine by a pipeline, so the stages of consecutive batches overlap and
+    the recipes are consumed no faster than they can be indexed.
+
+    Arguments:
+        recipes (Iterable[models.RecipeModel]): The recipes to add.
+
+    Returns:
+        Iterator[List[models.RecipeModel]]: The added recipes of each batch,
+            once the batch is searchable.
+    """
+
+    def embed(
+        batch: List[models.RecipeModel],
+    ) -> Tuple[List[models.RecipeModel], List[List[float]]]:
+        return batch, embeddings.model().embed_recipes(batch)
+
+    def index(
+        batch: Tuple[List[models.RecipeModel], List[List[float]]],
+    ) -> List[models.RecipeModel]:
+        recipes, recipe_embeddings = batch
+        searches.get_search_engine().add_recipes(recipes, recipe_embeddings)
+        invalidate_search_cache()
+        return recipes
+
+    pipeline = Pipeline(
+        "add-recipes",
+        [_insert_recipes, embed, index],
+        queue_size=configs.domain_add_recipes_queue_size,
+    )
+
+    yield from pipeline.run(
+        list(batch)
+        for batch in itertools.batched(
+            recipes, configs.domain_add_recipes_batch_size
+        )
+    )
+
+
+def _insert_recipes(
+    recipes: List[models.RecipeModel],
+) -> List[models.RecipeModel]:
+    """Insert the recipes into the database.
+
+    Arguments:
+        recipes (List[models.RecipeModel]): The recipes to insert.
+
+    Returns:
+        List[models.RecipeModel]: The inserted recipes.
+    """
     # chat = chats.model()
     for recipe in recipes:
         if not recipe.veggie_identity:
@@ -74,13 +296,12 @@ def add_recipes(
             #     recipe
             # )
             recipe.veggie_identity = models.UserProfileModelVeggieIdentity.NONE
+        recipe.content_hash = embeddings.model().recipe_hash(recipe)
 
     with Session(engine, expire_on_commit=False) as session:
         session.add_all(recipes)
         session.commit()
 
-    typesense.search_engine.add_recipes(recipes)
-
     return recipes
 
 
@@ -94,7 +315,9 @@ def search_recipes(
 ) -> List[models.TypesenseResult]:
     """Search recipes by ingredients.
 
-    Results are ordered by relevance.
+    Results are ordered by relevance. Results are cached by the normalized
+    query, the user profile version and the page, until recipes are added or
+    reset, the user profile is set, or the cache TTL expires.
 
     Arguments:
         ingredients (Iterable[str]): The list of ingredients to search.
@@ -106,18 +329,76 @@ def search_recipes(
             configs.domain.configs.default_search_per_page.
         include_detail (bool): Whether to include the recipe details. Defaults
             to False. If False, only the recipe ID, name, and ingredients are
-            assigned to the returned recipes.
+            assigned to the returned recipes. If True, results whose recipe
+            is missing from the database are logged and left out.
 
     Returns:
         List[models.TypesenseResult]: The list of results.
     """
+    ingredients = sorted(
+        {
+            ingredient.strip().lower()
+            for ingredient in ingredients
+            if ingredient.strip()
+        }
+    )
+    extra_terms = " ".join(extra_terms.split()) if extra_terms else None
+
     logger.debug(
         f"Searching for recipes with: ingredients={ingredients},"
         f" username={username}, extra_terms={extra_terms}, page={page},"
         f" per_page={per_page}, include_detail={include_detail}"
     )
 
-    profile = get_user_profile(username)
+    key = (
+        generations.get(RECIPES_GENERATION),
+        generations.get(USER_PROFILES_GENERATION),
+        generations.get((USER_PROFILES_GENERATION, username)),
+        tuple(ingredients),
+        username,
+        extra_terms,
+        page,
+        per_page,
+        include_detail,
+    )
+    results = search_cache.get(key)
+    if results is not None:
+        logger.debug(f"Search cache hit, hit rate={search_cache.hit_rate}")
+        return results
+
+    results = _search_recipes(
+        ingredients, username, extra_terms, page, per_page, include_detail
+    )
+    search_cache.set(key, results)
+
+    return results
+
+
+def _search_recipes(
+    ingredients: List[str],
+    username: str,
+    extra_terms: Optional[str],
+    page: int,
+    per_page: int,
+    include_detail: bool,
+) -> List[models.TypesenseResult]:
+    """Search recipes by ingredients without the search cache.
+
+    Arguments:
+        ingredients (List[str]): The normalized ingredients to search.
+        username (str): The username of the user profile to use.
+        extra_terms (Optional[str]): The normalized extra terms to search for.
+        page (int): The page number to return.
+        per_page (int): The number of recipes to return per page.
+        include_detail (bool): Whether to include the recipe details.
+
+    Returns:
+        List[models.TypesenseResult]: The list of results.
+    """
+    # The units of work only cover the reads, so no connection is held while
+    # embedding or searching
+    with unit_of_work():
+        profile = get_user_profile(username)
 
     if profile:
         embedding = profile.embedding
@@ -136,7 +417,7 @@ def search_recipes(
             embedding = embeddings.model().embed(extra_terms)
             logger.debug("Extra terms used")
 
-    results = typesense.search_engine.search_recipes(
+    results = searches.get_search_engine().search_recipes(
         ingredients,
         embedding,
         page=page,
@@ -146,16 +427,28 @@ def search_recipes(
     if not include_detail:
         return results
 
-    result_ids = [result.recipe.id for result in results]
+    with unit_of_work():
+        recipes = {
+            recipe.id: recipe
+            for recipe in get_recipes(result.recipe.id for result in results)
+        }
 
-    recipes = sorted(
-        get_recipes(result.recipe.id for result in results),
-        key=lambda recipe: result_ids.index(recipe.id),
-    )
+    missing_ids = [
+        result.recipe.id
+        for result in results
+        if result.recipe.id not in recipes
+    ]
+    if missing_ids:
+        logger.warning(
+            f"Search results without recipe in database: ids={missing_ids}"
+        )
 
     return [
-        models.TypesenseResult(recipe=recipe, highlights=result.highlights)
-        for recipe, result in zip(recipes, results)
+        models.TypesenseResult(
+            recipe=recipes[result.recipe.id], highlights=result.highlights
+        )
+        for result in results
+        if result.recipe.id in recipes
     ]
 
 
@@ -163,6 +456,7 @@ def chat_by_recipe(
     name: str,
     username: str,
     recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
     messages: Iterable[models.ChatMessageModel],
 ) -> models.ChatResponseModel:
     """Chat with the model by recipe.
@@ -171,6 +465,8 @@ def chat_by_recipe(
         name (str): The name of the user.
         username (str): The username of the user profile to use.
         recipe (models.RecipeModel): The recipe to chat with.
+        profile (Optional[models.UserProfileModel]): The user profile, if it
+            exists.
         messages (Iterable[models.ChatMessageModel]): The messages to chat
             with.
 
@@ -181,6 +477,7 @@ def chat_by_recipe(
 
     chat = chats.model()
     chat.set_user(name, username)
+    chat.set_user_profile(profile)
     chat.set_recipe(recipe)
 
     messages = messages[-configs.domain_chat_message_limit :]
@@ -194,6 +491,7 @@ def chat_by_recipe_stream(
     name: str,
     username: str,
     recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
     messages: Iterable[models.ChatMessageModel],
 ) -> Iterable[models.ChatStreamModel]:
     """Chat with the model by recipe and return a stream of messages.
@@ -202,6 +500,8 @@ def chat_by_recipe_stream(
         name (str): The name of the user.
         username (str): The username of the user profile to use.
         recipe (models.RecipeModel): The recipe to chat with.
+        profile (Optional[models.UserProfileModel]): The user profile, if it
+            exists.
         messages (Iterable[models.ChatMessageModel]): The messages to chat
             with.
 
@@ -212,6 +512,7 @@ def chat_by_recipe_stream(
 
     chat = chats.model()
     chat.set_user(name, username)
+    chat.set_user_profile(profile)
     chat.set_recipe(recipe)
 
     messages = messages[-configs.domain_chat_message_limit :]
@@ -221,6 +522,43 @@ def chat_by_recipe_stream(
     return chat.chat_stream(messages)
 
 
+def chat_by_recipe_stream_async(
+    name: str,
+    username: str,
+    recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
+    messages: Iterable[models.ChatMessageModel],
+) -> AsyncIterator[models.ChatStreamModel]:
+    """Chat with the model by recipe and return a stream of messages, without
+    blocking the event loop.
+
+    Arguments:
+        name (str): The name of the user.
+        username (str): The username of the user profile to use.
+        recipe (models.RecipeModel): The recipe to chat with.
+        profile (Optional[models.UserProfileModel]): The user profile, if it
+            exists.
+        messages (Iterable[models.ChatMessageModel]): The messages to chat
+            with.
+
+    Returns:
+        AsyncIterator[models.ChatStreamModel]: The response stream of
+            messages.
+    """
+    logger.debug(f"Chatting with {name} by recipe {recipe.title}")
+
+    chat = chats.model()
+    chat.set_user(name, username)
+    chat.set_user_profile(profile)
+    chat.set_recipe(recipe)
+
+    messages = messages[-configs.domain_chat_message_limit :]
+
+    logger.debug(f"Messages: {messages}")
+
+    return chat.chat_stream_async(messages)
+
+
 def reset_data():
     """Reset the data."""
     with Session(engine) as session:
@@ -232,9 +570,28 @@ def reset_data():
             )
         )
 
+        notifications.notify(session, RECIPES_GENERATION, "reset")
         session.commit()
 
-    typesense.search_engine.remove_all_recipes()
+    searches.get_search_engine().remove_all_recipes()
+    invalidate_recipes()
+
+
+def invalidate_recipes(_: Optional[str] = None):
+    """Invalidate every cached recipe and search result.
+
+    Arguments:
+        _ (Optional[str]): The key of the notification, unused.
+    """
+    generations.bump(RECIPE_DETAILS_GENERATION)
+    recipe_cache.clear()
+    invalidate_search_cache()
+
+
+def invalidate_search_cache():
+    """Invalidate every cached search result."""
+    generations.bump(RECIPES_GENERATION)
+    search_cache.clear()
 
 
 def set_user_profile(profile: models.UserProfileModel):
@@ -243,9 +600,11 @@ def set_user_profile(profile: models.UserProfileModel):
     Arguments:
         profile (models.UserProfileModel): The user profile.
     """
-    if not profile.embedding:
+    if profile.embedding is None:
         profile.embedding = embeddings.model().embed_user_profile(profile)
 
+    username = profile.username
+
     with Session(engine) as session:
         stmt = select(models.UserProfileModel).where(
             models.UserProfileModel.username == profile.username
@@ -260,11 +619,16 @@ def set_user_profile(profile: models.UserProfileModel):
         else:
             session.add(profile)
 
+        notifications.notify(session, USER_PROFILES_GENERATION, username)
         session.commit()
 
+    invalidate_user_profile(username)
+
 
 def get_user_profile(username: str) -> Optional[models.UserProfileModel]:
-    """Get the user profile.
+    """Get the user profile, from the profile cache if possible.
+
+    The cached profiles are shared, so they must not be modified.
 
     Arguments:
         username (str): The username.
@@ -272,10 +636,100 @@ def get_user_profile(username: str) -> Optional[models.UserProfileModel]:
     Returns:
         Optional[models.UserProfileModel]: The user profile.
     """
-    with Session(engine) as session:
-        stmt = select(models.UserProfileModel).where(
-            models.UserProfileModel.username == username
-        )
-        profile = session.execute(stmt).scalar_one_or_none()
+    key = _user_profile_cache_key(username)
+    profile = user_profile_cache.get(key, _MISSING)
+    if profile is not _MISSING:
+        return profile
+
+    with get_session() as session:
+        profile = session.get(models.UserProfileModel, username)
+        _cache_user_profile(session, key, profile)
 
     return profile
+
+
+def invalidate_user_profile(username: Optional[str]):
+    """Invalidate a cached user profile and the searches that used it.
+
+    Arguments:
+        username (Optional[str]): The username, or None to invalidate every
+            user profile.
+    """
+    if username is None:
+        generations.bump(USER_PROFILES_GENERATION)
+        user_profile_cache.clear()
+        return
+
+    generations.bump((USER_PROFILES_GENERATION, username))
+
+
+def _recipe_cache_key(id: int) -> Tuple[int, int]:
+    """Get the recipe cache key of a recipe.
+
+    The key includes the generation of the recipes, as the IDs are reused
+    after the data is reset.
+
+    Arguments:
+        id (int): The ID of the recipe.
+
+    Returns:
+        Tuple[int, int]: The cache key.
+    """
+    return (generations.get(RECIPE_DETAILS_GENERATION), id)
+
+
+def _cache_recipe(
+    session: Session, key: Tuple[int, int], recipe: models.RecipeModel
+):
+    """Cache a recipe, detaching it from its session.
+
+    Arguments:
+        session (Session): The session the recipe was loaded in.
+        key (Tuple[int, int]): The cache key.
+        recipe (models.RecipeModel): The recipe.
+    """
+    session.expunge(recipe)
+    recipe_cache.set(key, recipe)
+
+
+def _user_profile_cache_key(username: str) -> Tuple[Hashable, ...]:
+    """Get the profile cache key of a user.
+
+    The key includes the generations of the profile, so a profile read
+    before an invalidation is never cached under the new key.
+
+    Arguments:
+        username (str): The username.
+
+    Returns:
+        Tuple[Hashable, ...]: The cache key.
+    """
+    return (
+        username,
+        generations.get(USER_PROFILES_GENERATION),
+        generations.get((USER_PROFILES_GENERATION, username)),
+    )
+
+
+def _cache_user_profile(
+    session: Session,
+    key: Tuple[Hashable, ...],
+    profile: Optional[models.UserProfileModel],
+):
+    """Cache a user profile, detaching it from its session.
+
+    Arguments:
+        session (Session): The session the profile was loaded in.
+        key (Tuple[Hashable, ...]): The cache key.
+        profile (Optional[models.UserProfileModel]): The user profile, None
+            is cached as well.
+    """
+    if profile is not None:
+        session.expunge(profile)
+    user_profile_cache.set(key, profile)
+
+
+notifications.listener.subscribe(RECIPES_GENERATION, invalidate_recipes)
+notifications.listener.subscribe(
+    USER_PROFILES_GENERATION, invalidate_user_profile
+)
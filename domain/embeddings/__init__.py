@@ -1,3 +1,9 @@
+from domain.embeddings.cache import CachedEmbedding
 from domain.embeddings.ollama import OllamaEmbedding
 
-model = OllamaEmbedding
+
+class CachedOllamaEmbedding(CachedEmbedding, OllamaEmbedding):
+    """Ollama embedding model served through the embedding cache"""
+
+
+model = CachedOllamaEmbedding
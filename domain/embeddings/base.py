@@ -1,5 +1,6 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from infra import models
 
@@ -7,6 +8,16 @@ from infra import models
 class BaseEmbedding(ABC):
     """Base class for embeddings"""
 
+    @staticmethod
+    @abstractmethod
+    def model_name() -> str:
+        """Get the name of the embedding model.
+
+        Returns:
+            str: The name of the embedding model.
+        """
+        pass
+
     @staticmethod
     @abstractmethod
     def num_dim() -> int:
@@ -17,6 +28,15 @@ class BaseEmbedding(ABC):
         """
         pass
 
+    @abstractmethod
+    def is_healthy(self) -> bool:
+        """Check if the embedding model is healthy.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        pass
+
     @abstractmethod
     def embed(self, text: str) -> List[float]:
         """Embed the text.
@@ -29,16 +49,31 @@ class BaseEmbedding(ABC):
         """
         pass
 
-    def embed_recipe(self, recipe: models.RecipeModel) -> List[float]:
-        """Embed the recipe.
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed the texts.
+
+        Models that support batched requests should override this, the
+        default implementation embeds the texts one by one.
 
         Arguments:
-            recipe (models.RecipeModel): The recipe to embed.
+            texts (Sequence[str]): The texts to embed.
 
         Returns:
-            List[float]: The embedding of the recipe.
+            List[List[float]]: The embeddings of the texts, in the same order.
+        """
+        return [self.embed(text) for text in texts]
+
+    @staticmethod
+    def recipe_text(recipe: models.RecipeModel) -> str:
+        """Get the text to embed for the recipe.
+
+        Arguments:
+            recipe (models.RecipeModel): The recipe.
+
+        Returns:
+            str: The text representing the recipe.
         """
-        text = ", ".join(
+        return ", ".join(
             [
                 f"Title of recipe: {recipe.title}",
                 recipe.description,
@@ -51,7 +86,51 @@ class BaseEmbedding(ABC):
                 ),
             ]
         )
-        return self.embed(text)
+
+    def recipe_hash(self, recipe: models.RecipeModel) -> str:
+        """Get the content hash of the recipe.
+
+        The hash changes whenever the embedded text of the recipe or the
+        embedding model changes, so an indexed recipe with a different hash
+        has to be embedded and indexed again.
+
+        Arguments:
+            recipe (models.RecipeModel): The recipe.
+
+        Returns:
+            str: The content hash of the recipe.
+        """
+        return hashlib.sha256(
+            f"{self.model_name()}\0{self.num_dim()}\0"
+            f"{self.recipe_text(recipe)}".encode()
+        ).hexdigest()
+
+    def embed_recipe(self, recipe: models.RecipeModel) -> List[float]:
+        """Embed the recipe.
+
+        Arguments:
+            recipe (models.RecipeModel): The recipe to embed.
+
+        Returns:
+            List[float]: The embedding of the recipe.
+        """
+        return self.embed(self.recipe_text(recipe))
+
+    def embed_recipes(
+        self, recipes: Sequence[models.RecipeModel]
+    ) -> List[List[float]]:
+        """Embed the recipes in batches.
+
+        Arguments:
+            recipes (Sequence[models.RecipeModel]): The recipes to embed.
+
+        Returns:
+            List[List[float]]: The embeddings of the recipes, in the same
+                order.
+        """
+        return self.embed_many(
+            [self.recipe_text(recipe) for recipe in recipes]
+        )
 
     def embed_user_profile(
         self,
@@ -0,0 +1,372 @@
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from configs.domain import configs
+from domain.caches import LRUCache
+from domain.embeddings.base import BaseEmbedding
+from infra import models
+from infra.db import engine
+
+
+class EmbeddingCache:
+    """Embedding cache with an in-process and a persistent tier
+
+    The in-process tier is a LRU cache, the optional persistent tier is a
+    database table evicted by age once it grows past its size limit. Bulk
+    embeddings, e.g. recipes on import, have their own in-process LRU cache,
+    so they do not evict the query and profile embeddings.
+    """
+
+    PRUNE_INTERVAL = 1000
+    """Number of persistent writes between size-based evictions"""
+
+    PERSISTENT_BATCH = 1000
+    """Number of keys per persistent tier query"""
+
+    logger: logging.Logger
+    memory: LRUCache[str, List[float]]
+    bulk_memory: LRUCache[str, List[float]]
+    persistent: bool
+    persistent_size: int
+    persistent_hits: int
+    persistent_misses: int
+    _persistent_writes: int
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        max_size: int,
+        bulk_max_size: int = 0,
+        persistent: bool = False,
+        persistent_size: int = 0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.memory = LRUCache(max_size)
+        self.bulk_memory = LRUCache(bulk_max_size)
+        self.persistent = persistent
+        self.persistent_size = persistent_size
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+        self._persistent_writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, num_dim: int, text: str) -> str:
+        """Get the cache key of a text.
+
+        Arguments:
+            model (str): The name of the embedding model.
+            num_dim (int): The number of dimensions of the embedding.
+            text (str): The embedded text.
+
+        Returns:
+            str: The cache key.
+        """
+        return hashlib.sha256(
+            f"{model}\0{num_dim}\0{text}".encode()
+        ).hexdigest()
+
+    @property
+    def hits(self) -> int:
+        """Get the number of lookups served by any tier."""
+        return self.memory.hits + self.bulk_memory.hits + self.persistent_hits
+
+    @property
+    def misses(self) -> int:
+        """Get the number of lookups that missed every tier."""
+        if self.persistent:
+            return self.persistent_misses
+        return self.memory.misses + self.bulk_memory.misses
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get an embedding from the cache.
+
+        Arguments:
+            key (str): The cache key.
+
+        Returns:
+            Optional[List[float]]: The embedding, or None if not cached.
+        """
+        return self.get_many([key])[0]
+
+    def get_many(
+        self, keys: Sequence[str], bulk: bool = False
+    ) -> List[Optional[List[float]]]:
+        """Get embeddings from the cache, with one query for the keys not in
+        the in-process tier.
+
+        The persistent hits are added to the in-process tier.
+
+        Arguments:
+            keys (Sequence[str]): The cache keys.
+            bulk (bool): Whether to use the in-process tier of the bulk
+                embeddings. Defaults to False.
+
+        Returns:
+            List[Optional[List[float]]]: The embeddings, in the same order,
+                None for the keys not cached.
+        """
+        memory = self.bulk_memory if bulk else self.memory
+        embeddings: List[Optional[List[float]]] = [
+            memory.get(key) for key in keys
+        ]
+        missing = list(
+            dict.fromkeys(
+                key
+                for key, embedding in zip(keys, embeddings)
+                if embedding is None
+            )
+        )
+        if not missing or not self.persistent:
+            return embeddings
+
+        Model = models.EmbeddingCacheModel
+        found: Dict[str, List[float]] = {}
+
+        try:
+            with Session(engine) as session:
+                for start in range(0, len(missing), self.PERSISTENT_BATCH):
+                    rows = session.execute(
+                        select(Model.key, Model.embedding).where(
+                            Model.key.in_(
+                                missing[start : start + self.PERSISTENT_BATCH]
+                            )
+                        )
+                    )
+                    found.update(
+                        (
+                            key,
+                            np.frombuffer(data, dtype=np.float32).tolist(),
+                        )
+                        for key, data in rows
+                    )
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Persistent embedding cache read failed: {e}")
+
+        with self._lock:
+            self.persistent_hits += len(found)
+            self.persistent_misses += len(missing) - len(found)
+
+        for key, embedding in found.items():
+            memory.set(key, embedding)
+
+        return [
+            embedding if embedding is not None else found.get(key)
+            for key, embedding in zip(keys, embeddings)
+        ]
+
+    def set(self, key: str, model: str, num_dim: int, embedding: List[float]):
+        """Set an embedding in the cache.
+
+        Arguments:
+            key (str): The cache key.
+            model (str): The name of the embedding model.
+            num_dim (int): The number of dimensions of the embedding.
+            embedding (List[float]): The embedding.
+        """
+        self.set_many({key: embedding}, model, num_dim)
+
+    def set_many(
+        self,
+        embeddings: Dict[str, List[float]],
+        model: str,
+        num_dim: int,
+        bulk: bool = False,
+    ):
+        """Set embeddings in the cache, with one insert for the persistent
+        tier.
+
+        Arguments:
+            embeddings (Dict[str, List[float]]): The embeddings by cache key.
+            model (str): The name of the embedding model.
+            num_dim (int): The number of dimensions of the embeddings.
+            bulk (bool): Whether to use the in-process tier of the bulk
+                embeddings. Defaults to False.
+        """
+        memory = self.bulk_memory if bulk else self.memory
+        for key, embedding in embeddings.items():
+            memory.set(key, embedding)
+
+        if not self.persistent or not embeddings:
+            return
+
+        Model = models.EmbeddingCacheModel
+        dialect = (
+            postgresql if engine.dialect.name == "postgresql" else sqlite
+        )
+        rows = [
+            {
+                "key": key,
+                "model": model,
+                "num_dim": num_dim,
+                "embedding": np.asarray(embedding, dtype=np.float32).tobytes(),
+            }
+            for key, embedding in embeddings.items()
+        ]
+
+        try:
+            with Session(engine) as session:
+                for start in range(0, len(rows), self.PERSISTENT_BATCH):
+                    session.execute(
+                        dialect.insert(Model)
+                        .values(rows[start : start + self.PERSISTENT_BATCH])
+                        .on_conflict_do_nothing(index_elements=[Model.key])
+                    )
+                session.commit()
+        except SQLAlchemyError as e:
+            self.logger.warning(
+                f"Persistent embedding cache write failed: {e}"
+            )
+            return
+
+        with self._lock:
+            writes = self._persistent_writes
+            self._persistent_writes += len(rows)
+            prune = (
+                writes // self.PRUNE_INTERVAL
+                != self._persistent_writes // self.PRUNE_INTERVAL
+            )
+
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Evict the oldest persistent entries beyond the size limit."""
+        Model = models.EmbeddingCacheModel
+        threshold = (
+            select(Model.created_at)
+            .order_by(Model.created_at.desc())
+            .offset(self.persistent_size)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        try:
+            with Session(engine) as session:
+                result = session.execute(
+                    delete(Model).where(Model.created_at <= threshold)
+                )
+                session.commit()
+        except SQLAlchemyError as e:
+            self.logger.warning(
+                f"Persistent embedding cache prune failed: {e}"
+            )
+            return
+
+        self.logger.info(
+            f"Evicted {result.rowcount} persistent embedding cache entries"
+        )
+
+    def clear(self):
+        """Remove all embeddings from the in-process tiers."""
+        self.memory.clear()
+        self.bulk_memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache statistics.
+
+        Returns:
+            Dict[str, Any]: The statistics of each tier and the totals.
+        """
+        with self._lock:
+            persistent_hits = self.persistent_hits
+            persistent_misses = self.persistent_misses
+
+        hits = self.hits
+        misses = self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "memory": self.memory.stats(),
+            "bulk_memory": self.bulk_memory.stats(),
+            "persistent": {
+                "enabled": self.persistent,
+                "hits": persistent_hits,
+                "misses": persistent_misses,
+            },
+        }
+
+
+cache = EmbeddingCache(
+    max_size=configs.domain_embedding_cache_size,
+    bulk_max_size=configs.domain_embedding_bulk_cache_size,
+    persistent=configs.domain_embedding_cache_persistent,
+    persistent_size=configs.domain_embedding_cache_persistent_size,
+)
+
+
+class CachedEmbedding(BaseEmbedding):
+    """Mixin to serve embeddings from the embedding cache
+
+    It must be placed before the embedding model in the base classes, e.g.
+    `class CachedOllamaEmbedding(CachedEmbedding, OllamaEmbedding)`.
+    """
+
+    def embed(self, text: str) -> List[float]:
+        """Embed the text, using the cached embedding if there is one.
+
+        Arguments:
+            text (str): The text to embed.
+
+        Returns:
+            List[float]: The embedding of the text.
+        """
+        model = self.model_name()
+        num_dim = self.num_dim()
+        key = cache.key(model, num_dim, text)
+
+        embedding = cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = super().embed(text)
+        cache.set(key, model, num_dim, embedding)
+
+        return embedding
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed the texts, only sending the uncached texts to the model.
+
+        The texts are embedded in bulk, e.g. recipes on import, so they use
+        the in-process tier of the bulk embeddings, to keep the query and
+        profile embeddings from being evicted.
+
+        Arguments:
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: The embeddings of the texts, in the same order.
+        """
+        model = self.model_name()
+        num_dim = self.num_dim()
+        keys = [cache.key(model, num_dim, text) for text in texts]
+
+        embeddings = cache.get_many(keys, bulk=True)
+        missing: Dict[str, str] = {
+            key: text
+            for key, text, embedding in zip(keys, texts, embeddings)
+            if embedding is None
+        }
+
+        if missing:
+            computed = dict(
+                zip(missing, super().embed_many(list(missing.values())))
+            )
+            cache.set_many(computed, model, num_dim, bulk=True)
+
+            embeddings = [
+                embedding if embedding is not None else computed[key]
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        return embeddings
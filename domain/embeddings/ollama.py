@@ -1,25 +1,155 @@
+import itertools
 import logging
-from typing import List
+import threading
+import time
+from concurrent import futures
+from typing import List, Sequence, Union
 
+import httpx
 import ollama
 
 from configs.ollama import configs
+from domain import clients
 from domain.embeddings.base import BaseEmbedding
 
 
+class OllamaWorkers:
+    """Pool of embedding workers shared by every Ollama embedding
+
+    Requests are spread round-robin over the Ollama instances, at most
+    `workers` at a time, and transient errors are retried on the next
+    instance with exponential backoff.
+    """
+
+    logger: logging.Logger
+    hosts: List[str]
+    max_retries: int
+    backoff: float
+    executor: futures.ThreadPoolExecutor
+    _hosts: "itertools.cycle[str]"
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        workers: int,
+        max_retries: int,
+        backoff: float,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.hosts = list(hosts)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ollama-embed"
+        )
+        self._hosts = itertools.cycle(self.hosts)
+        self._lock = threading.Lock()
+
+    def next_host(self) -> str:
+        """Get the next Ollama instance in the rotation.
+
+        Returns:
+            str: The Ollama base URL.
+        """
+        with self._lock:
+            return next(self._hosts)
+
+    def is_healthy(self) -> bool:
+        """Check if every Ollama instance is healthy.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        try:
+            for host in self.hosts:
+                clients.ollama_client(host).list()
+            return True
+        except Exception as e:
+            self.logger.error(f"Ollama health check failed: {e}")
+            return False
+
+    def embed(self, input: Union[str, List[str]]) -> List[List[float]]:
+        """Embed the input, retrying transient errors.
+
+        Arguments:
+            input (Union[str, List[str]]): The text or texts to embed.
+
+        Returns:
+            List[List[float]]: The embeddings of the input.
+        """
+        for attempt in range(self.max_retries + 1):
+            host = self.next_host()
+            try:
+                response = clients.ollama_client(host).embed(
+                    model=configs.ollama_model, input=input
+                )
+                return response.embeddings
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_transient(e):
+                    raise
+
+                delay = self.backoff * 2**attempt
+                self.logger.warning(
+                    f"Embedding on {host} failed, retrying in {delay}s: {e}"
+                )
+                time.sleep(delay)
+
+    def embed_many(
+        self, inputs: Sequence[List[str]]
+    ) -> List[List[List[float]]]:
+        """Embed the inputs concurrently.
+
+        Arguments:
+            inputs (Sequence[List[str]]): The chunks of texts to embed.
+
+        Returns:
+            List[List[List[float]]]: The embeddings of each chunk, in the
+                same order.
+        """
+        return list(self.executor.map(self.embed, inputs))
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """Check if an error may not happen again on retry.
+
+        Arguments:
+            error (Exception): The error.
+
+        Returns:
+            bool: True if transient, False otherwise.
+        """
+        if isinstance(error, ollama.ResponseError):
+            return error.status_code == 429 or error.status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+
+workers = OllamaWorkers(
+    configs.hosts,
+    workers=configs.ollama_embed_workers,
+    max_retries=configs.ollama_embed_max_retries,
+    backoff=configs.ollama_embed_retry_backoff_seconds,
+)
+
+
 class OllamaEmbedding(BaseEmbedding):
     """Ollama embedding model"""
 
     logger: logging.Logger
-    client: ollama.Client
+    workers: OllamaWorkers
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.client = ollama.Client(
-            host=configs.ollama_base_url,
-        )
+        self.workers = workers
 
-        self.logger.info(f"{configs.ollama_model} initialized")
+    @staticmethod
+    def model_name() -> str:
+        """Get the name of the embedding model.
+
+        Returns:
+            str: The name of the embedding model.
+        """
+        return configs.ollama_model
 
     @staticmethod
     def num_dim() -> int:
@@ -30,6 +160,14 @@ class OllamaEmbedding(BaseEmbedding):
         """
         return configs.ollama_num_dim
 
+    def is_healthy(self) -> bool:
+        """Check if the embedding model is healthy.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        return self.workers.is_healthy()
+
     def embed(self, text: str) -> List[float]:
         """Embed the text.
 
@@ -41,6 +179,30 @@ class OllamaEmbedding(BaseEmbedding):
         """
         self.logger.debug(f"Embedding text: {text}")
 
-        response = self.client.embed(model=configs.ollama_model, input=text)
+        return self.workers.embed(text)[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed the texts with one request per chunk of texts.
+
+        The chunks are embedded concurrently by the shared workers.
+
+        Arguments:
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: The embeddings of the texts, in the same order.
+        """
+        batch_size = configs.ollama_embed_batch_size
+        batches = [
+            list(texts[start : start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        ]
+        self.logger.debug(
+            f"Embedding {len(texts)} texts in {len(batches)} requests"
+        )
 
-        return response.embeddings[0]
+        return [
+            embedding
+            for embeddings in self.workers.embed_many(batches)
+            for embedding in embeddings
+        ]
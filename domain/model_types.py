@@ -6,3 +6,17 @@ class ChatModelType(StrEnum):
 
     GPT4O = "gpt4o"
     GPT4O_MINI = "gpt4o_mini"
+
+
+class SearchEngineType(StrEnum):
+    """Type of search engine"""
+
+    TYPESENSE = "typesense"
+    LOCAL = "local"
+
+
+class StartupState(StrEnum):
+    """State of the service startup"""
+
+    STARTING = "starting"
+    READY = "ready"
@@ -0,0 +1,146 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure(Exception):
+    """Exception raised by a stage, passed down to the consumer"""
+
+    error: Exception
+
+    def __init__(self, error: Exception):
+        super().__init__(error)
+        self.error = error
+
+
+class Pipeline:
+    """Pipeline running each stage in its own thread
+
+    Stages are connected by bounded queues, so a slow stage holds back the
+    stages before it instead of buffering everything in memory. Items keep
+    their order, and an exception raised by a stage is raised to the
+    consumer. Closing the iterator early stops every stage. A pipeline is
+    run once.
+    """
+
+    name: str
+    stages: Sequence[Callable[[Any], Any]]
+    queue_size: int
+    _stop: threading.Event
+
+    def __init__(
+        self,
+        name: str,
+        stages: Sequence[Callable[[Any], Any]],
+        queue_size: int,
+    ):
+        self.name = name
+        self.stages = stages
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """Feed the source through the stages.
+
+        Arguments:
+            source (Iterable[Any]): The items to process. The source is
+                iterated in the thread of the first stage.
+
+        Returns:
+            Iterator[Any]: The outputs of the last stage, in order.
+        """
+        queues: List[queue.Queue] = [
+            queue.Queue(maxsize=self.queue_size) for _ in self.stages
+        ]
+        inputs = [source, *(self._drain(q) for q in queues[:-1])]
+
+        for index, (stage, items, output) in enumerate(
+            zip(self.stages, inputs, queues)
+        ):
+            threading.Thread(
+                target=self._run_stage,
+                args=(stage, items, output),
+                name=f"{self.name}-{index}",
+                daemon=True,
+            ).start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            self._stop.set()
+
+    def _run_stage(
+        self,
+        stage: Callable[[Any], Any],
+        items: Iterable[Any],
+        output: queue.Queue,
+    ):
+        """Apply a stage to every item and pass the results on.
+
+        Arguments:
+            stage (Callable[[Any], Any]): The stage.
+            items (Iterable[Any]): The inputs of the stage.
+            output (queue.Queue): The queue of the next stage.
+        """
+        try:
+            for item in items:
+                if not self._put(output, stage(item)):
+                    return
+            self._put(output, _DONE)
+        except _Failure as failure:
+            self._put(output, failure)
+        except Exception as e:
+            logger.error(f"Pipeline {self.name} stage failed: {e}")
+            self._put(output, _Failure(e))
+
+    def _drain(self, items: queue.Queue) -> Iterator[Any]:
+        """Get the items of a queue until the previous stage is done.
+
+        Arguments:
+            items (queue.Queue): The queue.
+
+        Returns:
+            Iterator[Any]: The items.
+        """
+        while not self._stop.is_set():
+            try:
+                item = items.get(timeout=POLL_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item
+            yield item
+
+    def _put(self, items: queue.Queue, item: Any) -> bool:
+        """Put an item in a queue unless the pipeline is stopped.
+
+        Arguments:
+            items (queue.Queue): The queue.
+            item (Any): The item.
+
+        Returns:
+            bool: True if the item was put, False if the pipeline stopped.
+        """
+        while not self._stop.is_set():
+            try:
+                items.put(item, timeout=POLL_INTERVAL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
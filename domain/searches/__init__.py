@@ -0,0 +1,46 @@
+import threading
+from typing import Dict, Optional, Type
+
+from configs.domain import configs
+from domain.model_types import SearchEngineType
+from domain.searches.base import BaseSearchEngine
+from domain.searches.local import LocalSearchEngine
+from domain.searches.typesense import TypesenseSearchEngine
+
+mapping: Dict[SearchEngineType, Type[BaseSearchEngine]] = {
+    SearchEngineType.TYPESENSE: TypesenseSearchEngine,
+    SearchEngineType.LOCAL: LocalSearchEngine,
+}
+
+_search_engine: Optional[BaseSearchEngine] = None
+_lock = threading.Lock()
+
+
+def get_search_engine() -> BaseSearchEngine:
+    """Get the search engine, initializing it on first use.
+
+    Initializing connects to the search engine and may start a rebuild, so it
+    is not done at import time. Concurrent callers wait for the first one.
+
+    Returns:
+        BaseSearchEngine: The search engine.
+    """
+    global _search_engine
+
+    if _search_engine is not None:
+        return _search_engine
+
+    with _lock:
+        if _search_engine is None:
+            _search_engine = mapping[configs.domain_search_engine]()
+
+    return _search_engine
+
+
+def is_initialized() -> bool:
+    """Check if the search engine is initialized.
+
+    Returns:
+        bool: True if initialized, False otherwise.
+    """
+    return _search_engine is not None
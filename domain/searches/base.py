@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Sequence
+
+from configs.domain import configs as domain_configs
+from infra import models
+
+
+class BaseSearchEngine(ABC):
+    """Base class for search engines"""
+
+    @abstractmethod
+    def is_healthy(self) -> bool:
+        """Check if the search engine is healthy.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def add_recipes(
+        self,
+        recipes: Iterable[models.RecipeModel],
+        recipe_embeddings: Optional[Sequence[Sequence[float]]] = None,
+    ):
+        """Add recipes to the search engine.
+
+        Arguments:
+            recipes (Iterable[models.RecipeModel]): The recipes to add.
+            recipe_embeddings (Optional[Sequence[Sequence[float]]]): The
+                embeddings of the recipes, in the same order. Defaults to
+                None, in which case the recipes are embedded.
+        """
+        pass
+
+    @abstractmethod
+    def remove_all_recipes(self):
+        """Remove all recipes from the search engine."""
+        pass
+
+    @abstractmethod
+    def search_recipes(
+        self,
+        ingredients: Iterable[str],
+        embedding: Optional[Sequence[float]],
+        page: int = 1,
+        per_page: int = domain_configs.domain_default_search_per_page,
+    ) -> List[models.TypesenseResult]:
+        """Search for recipes.
+
+        Arguments:
+            ingredients (Iterable[str]): The ingredients to search for.
+            embedding (Optional[Sequence[float]]): The embedding, a list or a
+                NumPy array.
+            page (int): The page number. Defaults to 1.
+            per_page (int): The number of results per page. Defaults to
+                domain_configs.default_search_per_page.
+
+        Returns:
+            List[models.TypesenseResult]: The list of recipe results.
+        """
+        pass
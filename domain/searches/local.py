@@ -0,0 +1,777 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from configs.domain import configs as domain_configs
+from domain import embeddings
+from domain.searches.base import BaseSearchEngine
+from infra import models
+from infra.db import engine
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+KMEANS_ITERATIONS = 10
+KMEANS_CHUNK_SIZE = 65536
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase search tokens.
+
+    Arguments:
+        text (str): The text.
+
+    Returns:
+        List[str]: The tokens.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize(vectors: npt.ArrayLike) -> npt.NDArray[np.float32]:
+    """Scale the vectors to unit length, so dot products are cosines.
+
+    Arguments:
+        vectors (npt.ArrayLike): The vectors, one per row.
+
+    Returns:
+        npt.NDArray[np.float32]: The normalized vectors.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def top_k(scores: npt.NDArray[np.float32], k: int) -> npt.NDArray[np.intp]:
+    """Get the positions of the highest scores, best first.
+
+    Arguments:
+        scores (npt.NDArray[np.float32]): The scores.
+        k (int): The number of positions.
+
+    Returns:
+        npt.NDArray[np.intp]: The positions.
+    """
+    if k < len(scores):
+        positions = np.argpartition(-scores, k)[:k]
+    else:
+        positions = np.arange(len(scores))
+    return positions[np.argsort(-scores[positions], kind="stable")]
+
+
+@dataclass
+class LocalIndex:
+    """Snapshot of the local index.
+
+    Snapshots are never modified once searched. Adding recipes creates a new
+    snapshot sharing the append-only documents and tokens of the previous
+    one, and each snapshot only sees the rows of its vectors, so searches
+    run without a lock and adding recipes does not copy the index.
+    """
+
+    documents: List[dict]
+    vectors: npt.NDArray[np.float32]
+    tokens: Dict[str, List[int]] = field(default_factory=dict)
+    centroids: Optional[npt.NDArray[np.float32]] = None
+    lists: List[npt.NDArray[np.intp]] = field(default_factory=list)
+    listed: int = 0
+
+    @classmethod
+    def create(
+        cls, documents: List[dict], vectors: npt.NDArray[np.float32]
+    ) -> "LocalIndex":
+        """Create an index of documents.
+
+        Arguments:
+            documents (List[dict]): The recipe documents.
+            vectors (npt.NDArray[np.float32]): The normalized embeddings, in
+                the same order.
+
+        Returns:
+            LocalIndex: The index.
+        """
+        index = cls(documents=documents, vectors=vectors)
+        index.add_tokens(0)
+        return index
+
+    @property
+    def size(self) -> int:
+        """Get the number of rows of the snapshot."""
+        return len(self.vectors)
+
+    def add_tokens(self, start: int):
+        """Add the tokens of the documents from a row on.
+
+        Arguments:
+            start (int): The first row.
+        """
+        for row in range(start, len(self.documents)):
+            document = self.documents[row]
+            for text in (
+                document["title"],
+                document["description"],
+                *document["ingredients"],
+            ):
+                for token in set(tokenize(text)):
+                    rows = self.tokens.setdefault(token, [])
+                    if not rows or rows[-1] != row:
+                        rows.append(row)
+
+    def extend(
+        self, documents: List[dict], vectors: npt.NDArray[np.float32]
+    ) -> "LocalIndex":
+        """Create a snapshot with more documents.
+
+        The inverted lists are kept, and the rows after them are scored
+        exactly until the lists are rebuilt.
+
+        Arguments:
+            documents (List[dict]): The added recipe documents.
+            vectors (npt.NDArray[np.float32]): The normalized embeddings of
+                every row, including the added ones.
+
+        Returns:
+            LocalIndex: The new snapshot.
+        """
+        start = len(self.documents)
+        self.documents.extend(documents)
+        self.add_tokens(start)
+
+        return LocalIndex(
+            documents=self.documents,
+            vectors=vectors,
+            tokens=self.tokens,
+            centroids=self.centroids,
+            lists=self.lists,
+            listed=self.listed,
+        )
+
+    def needs_lists(self, num_lists: int, unlisted_fraction: float) -> bool:
+        """Check if the inverted lists should be (re)built.
+
+        Arguments:
+            num_lists (int): The number of lists.
+            unlisted_fraction (float): The share of rows outside the lists
+                above which the lists are rebuilt.
+
+        Returns:
+            bool: True if the lists should be built, False otherwise.
+        """
+        if num_lists <= 0 or self.size < num_lists:
+            return False
+
+        return (
+            self.centroids is None
+            or self.size - self.listed > unlisted_fraction * self.size
+        )
+
+    def build_lists(self, num_lists: int):
+        """Cluster the vectors into inverted lists with spherical k-means.
+
+        Arguments:
+            num_lists (int): The number of lists.
+        """
+        if num_lists <= 0 or len(self.vectors) < num_lists:
+            return
+
+        rng = np.random.default_rng(0)
+        centroids = np.array(
+            self.vectors[
+                np.sort(
+                    rng.choice(len(self.vectors), num_lists, replace=False)
+                )
+            ]
+        )
+
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = self._assign(centroids)
+            sums = np.zeros_like(centroids)
+            for start in range(0, len(self.vectors), KMEANS_CHUNK_SIZE):
+                np.add.at(
+                    sums,
+                    assignments[start : start + KMEANS_CHUNK_SIZE],
+                    self.vectors[start : start + KMEANS_CHUNK_SIZE],
+                )
+            counts = np.bincount(assignments, minlength=num_lists)
+            centroids = np.where(
+                counts[:, None] > 0, normalize(sums), centroids
+            )
+
+        assignments = self._assign(centroids)
+        self.centroids = centroids
+        self.lists = [
+            np.flatnonzero(assignments == list_)
+            for list_ in range(num_lists)
+        ]
+        self.listed = len(self.vectors)
+
+    def _assign(
+        self, centroids: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.intp]:
+        """Get the closest centroid of every vector.
+
+        Arguments:
+            centroids (npt.NDArray[np.float32]): The centroids.
+
+        Returns:
+            npt.NDArray[np.intp]: The centroid position of every vector.
+        """
+        return np.concatenate(
+            [
+                np.argmax(
+                    self.vectors[start : start + KMEANS_CHUNK_SIZE]
+                    @ centroids.T,
+                    axis=1,
+                )
+                for start in range(0, len(self.vectors), KMEANS_CHUNK_SIZE)
+            ]
+            or [np.empty(0, dtype=np.intp)]
+        )
+
+    def search_vector(
+        self, embedding: Sequence[float], k: int, probes: int
+    ) -> npt.NDArray[np.intp]:
+        """Get the rows closest to the embedding by cosine similarity.
+
+        The search is exact unless inverted lists were built, in which case
+        only the rows in the lists of the closest centroids and the rows
+        added after the lists are scored.
+
+        Arguments:
+            embedding (Sequence[float]): The embedding.
+            k (int): The number of rows.
+            probes (int): The number of inverted lists to score.
+
+        Returns:
+            npt.NDArray[np.intp]: The rows, closest first.
+        """
+        query = normalize(embedding)
+
+        if self.centroids is None:
+            return top_k(self.vectors @ query, k)
+
+        closest = top_k(self.centroids @ query, probes)
+        rows = np.sort(
+            np.concatenate(
+                [
+                    *(self.lists[list_] for list_ in closest),
+                    np.arange(self.listed, self.size),
+                ]
+            )
+        )
+        return rows[top_k(self.vectors[rows] @ query, k)]
+
+    def rank_rows(
+        self, rows: Sequence[int], embedding: Sequence[float]
+    ) -> npt.NDArray[np.intp]:
+        """Order rows by cosine similarity to the embedding.
+
+        Arguments:
+            rows (Sequence[int]): The rows.
+            embedding (Sequence[float]): The embedding.
+
+        Returns:
+            npt.NDArray[np.intp]: The rows, closest first.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        scores = self.vectors[rows] @ normalize(embedding)
+        return rows[top_k(scores, len(rows))]
+
+    def search_keywords(self, tokens: Set[str]) -> List[int]:
+        """Get the rows matching the tokens, most matched tokens first.
+
+        Arguments:
+            tokens (Set[str]): The query tokens.
+
+        Returns:
+            List[int]: The rows.
+        """
+        size = self.size
+        if not tokens:
+            return list(range(size))
+
+        matches = Counter(
+            row
+            for token in tokens
+            for row in self.tokens.get(token, ())
+            if row < size
+        )
+        return sorted(matches, key=lambda row: (-matches[row], row))
+
+
+class LocalSearchEngine(BaseSearchEngine):
+    """In-process search engine class.
+
+    Recipe embeddings are kept in a memory-mapped float32 file and the
+    recipe documents in a JSON lines file, both appended to as recipes are
+    added. A manifest at configs.domain.configs.domain_default_faiss_index_path
+    with a `.json` suffix holds the generation and row count of the files.
+    Replacing the recipes writes a new generation of the files instead of
+    overwriting the mapped ones, and the index is rebuilt from the database
+    when the files are missing or outdated.
+
+    Searches with ingredients rank the recipes matching them by cosine
+    similarity to the embedding, like the hybrid search of Typesense, and
+    searches without an embedding rank recipes by the number of matched
+    ingredient tokens.
+    """
+
+    logger: logging.Logger
+    path: str
+    manifest_path: str
+    generation: int
+    index: LocalIndex
+    _lock: threading.Lock
+
+    def __init__(
+        self, path: str = domain_configs.domain_default_faiss_index_path
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.manifest_path = f"{path}.json"
+        self.generation = 0
+        self._lock = threading.Lock()
+
+        try:
+            self.index = self.load()
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(
+                f"Local index could not be loaded, rebuilding: {e}"
+            )
+            self.rebuild()
+
+        self.logger.info("Local search engine initialized")
+
+    def vectors_path(self, generation: int) -> str:
+        """Get the path of the vectors file of a generation.
+
+        Arguments:
+            generation (int): The generation.
+
+        Returns:
+            str: The path.
+        """
+        return f"{self.path}.{generation}.f32"
+
+    def documents_path(self, generation: int) -> str:
+        """Get the path of the documents file of a generation.
+
+        Arguments:
+            generation (int): The generation.
+
+        Returns:
+            str: The path.
+        """
+        return f"{self.path}.{generation}.jsonl"
+
+    def load(self) -> LocalIndex:
+        """Load the index from its files.
+
+        Returns:
+            LocalIndex: The index.
+        """
+        with open(self.manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+
+        num_dim = manifest["num_dim"]
+        if num_dim != embeddings.model.num_dim():
+            raise ValueError("Local index dimensions are outdated")
+
+        generation = manifest["generation"]
+        count = manifest["count"]
+
+        with open(self.documents_path(generation), encoding="utf-8") as file:
+            documents = [json.loads(line) for line in file]
+
+        row_size = num_dim * np.dtype(np.float32).itemsize
+        if len(documents) != count or os.path.getsize(
+            self.vectors_path(generation)
+        ) != (count * row_size):
+            raise ValueError("Local index files do not match")
+
+        self.generation = generation
+        index = LocalIndex.create(
+            documents, self.map_vectors(generation, count)
+        )
+        index.build_lists(domain_configs.domain_local_index_lists)
+        self.remove_stale_files()
+
+        self.logger.info(f"Local index loaded with {count} recipes")
+        return index
+
+    def map_vectors(
+        self, generation: int, count: int
+    ) -> npt.NDArray[np.float32]:
+        """Memory-map the vectors file of a generation.
+
+        Arguments:
+            generation (int): The generation.
+            count (int): The number of rows to map.
+
+        Returns:
+            npt.NDArray[np.float32]: The vectors.
+        """
+        num_dim = embeddings.model.num_dim()
+        if count == 0:
+            return np.empty((0, num_dim), dtype=np.float32)
+
+        return np.memmap(
+            self.vectors_path(generation),
+            dtype=np.float32,
+            mode="r",
+            shape=(count, num_dim),
+        )
+
+    def append(
+        self,
+        generation: int,
+        count: int,
+        documents: List[dict],
+        vectors: npt.NDArray[np.float32],
+    ) -> int:
+        """Append rows to the files of a generation.
+
+        The manifest is replaced last, so a crash leaves files longer than
+        the manifest, which are rebuilt on load.
+
+        Arguments:
+            generation (int): The generation.
+            count (int): The number of rows in the files.
+            documents (List[dict]): The recipe documents.
+            vectors (npt.NDArray[np.float32]): The normalized embeddings.
+
+        Returns:
+            int: The number of rows in the files after appending.
+        """
+        with open(self.vectors_path(generation), "ab") as file:
+            file.write(np.ascontiguousarray(vectors, np.float32).tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+
+        with open(
+            self.documents_path(generation), "a", encoding="utf-8"
+        ) as file:
+            file.writelines(
+                json.dumps(document) + "\n" for document in documents
+            )
+            file.flush()
+            os.fsync(file.fileno())
+
+        count += len(documents)
+
+        with open(
+            f"{self.manifest_path}.tmp", "w", encoding="utf-8"
+        ) as file:
+            json.dump(
+                {
+                    "num_dim": embeddings.model.num_dim(),
+                    "generation": generation,
+                    "count": count,
+                },
+                file,
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+        return count
+
+    def save(
+        self, documents: List[dict], vectors: npt.NDArray[np.float32]
+    ) -> LocalIndex:
+        """Write the index to a new generation of files and load it.
+
+        The files of the current generation may still be mapped by running
+        searches, and replacing a mapped file fails on Windows, so they are
+        left in place and removed once they are no longer in use.
+
+        Arguments:
+            documents (List[dict]): The recipe documents.
+            vectors (npt.NDArray[np.float32]): The normalized embeddings.
+
+        Returns:
+            LocalIndex: The saved index.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        generation = self.generation + 1
+        for path in (
+            self.vectors_path(generation),
+            self.documents_path(generation),
+        ):
+            open(path, "wb").close()
+
+        count = self.append(generation, 0, documents, vectors)
+        self.generation = generation
+
+        index = LocalIndex.create(
+            documents, self.map_vectors(generation, count)
+        )
+        index.build_lists(domain_configs.domain_local_index_lists)
+        self.remove_stale_files()
+        return index
+
+    def remove_stale_files(self):
+        """Remove the files of the other generations, if not in use."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        prefix = f"{os.path.basename(self.path)}."
+        current = (
+            os.path.basename(self.vectors_path(self.generation)),
+            os.path.basename(self.documents_path(self.generation)),
+        )
+
+        for name in os.listdir(directory):
+            generation, _, suffix = name.removeprefix(prefix).partition(".")
+            if (
+                not name.startswith(prefix)
+                or not generation.isdigit()
+                or suffix not in ("f32", "jsonl")
+                or name in current
+            ):
+                continue
+
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                self.logger.debug(f"Local index file {name} in use: {e}")
+
+    def rebuild(self):
+        """Rebuild the index from the recipes in the database."""
+        batch_size = domain_configs.domain_local_index_batch_size
+        documents = []
+        vectors = []
+
+        with self._lock:
+            with Session(engine) as session:
+                recipes = session.scalars(
+                    select(models.RecipeModel)
+                    .order_by(models.RecipeModel.id)
+                    .execution_options(yield_per=batch_size)
+                )
+
+                for batch in recipes.partitions():
+                    documents.extend(self.to_document(r) for r in batch)
+                    vectors.extend(embeddings.model().embed_recipes(batch))
+
+            self.index = self.save(
+                documents,
+                (
+                    normalize(vectors)
+                    if vectors
+                    else np.empty((0, embeddings.model.num_dim()))
+                ),
+            )
+
+        self.logger.info(f"Local index rebuilt with {len(documents)} recipes")
+
+    @staticmethod
+    def to_document(recipe: models.RecipeModel) -> dict:
+        """Convert a recipe model to an index document.
+
+        Arguments:
+            recipe (models.RecipeModel): The recipe model.
+
+        Returns:
+            dict: The index document.
+        """
+        return {
+            "id": recipe.id,
+            "title": recipe.title,
+            "description": recipe.description,
+            "ingredients": [
+                ingredient.name for ingredient in recipe.ingredients
+            ],
+        }
+
+    def is_healthy(self) -> bool:
+        """Check if the search engine is healthy.
+
+        The manifest must match the current snapshot, and the snapshot's
+        vectors must be readable.
+
+        Returns:
+            bool: True if healthy, False otherwise.
+        """
+        index = self.index
+
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+
+            np.asarray(index.vectors[-1:]).sum()
+            return (
+                manifest["generation"] == self.generation
+                and manifest["count"] >= index.size
+            )
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.error(f"Local index health check failed: {e}")
+            return False
+
+    def add_recipes(
+        self,
+        recipes: Iterable[models.RecipeModel],
+        recipe_embeddings: Optional[Sequence[Sequence[float]]] = None,
+    ):
+        """Add recipes to the index.
+
+        The recipes are appended to the files of the current generation, and
+        the inverted lists are only rebuilt once the share of recipes added
+        after them exceeds domain_local_index_unlisted_fraction.
+
+        Arguments:
+            recipes (Iterable[models.RecipeModel]): The recipes to add.
+            recipe_embeddings (Optional[Sequence[Sequence[float]]]): The
+                embeddings of the recipes, in the same order. Defaults to
+                None, in which case the recipes are embedded.
+        """
+        recipes = list(recipes)
+        if not recipes:
+            return
+        if recipe_embeddings is None:
+            recipe_embeddings = embeddings.model().embed_recipes(recipes)
+        vectors = normalize(recipe_embeddings)
+        documents = [self.to_document(recipe) for recipe in recipes]
+
+        with self._lock:
+            count = self.append(
+                self.generation, self.index.size, documents, vectors
+            )
+            index = self.index.extend(
+                documents, self.map_vectors(self.generation, count)
+            )
+
+            num_lists = domain_configs.domain_local_index_lists
+            if index.needs_lists(
+                num_lists, domain_configs.domain_local_index_unlisted_fraction
+            ):
+                index.build_lists(num_lists)
+
+            self.index = index
+
+        self.logger.info(f"{len(recipes)} recipes added to local index")
+
+    def remove_all_recipes(self):
+        """Remove all recipes from the index."""
+        with self._lock:
+            self.index = self.save(
+                [], np.empty((0, embeddings.model.num_dim()))
+            )
+
+        self.logger.info("All recipes removed from local index")
+
+    def search_recipes(
+        self,
+        ingredients: Iterable[str],
+        embedding: Optional[Sequence[float]],
+        page: int = 1,
+        per_page: int = domain_configs.domain_default_search_per_page,
+    ) -> List[models.TypesenseResult]:
+        """Search for recipes.
+
+        With an embedding, the recipes matching the ingredients come first,
+        closest first, followed by the other closest recipes.
+
+        Arguments:
+            ingredients (Iterable[str]): The ingredients to search for.
+            embedding (Optional[Sequence[float]]): The embedding, a list or a
+                NumPy array.
+            page (int): The page number. Defaults to 1.
+            per_page (int): The number of results per page. Defaults to
+                domain_configs.default_search_per_page.
+
+        Returns:
+            List[models.TypesenseResult]: The list of recipe results.
+        """
+        index = self.index
+        tokens = {
+            token
+            for ingredient in ingredients
+            for token in tokenize(ingredient)
+        }
+        start = (page - 1) * per_page
+        end = start + per_page
+
+        if embedding is not None and len(embedding) and index.size:
+            rows = list(
+                index.rank_rows(index.search_keywords(tokens), embedding)
+                if tokens
+                else []
+            )
+            if len(rows) < end:
+                matched = set(rows)
+                rows.extend(
+                    row
+                    for row in index.search_vector(
+                        embedding,
+                        end + len(matched),
+                        domain_configs.domain_local_index_probes,
+                    )
+                    if row not in matched
+                )
+        else:
+            rows = index.search_keywords(tokens)
+
+        return [
+            self.to_result(index.documents[row], tokens)
+            for row in rows[start:end]
+        ]
+
+    @staticmethod
+    def to_result(document: dict, tokens: Set[str]) -> models.TypesenseResult:
+        """Convert an index document to a search result.
+
+        Arguments:
+            document (dict): The index document.
+            tokens (Set[str]): The query tokens to highlight.
+
+        Returns:
+            models.TypesenseResult: The search result.
+        """
+        Field = models.TypesenseResultHighlight.Field
+
+        def matched(text: str) -> List[str]:
+            return [
+                word
+                for word in TOKEN_PATTERN.findall(text)
+                if word.lower() in tokens
+            ]
+
+        highlights = [
+            models.TypesenseResultHighlight(field=field, tokens=words)
+            for field, words in (
+                (Field.TITLE, matched(document["title"])),
+                (Field.DESCRIPTION, matched(document["description"])),
+            )
+            if words
+        ]
+        highlights.extend(
+            models.TypesenseResultHighlight(
+                field=Field.INGREDIENTS, tokens=words, index=index
+            )
+            for index, words in enumerate(
+                map(matched, document["ingredients"])
+            )
+            if words
+        )
+
+        return models.TypesenseResult(
+            recipe=models.RecipeModel(
+                id=document["id"],
+                title=document["title"],
+                description=document["description"],
+                ingredients=[
+                    models.RecipeModelIngredient(name=ingredient)
+                    for ingredient in document["ingredients"]
+                ],
+            ),
+            highlights=highlights,
+        )
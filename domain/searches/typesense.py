@@ -1,15 +1,33 @@
+import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
-from typing import ClassVar, Iterable, List, Optional
-
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
+
+import numpy as np
 import typesense
 import typesense.collection
 import typesense.exceptions
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from configs.domain import configs as domain_configs
 from configs.typesense import configs
 from domain import embeddings
+from domain.caches import LRUCache
+from domain.searches.base import BaseSearchEngine
 from infra import models
+from infra.db import engine
 
 
 @dataclass
@@ -36,6 +54,12 @@ class Recipe:
                 "type": "float[]",
                 "num_dim": embeddings.model.num_dim(),
             },
+            {
+                "name": "content_hash",
+                "type": "string",
+                "index": False,
+                "optional": True,
+            },
         ],
     }
 
@@ -44,6 +68,7 @@ class Recipe:
     description: str
     ingredients: List[str]
     embedding: List[float]
+    content_hash: Optional[str] = None
 
     @classmethod
     def equal_schema(cls, json: dict) -> bool:
@@ -55,23 +80,94 @@ class Recipe:
         Returns:
             bool: True if the JSON object has the same schema, False otherwise.
         """
-        if cls.SCHEMA["name"] != json["name"]:
-            return False
-
         return all(
             any(
-                field["name"] == json_field["name"]
-                and field["type"] == json_field["type"]
+                cls.equal_field(field, json_field)
                 for json_field in json["fields"]
             )
             for field in cls.SCHEMA["fields"]
         )
 
-    def from_model(recipe: models.RecipeModel) -> "Recipe":
+    @classmethod
+    def equal_embedding(cls, json: dict) -> bool:
+        """Check if the JSON object has the same embedding field.
+
+        Arguments:
+            json (dict): The JSON object.
+
+        Returns:
+            bool: True if the embedding fields match, False otherwise.
+        """
+        field = next(
+            field
+            for field in cls.SCHEMA["fields"]
+            if field["name"] == "embedding"
+        )
+        return any(
+            cls.equal_field(field, json_field) for json_field in json["fields"]
+        )
+
+    @staticmethod
+    def placeholder_embedding(json: dict) -> Optional[List[float]]:
+        """Get an embedding matching the embedding field of a JSON schema.
+
+        The embedding is a unit vector, for collections that are only
+        searched by keywords but still require an embedding.
+
+        Arguments:
+            json (dict): The JSON schema.
+
+        Returns:
+            Optional[List[float]]: The embedding, or None if the schema has
+                no embedding field.
+        """
+        fields = [
+            field for field in json["fields"] if field["name"] == "embedding"
+        ]
+        if not fields or "num_dim" not in fields[0]:
+            return None
+
+        return [1.0] + [0.0] * (fields[0]["num_dim"] - 1)
+
+    @classmethod
+    def schema(cls, name: str) -> dict:
+        """Get the schema of a recipe collection.
+
+        Arguments:
+            name (str): The name of the collection.
+
+        Returns:
+            dict: The schema.
+        """
+        return {**cls.SCHEMA, "name": name}
+
+    @staticmethod
+    def equal_field(field: dict, json_field: dict) -> bool:
+        """Check if the JSON field matches the schema field.
+
+        Arguments:
+            field (dict): The schema field.
+            json_field (dict): The JSON field.
+
+        Returns:
+            bool: True if the fields match, False otherwise.
+        """
+        return (
+            field["name"] == json_field["name"]
+            and field["type"] == json_field["type"]
+            and field.get("num_dim") == json_field.get("num_dim")
+        )
+
+    def from_model(
+        recipe: models.RecipeModel,
+        embedding: Optional[List[float]] = None,
+    ) -> "Recipe":
         """Create a recipe from a recipe model.
 
         Arguments:
             recipe (models.RecipeModel): The recipe model.
+            embedding (Optional[List[float]]): The embedding of the recipe.
+                Defaults to None, in which case the recipe is embedded.
 
         Returns:
             Recipe: The recipe.
@@ -81,7 +177,14 @@ class Recipe:
             title=recipe.title,
             description=recipe.description,
             ingredients=[ingredient.name for ingredient in recipe.ingredients],
-            embedding=embeddings.model().embed_recipe(recipe),
+            embedding=(
+                embedding
+                if embedding is not None
+                else embeddings.model().embed_recipe(recipe)
+            ),
+            content_hash=(
+                recipe.content_hash or embeddings.model().recipe_hash(recipe)
+            ),
         )
 
     def to_model(self) -> models.RecipeModel:
@@ -115,6 +218,7 @@ class Recipe:
             description=json["description"],
             ingredients=json["ingredients"],
             embedding=json["embedding"],
+            content_hash=json.get("content_hash"),
         )
 
     def to_json(self) -> dict:
@@ -129,18 +233,313 @@ class Recipe:
             "description": self.description,
             "ingredients": self.ingredients,
             "embedding": self.embedding,
+            "content_hash": self.content_hash,
         }
 
 
-class TypesenseSearchEngine:
-    """Typesense search engine class."""
+class DocumentCounter:
+    """Document count of a collection.
+
+    The count is kept up to date by the writers and refreshed from the
+    collection in a background thread once it is older than the TTL, so
+    readers never wait for the collection metadata.
+    """
+
+    logger: logging.Logger
+    ttl: float
+    count: int
+    refreshed_at: float
+    _fetch: Callable[[], int]
+    _lock: threading.Lock
+    _refreshing: bool
+
+    def __init__(self, fetch: Callable[[], int], ttl: float, count: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.count = count
+        self.refreshed_at = time.monotonic()
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> int:
+        """Get the document count, scheduling a refresh if it is stale.
+
+        Returns:
+            int: The last known document count.
+        """
+        if time.monotonic() - self.refreshed_at > self.ttl:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self.refresh, daemon=True).start()
+
+        return self.count
+
+    def add(self, count: int):
+        """Add to the document count.
+
+        Arguments:
+            count (int): The number of added documents.
+        """
+        with self._lock:
+            self.count += count
+
+    def invalidate(self):
+        """Refresh the document count on the next read."""
+        with self._lock:
+            self.refreshed_at = float("-inf")
+
+    def set(self, count: int):
+        """Set the document count.
+
+        Arguments:
+            count (int): The number of documents.
+        """
+        with self._lock:
+            self.count = count
+            self.refreshed_at = time.monotonic()
+
+    def refresh(self):
+        """Fetch the document count from the collection."""
+        try:
+            self.set(self._fetch())
+            self.logger.debug(f"Document count refreshed: {self.count}")
+        except Exception as e:
+            self.logger.error(f"Document count refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+class VectorQueryFormatter:
+    """Formatter of embeddings into Typesense vector queries
+
+    Values are written with a fixed number of significant digits in a single
+    formatting call, and the formatted queries are cached by the packed
+    float32 embedding so repeated searches with the same profile embedding
+    are not formatted again.
+    """
+
+    field: str
+    precision: int
+    cache: LRUCache[bytes, str]
+    _formats: Dict[int, str]
+
+    def __init__(self, field: str, precision: int, cache_size: int):
+        self.field = field
+        self.precision = precision
+        self.cache = LRUCache(cache_size)
+        self._formats = {}
+
+    def format(self, embedding: Sequence[float]) -> str:
+        """Format an embedding into a vector query.
+
+        Arguments:
+            embedding (Sequence[float]): The embedding, a list or a NumPy
+                array.
+
+        Returns:
+            str: The vector query.
+        """
+        values = np.asarray(embedding, dtype=np.float32)
+        key = values.tobytes()
+
+        query = self.cache.get(key)
+        if query is None:
+            query = f"{self.field}:([{self._format(len(values))}])" % tuple(
+                values.tolist()
+            )
+            self.cache.set(key, query)
+
+        return query
+
+    def _format(self, num_dim: int) -> str:
+        """Get the preformatted values template for a number of dimensions.
+
+        Arguments:
+            num_dim (int): The number of dimensions.
+
+        Returns:
+            str: The values template.
+        """
+        template = self._formats.get(num_dim)
+        if template is None:
+            template = ",".join([f"%.{self.precision}g"] * num_dim)
+            self._formats[num_dim] = template
+        return template
+
+
+class RecipeReconciler:
+    """Background reconciler of the indexed recipes with the database.
+
+    Recipes are read from the database in batches by ID and compared with
+    the indexed recipes by content hash, only recipes whose hash differs are
+    embedded and upserted, and indexed recipes missing from the database are
+    removed. The ID of the last reconciled batch is kept, so a failed run is
+    resumed by the next one, and reconciling again is harmless as unchanged
+    recipes are only hashed.
+    """
+
+    logger: logging.Logger
+    search_engine: "TypesenseSearchEngine"
+    collection: str
+    batch_size: int
+    interval: Optional[float]
+    checkpoint: int
+    _lock: threading.Lock
+    _thread: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        search_engine: "TypesenseSearchEngine",
+        collection: str,
+        batch_size: int,
+        interval: Optional[float] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.search_engine = search_engine
+        self.collection = collection
+        self.batch_size = batch_size
+        self.interval = interval
+        self.checkpoint = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start reconciling in a background thread.
+
+        The reconciler runs once, or every interval if there is one.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="typesense-reconciler", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        """Reconcile once or every interval, logging failures."""
+        while True:
+            try:
+                self.reconcile()
+            except Exception as e:
+                self.logger.error(
+                    f"Reconciliation failed after recipe {self.checkpoint}:"
+                    f" {e}"
+                )
+
+            if self.interval is None:
+                return
+            time.sleep(self.interval)
+
+    def reconcile(self):
+        """Reconcile the indexed recipes with the database.
+
+        The reconciliation resumes after the checkpoint.
+        """
+        self.logger.info(
+            f"Reconciling {self.collection} after recipe {self.checkpoint}"
+        )
+        upserted = 0
+
+        while True:
+            with Session(engine, expire_on_commit=False) as session:
+                recipes = (
+                    session.execute(
+                        select(models.RecipeModel)
+                        .where(models.RecipeModel.id > self.checkpoint)
+                        .order_by(models.RecipeModel.id)
+                        .limit(self.batch_size)
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not recipes:
+                    break
+
+                upserted += self._reconcile_batch(session, recipes)
+
+            self.checkpoint = recipes[-1].id
+
+        indexed_ids = self.search_engine.all_ids(self.collection)
+        with Session(engine) as session:
+            ids = set(
+                session.execute(select(models.RecipeModel.id)).scalars()
+            )
+        self.search_engine.remove_recipes(indexed_ids - ids, self.collection)
+        self.search_engine.recipes_count.refresh()
+
+        self.checkpoint = 0
+        self.logger.info(
+            f"Recipes reconciled in {self.collection}: {upserted} upserted,"
+            f" {len(indexed_ids - ids)} removed"
+        )
+
+    def _reconcile_batch(
+        self, session: Session, recipes: List[models.RecipeModel]
+    ) -> int:
+        """Reconcile a batch of recipes.
+
+        Arguments:
+            session (Session): The session the recipes were loaded in.
+            recipes (List[models.RecipeModel]): The recipes.
+
+        Returns:
+            int: The number of upserted recipes.
+        """
+        model = embeddings.model()
+        indexed = self.search_engine.content_hashes(
+            (recipe.id for recipe in recipes), self.collection
+        )
+
+        changed = []
+        for recipe in recipes:
+            content_hash = model.recipe_hash(recipe)
+            if recipe.content_hash != content_hash:
+                recipe.content_hash = content_hash
+            if indexed.get(recipe.id) != content_hash:
+                changed.append(recipe)
+
+        session.commit()
+
+        if changed:
+            self.search_engine.import_recipes(
+                changed,
+                model.embed_recipes(changed),
+                self.collection,
+            )
+
+        return len(changed)
+
+
+class TypesenseSearchEngine(BaseSearchEngine):
+    """Typesense search engine class.
+
+    Recipes are searched through the `recipes` alias, which points to a
+    versioned `recipes_v{n}` collection. When the recipe schema changes, for
+    example with the embedding model, a new version is filled from the
+    database in the background while the current one keeps serving, and the
+    alias is then swapped to it. Recipes added during a rebuild are written
+    to both collections.
+    """
 
     logger: logging.Logger
     client: typesense.Client
+    recipes_count: DocumentCounter
+    vector_query_formatter: VectorQueryFormatter
+    reconciler: RecipeReconciler
+    building: Optional[str]
+    vector_search: bool
+    placeholder_embedding: Optional[List[float]]
+    _rebuild_lock: threading.Lock
+    _swap_lock: threading.Lock
 
     @property
     def recipes(self) -> typesense.collection.Collection:
-        """Get the recipes collection.
+        """Get the recipes collection through the alias.
 
         Returns:
             typesense.collection.Collection: The recipes collection.
@@ -162,18 +561,56 @@ class TypesenseSearchEngine:
                 "connection_timeout_seconds": 10,
             }
         )
+        self.building = None
+        self.vector_search = True
+        self.placeholder_embedding = None
+        self._rebuild_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+
+        self.recipes_count = DocumentCounter(
+            lambda: self.live_schema()["num_documents"],
+            ttl=configs.typesense_document_count_ttl_seconds,
+        )
+        self.vector_query_formatter = VectorQueryFormatter(
+            "embedding",
+            precision=configs.typesense_vector_query_precision,
+            cache_size=configs.typesense_vector_query_cache_size,
+        )
+        self.reconciler = RecipeReconciler(
+            self,
+            Recipe.SCHEMA["name"],
+            batch_size=configs.typesense_reconcile_batch_size,
+            interval=configs.typesense_reconcile_interval_seconds,
+        )
 
         try:
-            recipe_schema = self.recipes.retrieve()
-            if not Recipe.equal_schema(recipe_schema):
+            schema = self.live_schema()
+            self.recipes_count.set(schema["num_documents"])
+
+            if schema["name"] == Recipe.SCHEMA["name"]:
                 self.logger.warning(
-                    "Recipe collection schema is outdated, deleting and"
-                    " recreating"
+                    "Recipe collection is not versioned, rebuilding"
                 )
-                self.recipes.delete()
-                self.create_recipe_collection()
+                self.set_live_embedding(schema)
+                self.start_rebuild()
+            elif not Recipe.equal_schema(schema):
+                self.logger.warning(
+                    "Recipe collection schema is outdated, rebuilding"
+                )
+                self.set_live_embedding(schema)
+                self.start_rebuild()
+            elif self.reconciler.interval is not None:
+                self.reconciler.start()
         except typesense.exceptions.ObjectNotFound:
-            self.create_recipe_collection()
+            # A version kept by a failed alias swap is adopted, and the
+            # reconciler fills in the recipes it is missing.
+            version = self.next_version() - 1
+            self.swap_alias(
+                f"{Recipe.SCHEMA['name']}_v{version}"
+                if version
+                else self.create_recipe_collection(1)
+            )
+            self.reconciler.start()
 
         self.logger.info("Typesense search engine initialized")
 
@@ -190,29 +627,308 @@ class TypesenseSearchEngine:
             self.logger.error(f"Typesense health check failed: {e}")
             return False
 
-    def create_recipe_collection(self):
-        """Create the recipe collection."""
-        self.client.collections.create(Recipe.SCHEMA)
-        self.logger.info("Recipe collection created")
+    def live_collection(self) -> str:
+        """Get the name of the collection the alias points to.
+
+        Returns:
+            str: The name of the collection, or the alias name if the recipes
+                are in a collection created before versioning.
+        """
+        try:
+            return self.client.aliases[Recipe.SCHEMA["name"]].retrieve()[
+                "collection_name"
+            ]
+        except typesense.exceptions.ObjectNotFound:
+            return Recipe.SCHEMA["name"]
+
+    def live_schema(self) -> dict:
+        """Get the schema of the collection the alias points to.
+
+        Returns:
+            dict: The schema of the collection.
+        """
+        return self.client.collections[self.live_collection()].retrieve()
+
+    def set_live_embedding(self, schema: dict):
+        """Check if the embedding field of the live collection is current.
+
+        A live collection with an outdated embedding field is only searched
+        by keywords, and recipes are written to it with a placeholder
+        embedding until the rebuild replaces it.
+
+        Arguments:
+            schema (dict): The schema of the live collection.
+        """
+        self.vector_search = Recipe.equal_embedding(schema)
+        self.placeholder_embedding = (
+            None
+            if self.vector_search
+            else Recipe.placeholder_embedding(schema)
+        )
+
+    def next_version(self) -> int:
+        """Get the next unused version of the recipe collection.
+
+        Returns:
+            int: The version.
+        """
+        prefix = f"{Recipe.SCHEMA['name']}_v"
+        versions = [
+            int(collection["name"].removeprefix(prefix))
+            for collection in self.client.collections.retrieve()
+            if collection["name"].startswith(prefix)
+            and collection["name"].removeprefix(prefix).isdigit()
+        ]
+        return max(versions, default=0) + 1
+
+    def create_recipe_collection(self, version: int) -> str:
+        """Create a version of the recipe collection.
+
+        Arguments:
+            version (int): The version of the collection.
+
+        Returns:
+            str: The name of the collection.
+        """
+        name = f"{Recipe.SCHEMA['name']}_v{version}"
+        self.client.collections.create(Recipe.schema(name))
+        self.logger.info(f"Recipe collection {name} created")
+        return name
+
+    def start_rebuild(self):
+        """Rebuild the recipe collection in a background thread."""
+        threading.Thread(
+            target=self._rebuild, name="typesense-rebuild", daemon=True
+        ).start()
+
+    def _rebuild(self):
+        """Rebuild the recipe collection, logging failures."""
+        try:
+            self.rebuild()
+        except Exception as e:
+            self.logger.error(f"Recipe collection rebuild failed: {e}")
+
+    def rebuild(self):
+        """Rebuild the recipe collection.
+
+        A new version of the collection is filled from the database, then
+        the alias is swapped to it and the previous version is deleted. A
+        collection created before versioning has the name of the alias, so
+        it is deleted before the swap. From then on the new version holds the
+        only copy of the recipes, so it is kept if the swap fails.
+        """
+        with self._rebuild_lock:
+            name = self.create_recipe_collection(self.next_version())
+            self.building = name
+            legacy_deleted = False
+
+            try:
+                RecipeReconciler(
+                    self,
+                    name,
+                    batch_size=configs.typesense_reconcile_batch_size,
+                ).reconcile()
+
+                previous = self.live_collection()
+                with self._swap_lock:
+                    if previous == Recipe.SCHEMA["name"]:
+                        self.client.collections[previous].delete()
+                        legacy_deleted = True
+
+                    self.swap_alias(
+                        name,
+                        attempts=(
+                            configs.typesense_alias_swap_attempts
+                            if legacy_deleted
+                            else 1
+                        ),
+                    )
+                    self.vector_search = True
+                    self.placeholder_embedding = None
+            except Exception:
+                if legacy_deleted:
+                    self.logger.error(
+                        f"Recipe alias swap to {name} failed after the"
+                        f" legacy collection was deleted, keeping {name}"
+                    )
+                else:
+                    self.client.collections[name].delete()
+                raise
+            finally:
+                self.building = None
+
+            self.recipes_count.refresh()
+            self.logger.info(f"Recipe alias swapped to {name}")
+
+            if previous != Recipe.SCHEMA["name"]:
+                self.client.collections[previous].delete()
+                self.logger.info(f"Recipe collection {previous} deleted")
+
+    def swap_alias(self, name: str, attempts: int = 1):
+        """Point the recipe alias to a collection.
+
+        Arguments:
+            name (str): The name of the collection.
+            attempts (int): The number of attempts. Defaults to 1.
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                self.client.aliases.upsert(
+                    Recipe.SCHEMA["name"], {"collection_name": name}
+                )
+                return
+            except Exception as e:
+                if attempt == attempts:
+                    raise
+
+                self.logger.warning(
+                    f"Recipe alias swap to {name} failed, attempt"
+                    f" {attempt}/{attempts}: {e}"
+                )
+                time.sleep(attempt)
 
-    def add_recipes(self, recipes: Iterable[models.RecipeModel]):
+    def add_recipes(
+        self,
+        recipes: Iterable[models.RecipeModel],
+        recipe_embeddings: Optional[Sequence[Sequence[float]]] = None,
+    ):
         """Add recipes to the collection.
 
         Arguments:
             recipes (Iterable[models.RecipeModel]): The recipes to add.
+            recipe_embeddings (Optional[Sequence[Sequence[float]]]): The
+                embeddings of the recipes, in the same order. Defaults to
+                None, in which case the recipes are embedded.
+        """
+        recipes = list(recipes)
+        if recipe_embeddings is None:
+            recipe_embeddings = embeddings.model().embed_recipes(recipes)
+
+        building = self.building
+        if building is not None:
+            self.import_recipes(recipes, recipe_embeddings, building)
+
+        with self._swap_lock:
+            live_embeddings = recipe_embeddings
+            if not self.vector_search and self.placeholder_embedding:
+                live_embeddings = [self.placeholder_embedding] * len(recipes)
+
+            upserted = self.import_recipes(recipes, live_embeddings)
+
+        # Upserts of indexed recipes are counted too, which keeps the count an
+        # upper bound for drop_tokens_threshold until the next read refreshes
+        # it from the collection
+        self.recipes_count.add(upserted)
+        self.recipes_count.invalidate()
+
+    def import_recipes(
+        self,
+        recipes: Sequence[models.RecipeModel],
+        recipe_embeddings: Sequence[Sequence[float]],
+        collection: str = Recipe.SCHEMA["name"],
+    ) -> int:
+        """Upsert recipes to a collection.
+
+        Arguments:
+            recipes (Sequence[models.RecipeModel]): The recipes to upsert.
+            recipe_embeddings (Sequence[Sequence[float]]): The embeddings of
+                the recipes, in the same order.
+            collection (str): The collection. Defaults to the alias.
+
+        Returns:
+            int: The number of upserted recipes.
+        """
+        results = self.client.collections[collection].documents.import_(
+            [
+                Recipe.from_model(recipe, embedding).to_json()
+                for recipe, embedding in zip(recipes, recipe_embeddings)
+            ],
+            {"action": "upsert"},
+        )
+        upserted = sum(1 for result in results if result.get("success"))
+        self.logger.info(f"{upserted} recipes upserted to {collection}")
+        return upserted
+
+    def content_hashes(
+        self,
+        ids: Iterable[int],
+        collection: str = Recipe.SCHEMA["name"],
+    ) -> Dict[int, Optional[str]]:
+        """Get the content hashes of the indexed recipes.
+
+        Arguments:
+            ids (Iterable[int]): The IDs of the recipes.
+            collection (str): The collection. Defaults to the alias.
+
+        Returns:
+            Dict[int, Optional[str]]: The content hash of each indexed recipe,
+                recipes that are not indexed are left out.
         """
-        recipes: Iterable[Recipe] = (
-            Recipe.from_model(recipe) for recipe in recipes
+        ids = list(ids)
+        if not ids:
+            return {}
+
+        documents = self.client.collections[collection].documents.export(
+            {
+                "filter_by": f"id:[{','.join(str(id) for id in ids)}]",
+                "include_fields": "id,content_hash",
+            }
+        )
+
+        return {
+            int(document["id"]): document.get("content_hash")
+            for document in map(json.loads, documents.splitlines())
+        }
+
+    def all_ids(self, collection: str = Recipe.SCHEMA["name"]) -> Set[int]:
+        """Get the IDs of every indexed recipe.
+
+        Arguments:
+            collection (str): The collection. Defaults to the alias.
+
+        Returns:
+            Set[int]: The IDs of the recipes.
+        """
+        documents = self.client.collections[collection].documents.export(
+            {"include_fields": "id"}
         )
-        self.recipes.documents.import_(
-            [recipe.to_json() for recipe in recipes]
+
+        return {
+            int(json.loads(document)["id"])
+            for document in documents.splitlines()
+        }
+
+    def remove_recipes(
+        self,
+        ids: Iterable[int],
+        collection: str = Recipe.SCHEMA["name"],
+    ):
+        """Remove recipes from a collection.
+
+        Arguments:
+            ids (Iterable[int]): The IDs of the recipes.
+            collection (str): The collection. Defaults to the alias.
+        """
+        ids = list(ids)
+        if not ids:
+            return
+
+        self.client.collections[collection].documents.delete(
+            {"filter_by": f"id:[{','.join(str(id) for id in ids)}]"}
         )
-        self.logger.info("Recipes added to collection")
+        self.logger.info(f"{len(ids)} recipes removed from {collection}")
 
     def remove_all_recipes(self):
         """Remove all recipes from the collection."""
+        building = self.building
+        if building is not None:
+            self.client.collections[building].documents.delete(
+                {"filter_by": "id:!=0"}
+            )
+
         try:
             self.recipes.documents.delete({"filter_by": "id:!=0"})
+            self.recipes_count.set(0)
             self.logger.info("All recipes removed from collection")
         except typesense.exceptions.ObjectNotFound:
             self.logger.info("Recipe collection not found, skipping removal")
@@ -220,7 +936,7 @@ class TypesenseSearchEngine:
     def search_recipes(
         self,
         ingredients: Iterable[str],
-        embedding: Optional[List[float]],
+        embedding: Optional[Sequence[float]],
         page: int = 1,
         per_page: int = domain_configs.domain_default_search_per_page,
     ) -> List[models.TypesenseResult]:
@@ -228,7 +944,8 @@ class TypesenseSearchEngine:
 
         Arguments:
             ingredients (Iterable[str]): The ingredients to search for.
-            embedding (Optional[List[float]]): The embedding.
+            embedding (Optional[Sequence[float]]): The embedding, a list or a
+                NumPy array.
             page (int): The page number. Defaults to 1.
             per_page (int): The number of results per page. Defaults to
                 domain_configs.default_search_per_page.
@@ -236,8 +953,7 @@ class TypesenseSearchEngine:
         Returns:
             List[models.TypesenseResult]: The list of recipe results.
         """
-        recipes_documents = self.recipes.retrieve()
-        recipes_count = recipes_documents["num_documents"]
+        recipes_count = self.recipes_count.get()
 
         params_with_user_profile = {
             "q": " ".join(ingredients),
@@ -250,14 +966,11 @@ class TypesenseSearchEngine:
             "exclude_fields": "embedding",
         }
 
-        if embedding:
+        if embedding is not None and len(embedding) and self.vector_search:
             params_with_user_profile["sort_by"] = "_vector_distance:asc"
             params_with_user_profile["rerank_hybrid_matches"] = True
             params_with_user_profile["vector_query"] = (
-                f"embedding:([{', '.join(
-                    str(v)
-                    for v in embedding
-                )}])"
+                self.vector_query_formatter.format(embedding)
             )
 
         searches = [
@@ -280,6 +993,3 @@ class TypesenseSearchEngine:
             models.TypesenseResult.from_json(hit)
             for hit in response["results"][0]["hits"]
         ]
-
-
-search_engine = TypesenseSearchEngine()
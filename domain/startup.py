@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from configs.domain import configs
+from domain import searches
+from domain.model_types import StartupState
+from infra import db, notifications
+
+logger = logging.getLogger(__name__)
+
+
+class Startup:
+    """Background warm-up of the service
+
+    The steps connect to the remote services the requests depend on, so the
+    server can bind its port first and become ready once they succeed. A
+    failed step is retried until it succeeds, and the steps run in order.
+    """
+
+    steps: Sequence[Tuple[str, Callable[[], Any]]]
+    retry_seconds: float
+    state: StartupState
+    error: Optional[str]
+    _ready: threading.Event
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        steps: Sequence[Tuple[str, Callable[[], Any]]],
+        retry_seconds: float,
+    ):
+        self.steps = steps
+        self.retry_seconds = retry_seconds
+        self.state = StartupState.STARTING
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the warm-up in a daemon thread, if it is not started."""
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="startup",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the warm-up to finish.
+
+        Arguments:
+            timeout (Optional[float]): The maximum number of seconds to wait.
+                Defaults to None, in which case it waits indefinitely.
+
+        Returns:
+            bool: True if ready, False if the timeout expired.
+        """
+        return self._ready.wait(timeout)
+
+    def _run(self):
+        """Run the steps, retrying each one until it succeeds."""
+        started = time.monotonic()
+
+        for name, step in self.steps:
+            while True:
+                try:
+                    step()
+                    break
+                except Exception as e:
+                    self.error = f"{name}: {e}"
+                    logger.error(
+                        f"Startup step {name} failed, retrying in "
+                        f"{self.retry_seconds}s: {e}"
+                    )
+                    time.sleep(self.retry_seconds)
+
+        self.error = None
+        self.state = StartupState.READY
+        self._ready.set()
+        logger.info(f"Startup ready in {time.monotonic() - started:.2f}s")
+
+
+startup = Startup(
+    [
+        ("PostgreSQL", db.warm_up),
+        ("Notifications", notifications.listener.start),
+        ("Search engine", searches.get_search_engine),
+    ],
+    configs.domain_startup_retry_seconds,
+)
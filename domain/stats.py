@@ -0,0 +1,69 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StatsReporter:
+    """Periodic log of the statistics of the pools and caches
+
+    Each source returns a dictionary of statistics, which is logged as one
+    line per source every interval. A failing source is logged and skipped,
+    so it does not stop the others.
+    """
+
+    sources: Sequence[Tuple[str, Callable[[], Dict[str, Any]]]]
+    interval: Optional[float]
+    _stopped: threading.Event
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        sources: Sequence[Tuple[str, Callable[[], Dict[str, Any]]]],
+        interval: Optional[float],
+    ):
+        self.sources = sources
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start logging in a daemon thread, if there is an interval."""
+        with self._lock:
+            if self.interval is None or self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="stats", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop logging."""
+        self._stopped.set()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Collect and log the statistics of every source.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics of each source.
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for name, source in self.sources:
+            try:
+                stats[name] = source()
+            except Exception as e:
+                logger.error(f"Failed to get the {name} stats: {e}")
+                continue
+
+            logger.info(f"{name} stats: {stats[name]}")
+
+        return stats
+
+    def _run(self):
+        """Report every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.report()
@@ -1,22 +1,160 @@
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
 
-from sqlalchemy import Engine, create_engine, text
+import psycopg_pool
+from sqlalchemy import URL, Engine, create_engine, make_url, text
+from sqlalchemy.orm import Session
 from sqlalchemy_utils import create_database, database_exists
 
 from configs import db
+from infra.pools import PsycopgPool, TimedQueuePool
 
 logger = logging.getLogger(__name__)
 
+_unit_of_work: ContextVar[Optional[Session]] = ContextVar(
+    "unit_of_work", default=None
+)
+
 
 def init_engine() -> Engine:
-    """Initialize the database engine"""
-    engine = create_engine(db.configs.connection_string)
+    """Initialize the database engine
+
+    The engine connects on first use, so this does not block on the database.
+    PostgreSQL connections are pooled as configured in configs.db, other
+    databases keep the default pool of SQLAlchemy.
+    """
+    url = make_url(db.configs.connection_string)
+
+    if url.get_backend_name() != "postgresql":
+        return create_engine(url)
+
+    if db.configs.db_use_psycopg_pool:
+        return create_engine(url, pool=init_psycopg_pool(url))
+
+    return create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=db.configs.db_pool_size,
+        max_overflow=db.configs.db_pool_max_overflow,
+        pool_timeout=db.configs.db_pool_timeout_seconds,
+        pool_recycle=db.configs.db_pool_recycle_seconds,
+        pool_pre_ping=db.configs.db_pool_pre_ping,
+    )
+
+
+def conninfo(url: URL) -> str:
+    """Get the psycopg connection string of a database URL.
+
+    Arguments:
+        url (URL): The database URL.
+
+    Returns:
+        str: The connection string.
+    """
+    return url.set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+def init_psycopg_pool(url: URL) -> PsycopgPool:
+    """Initialize the pool of the engine on psycopg_pool.
+
+    The psycopg pool opens its connections in the background.
+
+    Arguments:
+        url (URL): The database URL.
+
+    Returns:
+        PsycopgPool: The pool.
+    """
+    pool = psycopg_pool.ConnectionPool(
+        conninfo(url),
+        min_size=db.configs.db_pool_size,
+        max_size=db.configs.db_pool_size + db.configs.db_pool_max_overflow,
+        timeout=db.configs.db_pool_timeout_seconds,
+        max_lifetime=db.configs.db_pool_recycle_seconds,
+        check=(
+            psycopg_pool.ConnectionPool.check_connection
+            if db.configs.db_pool_pre_ping
+            else None
+        ),
+        name="recipe-search",
+        open=True,
+    )
+    return PsycopgPool(pool)
+
 
+def ensure_database():
+    """Create the database if it does not exist"""
     if not database_exists(engine.url):
         create_database(engine.url)
         logger.info("Database created")
 
-    return engine
+
+def warm_up():
+    """Open a connection to the database, so the pool has one ready"""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1;"))
+    logger.info("Database connection warmed up")
+
+
+@contextmanager
+def unit_of_work() -> Iterator[Session]:
+    """Share one session between the reads in the context.
+
+    The reads of the unit of work use one connection, and objects already
+    loaded by primary key are taken from the identity map of the session
+    instead of the database. Nested units of work join the outer one. The
+    connection is held until the context exits, so slow calls to other
+    services should be kept out of it.
+
+    Returns:
+        Iterator[Session]: The session of the unit of work.
+    """
+    session = _unit_of_work.get()
+    if session is not None:
+        yield session
+        return
+
+    session = Session(engine, expire_on_commit=False)
+    token = _unit_of_work.set(session)
+    try:
+        yield session
+    finally:
+        _unit_of_work.reset(token)
+        session.close()
+
+
+@contextmanager
+def get_session() -> Iterator[Session]:
+    """Get the session of the current unit of work, or a new one.
+
+    Returns:
+        Iterator[Session]: The session.
+    """
+    session = _unit_of_work.get()
+    if session is not None:
+        yield session
+        return
+
+    with Session(engine) as session:
+        yield session
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Get the connection pool statistics.
+
+    Returns:
+        Dict[str, Any]: The status of the pool and the checkout statistics,
+            empty if the pool does not record them.
+    """
+    metrics = getattr(engine.pool, "metrics", None)
+    if metrics is None:
+        return {}
+
+    return {"status": engine.pool.status(), **metrics.stats()}
 
 
 def check_health() -> bool:
@@ -1,8 +1,24 @@
+import json
 from dataclasses import dataclass
+from datetime import datetime
 from enum import StrEnum
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import MetaData, PickleType
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Dialect,
+    Index,
+    LargeBinary,
+    MetaData,
+    PickleType,
+    TypeDecorator,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableList
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column
 
@@ -40,6 +56,22 @@ class RecipeModelIngredient:
             "unit": self.unit,
         }
 
+    @classmethod
+    def from_dict(cls, value: Dict[str, Any]) -> "RecipeModelIngredient":
+        """Create an ingredient from a dictionary.
+
+        Arguments:
+            value (Dict[str, Any]): The dictionary from as_dict.
+
+        Returns:
+            RecipeModelIngredient: The ingredient.
+        """
+        return cls(
+            name=value["name"],
+            quantity=value.get("quantity"),
+            unit=value.get("unit"),
+        )
+
 
 class RecipeModelNutritionValue(StrEnum):
     """Recipe model nutrition value class."""
@@ -110,6 +142,23 @@ class RecipeModelNutrition:
             "carbs": self.carbs,
         }
 
+    @classmethod
+    def from_dict(cls, value: Dict[str, str]) -> "RecipeModelNutrition":
+        """Create a nutrition from a dictionary.
+
+        Arguments:
+            value (Dict[str, str]): The dictionary from as_dict.
+
+        Returns:
+            RecipeModelNutrition: The nutrition.
+        """
+        return cls(
+            calories=RecipeModelNutritionValue(value["calories"]),
+            fat=RecipeModelNutritionValue(value["fat"]),
+            protein=RecipeModelNutritionValue(value["protein"]),
+            carbs=RecipeModelNutritionValue(value["carbs"]),
+        )
+
 
 class UserProfileModelVeggieIdentity(StrEnum):
     """User profile model veggie identity class."""
@@ -153,26 +202,117 @@ class UserProfileModelVeggieIdentity(StrEnum):
             return Id.USER_PROFILE_VEGGIE_IDENTITY_VEGETARIAN
 
 
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+"""JSON column type, stored as JSONB in PostgreSQL"""
+
+
+class RecipeModelIngredientsType(TypeDecorator):
+    """Column type storing recipe ingredients as a JSON array"""
+
+    impl = JSONType
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Optional[List[RecipeModelIngredient]], dialect: Dialect
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Serialize the ingredients for the database."""
+        if value is None:
+            return None
+        return [ingredient.as_dict() for ingredient in value]
+
+    def process_result_value(
+        self, value: Optional[List[Dict[str, Any]]], dialect: Dialect
+    ) -> Optional[List[RecipeModelIngredient]]:
+        """Deserialize the ingredients from the database."""
+        if value is None:
+            return None
+        return [RecipeModelIngredient.from_dict(item) for item in value]
+
+
+class RecipeModelNutritionType(TypeDecorator):
+    """Column type storing recipe nutrition as a JSON object"""
+
+    impl = JSONType
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Optional[RecipeModelNutrition], dialect: Dialect
+    ) -> Optional[Dict[str, str]]:
+        """Serialize the nutrition for the database."""
+        if value is None:
+            return None
+        return value.as_dict()
+
+    def process_result_value(
+        self, value: Optional[Dict[str, str]], dialect: Dialect
+    ) -> Optional[RecipeModelNutrition]:
+        """Deserialize the nutrition from the database."""
+        if value is None:
+            return None
+        return RecipeModelNutrition.from_dict(value)
+
+
+class Float32VectorType(TypeDecorator):
+    """Column type storing a vector as packed float32 bytes
+
+    Loaded vectors are read-only NumPy arrays backed by the fetched bytes,
+    without a copy or a Python float per element.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Optional[npt.ArrayLike], dialect: Dialect
+    ) -> Optional[bytes]:
+        """Pack the vector for the database."""
+        if value is None:
+            return None
+        return np.asarray(value, dtype=np.float32).tobytes()
+
+    def process_result_value(
+        self, value: Optional[bytes], dialect: Dialect
+    ) -> Optional[npt.NDArray[np.float32]]:
+        """Unpack the vector from the database."""
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=np.float32)
+
+    def compare_values(self, x: Any, y: Any) -> bool:
+        """Compare two vectors, which may differ in length."""
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(
+            np.asarray(x, dtype=np.float32), np.asarray(y, dtype=np.float32)
+        )
+
+
 class RecipeModel(Base):
     """Recipe model"""
 
     __tablename__ = "recipe"
+    __table_args__ = (
+        Index("ix_recipe_nutrition", "nutrition", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column()
     description: Mapped[str] = mapped_column()
     ingredients: Mapped[List[RecipeModelIngredient]] = mapped_column(
-        MutableList.as_mutable(PickleType)
+        MutableList.as_mutable(RecipeModelIngredientsType)
     )
     directions: Mapped[List[str]] = mapped_column(
-        MutableList.as_mutable(PickleType)
+        MutableList.as_mutable(JSONType)
     )
-    tips: Mapped[List[str]] = mapped_column(MutableList.as_mutable(PickleType))
+    tips: Mapped[List[str]] = mapped_column(MutableList.as_mutable(JSONType))
     utensils: Mapped[List[str]] = mapped_column(
-        MutableList.as_mutable(PickleType)
+        MutableList.as_mutable(JSONType)
+    )
+    nutrition: Mapped[RecipeModelNutrition] = mapped_column(
+        RecipeModelNutritionType
     )
-    nutrition: Mapped[RecipeModelNutrition] = mapped_column(PickleType)
     veggie_identity: Mapped[UserProfileModelVeggieIdentity] = mapped_column()
+    content_hash: Mapped[Optional[str]] = mapped_column(default=None)
 
     def __repr__(self) -> str:
         return (
@@ -197,6 +337,15 @@ class RecipeModel(Base):
             "nutrition": self.nutrition.as_dict(),
         }
 
+    @cached_property
+    def json(self) -> str:
+        """Get the recipe as a JSON string of as_dict.
+
+        The string is computed once, as recipes are not modified after they
+        are added.
+        """
+        return json.dumps(self.as_dict())
+
 
 class UserProfileModel(Base):
     """User profile model"""
@@ -211,8 +360,8 @@ class UserProfileModel(Base):
     dislike: Mapped[List[str]] = mapped_column(
         MutableList.as_mutable(PickleType)
     )
-    embedding: Mapped[List[float]] = mapped_column(
-        MutableList.as_mutable(PickleType)
+    embedding: Mapped[npt.NDArray[np.float32]] = mapped_column(
+        Float32VectorType
     )
 
     def __repr__(self) -> str:
@@ -223,6 +372,26 @@ class UserProfileModel(Base):
         )
 
 
+class EmbeddingCacheModel(Base):
+    """Embedding cache model"""
+
+    __tablename__ = "embedding_cache"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    model: Mapped[str] = mapped_column()
+    num_dim: Mapped[int] = mapped_column()
+    embedding: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"EmbeddingCache(key={self.key}, model={self.model},"
+            f" num_dim={self.num_dim})"
+        )
+
+
 """
 Following models are not database models,
 they are simply used as in-memory data structures.
@@ -510,4 +679,21 @@ class ChatStreamContentModel:
         return f"ChatStreamContent(text={self.text})"
 
 
-ChatStreamModel = ChatStreamHeaderModel | ChatStreamContentModel
+@dataclass
+class ChatStreamFunctionCallModel:
+    """Chat stream function call model"""
+
+    function_call: Union[
+        ChatSetUserProfileFunctionCallModel,
+        ChatSearchRecipeFunctionCallModel,
+    ]
+
+    def __repr__(self) -> str:
+        return f"ChatStreamFunctionCall(function_call={self.function_call})"
+
+
+ChatStreamModel = (
+    ChatStreamHeaderModel
+    | ChatStreamContentModel
+    | ChatStreamFunctionCallModel
+)
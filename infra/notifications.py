@@ -0,0 +1,155 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from configs import db as db_configs
+from infra import db
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[Optional[str]], None]
+
+
+class Listener:
+    """Listener of a PostgreSQL notification channel
+
+    The payloads are `<topic>:<key>`, and each one is passed to the callbacks
+    subscribed to its topic. Notifications sent while the listener was
+    disconnected are lost, so after reconnecting every callback is called
+    with None, meaning any key of the topic may have changed. Only PostgreSQL
+    supports notifications, on other databases the listener does nothing.
+    """
+
+    channel: str
+    retry_seconds: float
+    _callbacks: Dict[str, List[Callback]]
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+
+    def __init__(self, channel: str, retry_seconds: float):
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self._callbacks = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the database supports notifications.
+
+        Returns:
+            bool: True if supported, False otherwise.
+        """
+        return db.engine.dialect.name == "postgresql"
+
+    def subscribe(self, topic: str, callback: Callback):
+        """Call a function for every notification of a topic.
+
+        Arguments:
+            topic (str): The topic.
+            callback (Callback): The function, called with the key of the
+                notification, or None if any key may have changed.
+        """
+        with self._lock:
+            self._callbacks.setdefault(topic, []).append(callback)
+
+    def start(self):
+        """Start listening in a daemon thread, if it is not started."""
+        if not self.is_supported():
+            return
+
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="notifications", daemon=True
+            )
+            self._thread.start()
+
+    def dispatch(self, payload: str):
+        """Pass a notification to the callbacks of its topic.
+
+        Arguments:
+            payload (str): The payload of the notification.
+        """
+        topic, _, key = payload.partition(":")
+        for callback in self._callbacks.get(topic, []):
+            self._call(callback, key)
+
+    def _reset(self):
+        """Tell every callback that any key may have changed."""
+        for callbacks in list(self._callbacks.values()):
+            for callback in callbacks:
+                self._call(callback, None)
+
+    def _call(self, callback: Callback, key: Optional[str]):
+        """Call a callback, logging its errors.
+
+        Arguments:
+            callback (Callback): The callback.
+            key (Optional[str]): The key.
+        """
+        try:
+            callback(key)
+        except Exception as e:
+            logger.error(f"Notification callback failed: {e}")
+
+    def _run(self):
+        """Listen to the channel, reconnecting when the connection drops."""
+        connected_before = False
+
+        while True:
+            try:
+                with psycopg.connect(
+                    db.conninfo(db.engine.url), autocommit=True
+                ) as connection:
+                    connection.execute(
+                        sql.SQL("LISTEN {}").format(
+                            sql.Identifier(self.channel)
+                        )
+                    )
+                    logger.info(f"Listening to notifications: {self.channel}")
+
+                    if connected_before:
+                        self._reset()
+                    connected_before = True
+
+                    for notification in connection.notifies():
+                        self.dispatch(notification.payload)
+            except Exception as e:
+                logger.error(
+                    f"Notification listener failed, reconnecting in "
+                    f"{self.retry_seconds}s: {e}"
+                )
+
+            time.sleep(self.retry_seconds)
+
+
+def notify(session: Session, topic: str, key: str):
+    """Notify the listeners of every replica when the transaction commits.
+
+    Arguments:
+        session (Session): The session of the transaction.
+        topic (str): The topic.
+        key (str): The key that changed.
+    """
+    if not Listener.is_supported():
+        return
+
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": listener.channel, "payload": f"{topic}:{key}"},
+    )
+
+
+listener = Listener(
+    db_configs.configs.db_notify_channel,
+    db_configs.configs.db_listen_retry_seconds,
+)
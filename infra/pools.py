@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psycopg
+import psycopg_pool
+from sqlalchemy import exc
+from sqlalchemy.pool import ConnectionPoolEntry, NullPool, QueuePool
+
+from configs import db
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Wait times of the connection checkouts of a pool
+
+    Checkouts waiting longer than the threshold are logged, so pool
+    exhaustion shows up before it turns into timeouts.
+    """
+
+    slow_threshold: float
+    checkouts: int
+    timeouts: int
+    total_wait: float
+    max_wait: float
+    _lock: threading.Lock
+
+    def __init__(self, slow_threshold: float):
+        self.slow_threshold = slow_threshold
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float):
+        """Record a checkout.
+
+        Arguments:
+            wait (float): The seconds waited for the connection.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        if wait > self.slow_threshold:
+            logger.warning(f"Waited {wait:.3f}s for a database connection")
+
+    def record_timeout(self):
+        """Record a checkout that timed out."""
+        with self._lock:
+            self.timeouts += 1
+
+        logger.error("Timed out waiting for a database connection")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the checkout statistics.
+
+        Returns:
+            Dict[str, Any]: The checkouts, timeouts, and average and maximum
+                wait in seconds.
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "average_wait": (
+                    self.total_wait / self.checkouts if self.checkouts else 0.0
+                ),
+                "max_wait": self.max_wait,
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """SQLAlchemy queue pool recording the wait time of each checkout"""
+
+    metrics: PoolMetrics
+
+    def __init__(
+        self, *args, metrics: Optional[PoolMetrics] = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics or PoolMetrics(
+            db.configs.db_pool_slow_checkout_seconds
+        )
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.monotonic()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+
+        self.metrics.record(time.monotonic() - start)
+        return record
+
+    def recreate(self) -> "TimedQueuePool":
+        """Create a new pool of the same class, keeping the metrics."""
+        self.logger.info("Pool recreating")
+
+        return self.__class__(
+            self._creator,
+            metrics=self.metrics,
+            pool_size=self._pool.maxsize,
+            max_overflow=self._max_overflow,
+            pre_ping=self._pre_ping,
+            use_lifo=self._pool.use_lifo,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+
+
+class PsycopgPool(NullPool):
+    """SQLAlchemy pool lending the connections of a psycopg_pool pool
+
+    SQLAlchemy opens and closes a connection on every checkout, and the
+    connections are taken from and given back to the psycopg pool instead,
+    which checks, recycles and sizes them.
+    """
+
+    pool: psycopg_pool.ConnectionPool
+    metrics: PoolMetrics
+
+    def __init__(
+        self,
+        pool: psycopg_pool.ConnectionPool,
+        metrics: Optional[PoolMetrics] = None,
+        **kwargs,
+    ):
+        super().__init__(self._getconn, **kwargs)
+        self.pool = pool
+        self.metrics = metrics or PoolMetrics(
+            db.configs.db_pool_slow_checkout_seconds
+        )
+
+    def _getconn(self) -> psycopg.Connection:
+        """Take a connection from the psycopg pool.
+
+        Returns:
+            psycopg.Connection: The connection.
+        """
+        start = time.monotonic()
+        try:
+            connection = self.pool.getconn()
+        except psycopg_pool.PoolTimeout:
+            self.metrics.record_timeout()
+            raise
+
+        self.metrics.record(time.monotonic() - start)
+        return connection
+
+    def _close_connection(
+        self, connection: psycopg.Connection, *, terminate: bool = False
+    ):
+        if terminate:
+            connection.close()
+        self.pool.putconn(connection)
+
+    def recreate(self) -> "PsycopgPool":
+        """Create a new pool on the same psycopg pool and metrics."""
+        self.logger.info("Pool recreating")
+
+        return self.__class__(
+            self.pool,
+            self.metrics,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            pre_ping=self._pre_ping,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+
+    def status(self) -> str:
+        """Get the status of the psycopg pool."""
+        return f"PsycopgPool {self.pool.get_stats()}"
@@ -18,6 +18,20 @@ class AddRecipesResponse(_message.Message):
     recipes: _containers.RepeatedCompositeFieldContainer[AddRecipesResponseRecipe]
     def __init__(self, recipes: _Optional[_Iterable[_Union[AddRecipesResponseRecipe, _Mapping]]] = ...) -> None: ...
 
+class AddRecipesStreamRequest(_message.Message):
+    __slots__ = ("recipes",)
+    RECIPES_FIELD_NUMBER: _ClassVar[int]
+    recipes: _containers.RepeatedCompositeFieldContainer[AddRecipesRequestRecipe]
+    def __init__(self, recipes: _Optional[_Iterable[_Union[AddRecipesRequestRecipe, _Mapping]]] = ...) -> None: ...
+
+class AddRecipesStreamResponse(_message.Message):
+    __slots__ = ("batch", "recipes")
+    BATCH_FIELD_NUMBER: _ClassVar[int]
+    RECIPES_FIELD_NUMBER: _ClassVar[int]
+    batch: int
+    recipes: _containers.RepeatedCompositeFieldContainer[AddRecipesResponseRecipe]
+    def __init__(self, batch: _Optional[int] = ..., recipes: _Optional[_Iterable[_Union[AddRecipesResponseRecipe, _Mapping]]] = ...) -> None: ...
+
 class AddRecipesRecipeIngredient(_message.Message):
     __slots__ = ("name", "quantity", "unit")
     NAME_FIELD_NUMBER: _ClassVar[int]
@@ -36,12 +36,14 @@ class ChatByRecipeResponse(_message.Message):
     def __init__(self, message: _Optional[_Union[ChatByRecipeMessage, _Mapping]] = ..., function_call: _Optional[_Union[ChatByRecipeFunctionCall, _Mapping]] = ...) -> None: ...
 
 class ChatByRecipeStreamResponse(_message.Message):
-    __slots__ = ("header", "content")
+    __slots__ = ("header", "content", "function_call")
     HEADER_FIELD_NUMBER: _ClassVar[int]
     CONTENT_FIELD_NUMBER: _ClassVar[int]
+    FUNCTION_CALL_FIELD_NUMBER: _ClassVar[int]
     header: ChatByRecipeStreamHeader
     content: ChatByRecipeStreamContent
-    def __init__(self, header: _Optional[_Union[ChatByRecipeStreamHeader, _Mapping]] = ..., content: _Optional[_Union[ChatByRecipeStreamContent, _Mapping]] = ...) -> None: ...
+    function_call: ChatByRecipeFunctionCall
+    def __init__(self, header: _Optional[_Union[ChatByRecipeStreamHeader, _Mapping]] = ..., content: _Optional[_Union[ChatByRecipeStreamContent, _Mapping]] = ..., function_call: _Optional[_Union[ChatByRecipeFunctionCall, _Mapping]] = ...) -> None: ...
 
 class ChatByRecipeMessage(_message.Message):
     __slots__ = ("role", "text")
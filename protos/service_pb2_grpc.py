@@ -81,6 +81,11 @@ class RecipeSearchServiceStub(object):
                 request_serializer=protos_dot_add__recipes__pb2.AddRecipesRequest.SerializeToString,
                 response_deserializer=protos_dot_add__recipes__pb2.AddRecipesResponse.FromString,
                 _registered_method=True)
+        self.AddRecipesStream = channel.stream_stream(
+                '/RecipeSearchService/AddRecipesStream',
+                request_serializer=protos_dot_add__recipes__pb2.AddRecipesStreamRequest.SerializeToString,
+                response_deserializer=protos_dot_add__recipes__pb2.AddRecipesStreamResponse.FromString,
+                _registered_method=True)
         self.ResetData = channel.unary_unary(
                 '/RecipeSearchService/ResetData',
                 request_serializer=protos_dot_reset__data__pb2.ResetDataRequest.SerializeToString,
@@ -143,6 +148,12 @@ class RecipeSearchServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AddRecipesStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ResetData(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -192,6 +203,11 @@ def add_RecipeSearchServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_add__recipes__pb2.AddRecipesRequest.FromString,
                     response_serializer=protos_dot_add__recipes__pb2.AddRecipesResponse.SerializeToString,
             ),
+            'AddRecipesStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.AddRecipesStream,
+                    request_deserializer=protos_dot_add__recipes__pb2.AddRecipesStreamRequest.FromString,
+                    response_serializer=protos_dot_add__recipes__pb2.AddRecipesStreamResponse.SerializeToString,
+            ),
             'ResetData': grpc.unary_unary_rpc_method_handler(
                     servicer.ResetData,
                     request_deserializer=protos_dot_reset__data__pb2.ResetDataRequest.FromString,
@@ -424,6 +440,33 @@ class RecipeSearchService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def AddRecipesStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/RecipeSearchService/AddRecipesStream',
+            protos_dot_add__recipes__pb2.AddRecipesStreamRequest.SerializeToString,
+            protos_dot_add__recipes__pb2.AddRecipesStreamResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ResetData(request,
             target,
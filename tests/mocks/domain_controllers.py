@@ -1,17 +1,40 @@
-from typing import Iterable, List, Optional
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
 
 from configs.domain import configs
+from domain.model_types import StartupState
 from infra import models
 
 
+def start_up():
+    pass
+
+
+def get_startup_state() -> StartupState:
+    pass
+
+
 def is_typesense_healthy() -> bool:
     pass
 
 
+def is_ollama_healthy() -> bool:
+    pass
+
+
+def is_azure_openai_healthy() -> bool:
+    pass
+
+
 def get_recipe(id: int) -> models.RecipeModel:
     pass
 
 
+def get_recipe_and_user_profile(
+    id: int, username: str
+) -> Tuple[models.RecipeModel, Optional[models.UserProfileModel]]:
+    pass
+
+
 def get_recipes(ids: Iterable[int]) -> List[models.RecipeModel]:
     pass
 
@@ -20,6 +43,12 @@ def add_recipes(recipes: Iterable[models.RecipeModel]):
     pass
 
 
+def add_recipes_stream(
+    recipes: Iterable[models.RecipeModel],
+) -> Iterator[List[models.RecipeModel]]:
+    pass
+
+
 def search_recipes(
     ingredients: Iterable[str],
     page: int = 1,
@@ -31,7 +60,9 @@ def search_recipes(
 
 def chat_by_recipe(
     name: str,
+    username: str,
     recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
     messages: Iterable[models.ChatMessageModel],
 ) -> models.ChatResponseModel:
     pass
@@ -39,12 +70,24 @@ def chat_by_recipe(
 
 def chat_by_recipe_stream(
     name: str,
+    username: str,
     recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
     messages: Iterable[models.ChatMessageModel],
 ) -> Iterable[models.ChatStreamModel]:
     pass
 
 
+def chat_by_recipe_stream_async(
+    name: str,
+    username: str,
+    recipe: models.RecipeModel,
+    profile: Optional[models.UserProfileModel],
+    messages: Iterable[models.ChatMessageModel],
+) -> AsyncIterator[models.ChatStreamModel]:
+    pass
+
+
 def set_user_profile(profile: models.UserProfileModel):
     pass
 
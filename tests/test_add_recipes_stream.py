@@ -0,0 +1,148 @@
+import grpc
+import pytest
+import pytest_mock
+
+from apis.servicer import RecipeSearchServicer
+from infra.models import (
+    RecipeModel,
+    RecipeModelIngredient,
+    RecipeModelNutrition,
+    RecipeModelNutritionValue,
+)
+from protos.add_recipes_pb2 import (
+    AddRecipesRecipeIngredient,
+    AddRecipesRequestRecipe,
+    AddRecipesResponseRecipe,
+    AddRecipesStreamRequest,
+    AddRecipesStreamResponse,
+)
+from protos.recipe_nutrition_pb2 import RecipeNutrition
+
+
+def test_add_recipes_stream_success(
+    mocker: pytest_mock.MockerFixture,
+):
+    recipes = [
+        RecipeModel(
+            id=id,
+            title="test_title",
+            description="test_description",
+            ingredients=[
+                RecipeModelIngredient(name="apple", quantity=1, unit="unit"),
+                RecipeModelIngredient(name="banana", quantity=2, unit="unit"),
+            ],
+            directions=["step 1", "step 2"],
+            tips=["tip 1", "tip 2"],
+            utensils=["knife", "spoon"],
+            nutrition=RecipeModelNutrition(
+                calories=RecipeModelNutritionValue.high,
+                fat=RecipeModelNutritionValue.low,
+                protein=RecipeModelNutritionValue.medium,
+                carbs=RecipeModelNutritionValue.none,
+            ),
+        )
+        for id in range(1, 4)
+    ]
+    request_recipes = [
+        AddRecipesRequestRecipe(
+            title=recipe.title,
+            description=recipe.description,
+            ingredients=[
+                AddRecipesRecipeIngredient(
+                    name=ingredient.name,
+                    quantity=ingredient.quantity,
+                    unit=ingredient.unit,
+                )
+                for ingredient in recipe.ingredients
+            ],
+            directions=recipe.directions,
+            tips=recipe.tips,
+            utensils=recipe.utensils,
+            nutrition=RecipeNutrition(
+                calories=recipe.nutrition.calories.to_proto(),
+                fat=recipe.nutrition.fat.to_proto(),
+                protein=recipe.nutrition.protein.to_proto(),
+                carbs=recipe.nutrition.carbs.to_proto(),
+            ),
+        )
+        for recipe in recipes
+    ]
+    response_recipes = [
+        AddRecipesResponseRecipe(
+            id=recipe.id,
+            title=recipe.title,
+            description=recipe.description,
+            ingredients=[
+                AddRecipesRecipeIngredient(
+                    name=ingredient.name,
+                    quantity=ingredient.quantity,
+                    unit=ingredient.unit,
+                )
+                for ingredient in recipe.ingredients
+            ],
+            directions=recipe.directions,
+            tips=recipe.tips,
+            utensils=recipe.utensils,
+            nutrition=RecipeNutrition(
+                calories=recipe.nutrition.calories.to_proto(),
+                fat=recipe.nutrition.fat.to_proto(),
+                protein=recipe.nutrition.protein.to_proto(),
+                carbs=recipe.nutrition.carbs.to_proto(),
+            ),
+        )
+        for recipe in recipes
+    ]
+    requests = [
+        AddRecipesStreamRequest(recipes=request_recipes[:2]),
+        AddRecipesStreamRequest(recipes=request_recipes[2:]),
+    ]
+    expected_responses = [
+        AddRecipesStreamResponse(batch=1, recipes=response_recipes[:2]),
+        AddRecipesStreamResponse(batch=2, recipes=response_recipes[2:]),
+    ]
+
+    added_recipes = []
+
+    def add_recipes_stream(stream_recipes):
+        added_recipes.extend(stream_recipes)
+        yield recipes[:2]
+        yield recipes[2:]
+
+    mock_add_recipes_stream = mocker.patch(
+        "domain.controllers.add_recipes_stream",
+        side_effect=add_recipes_stream,
+    )
+
+    context = mocker.MagicMock()
+
+    servicer = RecipeSearchServicer()
+    responses = list(servicer.AddRecipesStream(iter(requests), context))
+
+    mock_add_recipes_stream.assert_called_once_with(mocker.ANY)
+    assert [recipe.title for recipe in added_recipes] == [
+        recipe.title for recipe in recipes
+    ]
+    assert responses == expected_responses
+    context.abort.assert_not_called()
+
+
+def test_add_recipes_stream_empty_recipes(
+    mocker: pytest_mock.MockerFixture,
+):
+    mock_add_recipes_stream = mocker.patch(
+        "domain.controllers.add_recipes_stream",
+        side_effect=lambda recipes: iter(list(recipes)),
+    )
+
+    context = mocker.MagicMock()
+    context.abort = mocker.MagicMock(side_effect=grpc.RpcError)
+
+    servicer = RecipeSearchServicer()
+    with pytest.raises(grpc.RpcError):
+        list(servicer.AddRecipesStream(iter([]), context))
+
+    mock_add_recipes_stream.assert_called_once_with(mocker.ANY)
+    context.abort.assert_called_once_with(
+        grpc.StatusCode.INVALID_ARGUMENT,
+        "Recipes cannot be empty",
+    )
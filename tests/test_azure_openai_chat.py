@@ -0,0 +1,213 @@
+import json
+import threading
+from concurrent import futures
+from typing import Any, Dict, List, Optional
+
+import pytest
+import pytest_mock
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion
+from openai.types.completion_usage import PromptTokensDetails
+
+from configs.domain import configs as domain_configs
+from domain.chats.azure_openai import AzureOpenAIChat, PromptUsage
+from infra import models
+
+Type = AzureOpenAIChat.SystemPromptType
+
+
+def make_recipe(id: int, title: str) -> models.RecipeModel:
+    return models.RecipeModel(
+        id=id,
+        title=title,
+        description=f"{title} description",
+        ingredients=[],
+        directions=[],
+        tips=[],
+        utensils=[],
+        nutrition=models.RecipeModelNutrition(
+            calories=models.RecipeModelNutritionValue.none,
+            fat=models.RecipeModelNutritionValue.none,
+            protein=models.RecipeModelNutritionValue.none,
+            carbs=models.RecipeModelNutritionValue.none,
+        ),
+        veggie_identity=models.UserProfileModelVeggieIdentity.NONE,
+    )
+
+
+@pytest.fixture
+def clients(mocker: pytest_mock.MockerFixture):
+    return mocker.patch("domain.chats.azure_openai.clients")
+
+
+def make_chat(user: str, recipe: models.RecipeModel) -> AzureOpenAIChat:
+    chat = AzureOpenAIChat(
+        AzureOpenAIChat.Configs(api_version="test", model="test")
+    )
+    chat.set_user(user, user.lower())
+    chat.set_recipe(recipe)
+    return chat
+
+
+@pytest.mark.parametrize("type", list(Type))
+def test_system_prompt_shares_recipe_prefix(clients, type: Type):
+    recipe = make_recipe(1, "Apple pie")
+    alice = make_chat("Alice", recipe).get_system_payload(type)["content"]
+    bob = make_chat("Bob", recipe).get_system_payload(type)["content"]
+
+    user_format = AzureOpenAIChat.SYSTEM_PROMPT_FORMATS[
+        AzureOpenAIChat.SystemPromptKey.USER
+    ]
+    alice_user = user_format.format(name="Alice")
+    bob_user = user_format.format(name="Bob")
+
+    # The user comes last, after the prefix shared by every user
+    assert alice.endswith(alice_user)
+    assert bob.endswith(bob_user)
+    assert alice.removesuffix(alice_user) == bob.removesuffix(bob_user)
+    assert recipe.json in alice
+
+
+def test_prompt_usage_records_cached_tokens():
+    usage = PromptUsage()
+
+    usage.record(
+        CompletionUsage(
+            prompt_tokens=1000,
+            completion_tokens=10,
+            total_tokens=1010,
+            prompt_tokens_details=PromptTokensDetails(cached_tokens=768),
+        )
+    )
+    usage.record(
+        CompletionUsage(
+            prompt_tokens=1000, completion_tokens=10, total_tokens=1010
+        )
+    )
+    usage.record(None)
+
+    assert usage.stats() == {
+        "completions": 2,
+        "prompt_tokens": 2000,
+        "cached_tokens": 768,
+        "cached_rate": 0.384,
+    }
+
+
+def make_completion(
+    content: Optional[str] = None,
+    tool_calls: Optional[List[Dict[str, Any]]] = None,
+) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "test",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls" if tool_calls else "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": content,
+                        "tool_calls": tool_calls,
+                    },
+                }
+            ],
+        }
+    )
+
+
+SEARCH_RECIPES_CALL = {
+    "id": "call",
+    "type": "function",
+    "function": {
+        "name": models.ChatResponseFunctionCallModel.SEARCH_RECIPES,
+        "arguments": json.dumps(
+            {"ingredients": ["apple"], "extra_terms": None}
+        ),
+    },
+}
+
+
+@pytest.fixture
+def speculative_chat(
+    clients, mocker: pytest_mock.MockerFixture
+) -> AzureOpenAIChat:
+    mocker.patch.object(domain_configs, "domain_chat_speculative", True)
+    mocker.patch.object(
+        AzureOpenAIChat,
+        "speculation_executor",
+        futures.ThreadPoolExecutor(max_workers=1),
+    )
+    return make_chat("Alice", make_recipe(1, "Apple pie"))
+
+
+def set_function(
+    chat: AzureOpenAIChat,
+    function: Optional[models.ChatResponseFunctionCallModel],
+):
+    parsed = chat.client.beta.chat.completions.parse.return_value
+    parsed.usage = None
+    parsed.choices[0].message.parsed.function = function
+
+
+def test_chat_speculative_reply_discarded_for_function_call(
+    speculative_chat: AzureOpenAIChat,
+):
+    set_function(
+        speculative_chat, models.ChatResponseFunctionCallModel.SEARCH_RECIPES
+    )
+    speculative_chat.client.chat.completions.create.side_effect = (
+        lambda **kwargs: make_completion(
+            tool_calls=[SEARCH_RECIPES_CALL] if "tools" in kwargs else None,
+            content=None if "tools" in kwargs else "A plain reply",
+        )
+    )
+
+    response = speculative_chat.chat(
+        [models.ChatMessageModel(role=models.ChatRoleModel.USER, text="Hi")]
+    )
+
+    assert response.function_call == models.ChatSearchRecipeFunctionCallModel(
+        ingredients=["apple"]
+    )
+
+
+def test_chat_speculative_reply_used(speculative_chat: AzureOpenAIChat):
+    set_function(speculative_chat, None)
+    create = speculative_chat.client.chat.completions.create
+    create.return_value = make_completion(content="A plain reply")
+
+    response = speculative_chat.chat(
+        [models.ChatMessageModel(role=models.ChatRoleModel.USER, text="Hi")]
+    )
+
+    assert response.message.text == "A plain reply"
+    create.assert_called_once()
+
+
+def test_chat_speculative_reply_queued_made_inline(
+    speculative_chat: AzureOpenAIChat,
+):
+    set_function(speculative_chat, None)
+    reply_threads = []
+
+    def create(**kwargs) -> ChatCompletion:
+        reply_threads.append(threading.current_thread())
+        return make_completion(content="A plain reply")
+
+    speculative_chat.client.chat.completions.create.side_effect = create
+
+    # Another request holds the only speculation worker for a while
+    release = threading.Event()
+    speculative_chat.speculation_executor.submit(release.wait)
+    threading.Timer(0.5, release.set).start()
+
+    response = speculative_chat.chat(
+        [models.ChatMessageModel(role=models.ChatRoleModel.USER, text="Hi")]
+    )
+
+    assert response.message.text == "A plain reply"
+    assert reply_threads == [threading.current_thread()]
@@ -0,0 +1,35 @@
+from domain.caches import Generations
+
+
+def test_generations_bump():
+    generations = Generations(max_size=10)
+
+    assert generations.get("recipes") == 0
+    generations.bump("recipes")
+    first = generations.get("recipes")
+    generations.bump("recipes")
+
+    assert first > 0
+    assert generations.get("recipes") > first
+
+
+def test_generations_eviction_keeps_keys_stale():
+    generations = Generations(max_size=2)
+    never_bumped = generations.get("carol")
+    generations.bump("alice")
+    alice = generations.get("alice")
+    generations.bump("alice")
+    latest_alice = generations.get("alice")
+
+    generations.bump("bob")
+    generations.bump("dave")
+
+    assert len(generations) == 2
+    # Alice is evicted, her generation reads as the latest evicted one,
+    # unlike any of her older generations or an unbumped generation
+    assert generations.get("alice") == latest_alice
+    assert generations.get("alice") != alice
+    assert generations.get("carol") != never_bumped
+
+    generations.bump("alice")
+    assert generations.get("alice") > latest_alice
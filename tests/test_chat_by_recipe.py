@@ -73,8 +73,8 @@ def test_chat_by_recipe_success(mocker: pytest_mock.MockerFixture):
     )
 
     mocker.patch(
-        "domain.controllers.get_recipe",
-        return_value=recipe,
+        "domain.controllers.get_recipe_and_user_profile",
+        return_value=(recipe, None),
     )
     mock_chat = mocker.patch(
         "domain.controllers.chat_by_recipe",
@@ -97,6 +97,7 @@ def test_chat_by_recipe_success(mocker: pytest_mock.MockerFixture):
         name,
         username,
         recipe,
+        None,
         mocker.ANY,
     )
     assert all(
@@ -139,7 +140,7 @@ def test_chat_by_recipe_recipe_not_found(
     )
 
     mock_get_recipe = mocker.patch(
-        "domain.controllers.get_recipe",
+        "domain.controllers.get_recipe_and_user_profile",
         side_effect=NoResultFound(),
     )
 
@@ -150,7 +151,7 @@ def test_chat_by_recipe_recipe_not_found(
     with pytest.raises(grpc.RpcError):
         servicer.ChatByRecipe(request, context)
 
-    mock_get_recipe.assert_called_once_with(id)
+    mock_get_recipe.assert_called_once_with(id, username)
     context.abort.assert_called_once_with(
         grpc.StatusCode.NOT_FOUND,
         f"Recipe with ID {id} not found",
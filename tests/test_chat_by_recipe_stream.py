@@ -1,11 +1,15 @@
+import asyncio
+
 import grpc
 import pytest
 import pytest_mock
 from sqlalchemy.exc import NoResultFound
 
+from apis.async_servicer import AsyncRecipeSearchServicer
 from apis.servicer import RecipeSearchServicer
 from infra import models
 from protos.chat_by_recipe_pb2 import (
+    ChatByRecipeFunctionCall,
     ChatByRecipeMessage,
     ChatByRecipeRequest,
     ChatByRecipeRole,
@@ -13,6 +17,7 @@ from protos.chat_by_recipe_pb2 import (
     ChatByRecipeStreamHeader,
     ChatByRecipeStreamResponse,
 )
+from protos.search_recipes_pb2 import SearchRecipesRequest
 
 
 def test_chat_by_recipe_stream_success(mocker: pytest_mock.MockerFixture):
@@ -86,8 +91,8 @@ def test_chat_by_recipe_stream_success(mocker: pytest_mock.MockerFixture):
     ]
 
     mocker.patch(
-        "domain.controllers.get_recipe",
-        return_value=recipe,
+        "domain.controllers.get_recipe_and_user_profile",
+        return_value=(recipe, None),
     )
     mock_chat = mocker.patch(
         "domain.controllers.chat_by_recipe_stream",
@@ -121,6 +126,7 @@ def test_chat_by_recipe_stream_success(mocker: pytest_mock.MockerFixture):
         name,
         username,
         recipe,
+        None,
         mocker.ANY,
     )
     assert all(
@@ -128,6 +134,61 @@ def test_chat_by_recipe_stream_success(mocker: pytest_mock.MockerFixture):
     )
 
 
+def test_chat_by_recipe_stream_function_call(
+    mocker: pytest_mock.MockerFixture,
+):
+    recipe = models.RecipeModel(
+        id=1,
+        title="test_title",
+        description="test_description",
+    )
+    request = ChatByRecipeRequest(
+        id=recipe.id,
+        username="test_username",
+        name="test_name",
+        messages=[
+            ChatByRecipeMessage(
+                role=ChatByRecipeRole.USER,
+                text="find recipes with apples",
+            ),
+        ],
+    )
+    function_call = models.ChatSearchRecipeFunctionCallModel(
+        ingredients=["apple"],
+        extra_terms="pie",
+    )
+
+    mocker.patch(
+        "domain.controllers.get_recipe_and_user_profile",
+        return_value=(recipe, None),
+    )
+    mocker.patch(
+        "domain.controllers.chat_by_recipe_stream",
+        return_value=(
+            models.ChatStreamHeaderModel(role=models.ChatRoleModel.ASSISTANT),
+            models.ChatStreamContentModel(text="Searching"),
+            models.ChatStreamFunctionCallModel(function_call=function_call),
+        ),
+    )
+
+    context = mocker.MagicMock()
+
+    servicer = RecipeSearchServicer()
+    responses = list(servicer.ChatByRecipeStream(request, context))
+
+    assert [response.WhichOneof("response") for response in responses] == [
+        "header",
+        "content",
+        "function_call",
+    ]
+    assert responses[2].function_call == ChatByRecipeFunctionCall(
+        search_recipes=SearchRecipesRequest(
+            ingredients=["apple"],
+            extra_terms="pie",
+        ),
+    )
+
+
 def test_chat_by_recipe_stream_recipe_not_found(
     mocker: pytest_mock.MockerFixture,
 ):
@@ -162,7 +223,7 @@ def test_chat_by_recipe_stream_recipe_not_found(
     )
 
     mock_get_recipe = mocker.patch(
-        "domain.controllers.get_recipe",
+        "domain.controllers.get_recipe_and_user_profile",
         side_effect=NoResultFound(),
     )
 
@@ -173,7 +234,102 @@ def test_chat_by_recipe_stream_recipe_not_found(
     with pytest.raises(grpc.RpcError):
         next(servicer.ChatByRecipeStream(request, context))
 
-    mock_get_recipe.assert_called_once_with(id)
+    mock_get_recipe.assert_called_once_with(id, username)
+    context.abort.assert_called_once_with(
+        grpc.StatusCode.NOT_FOUND,
+        f"Recipe with ID {id} not found",
+    )
+
+
+def test_chat_by_recipe_stream_async_success(
+    mocker: pytest_mock.MockerFixture,
+):
+    id = 1
+    username = "test_username"
+    name = "test_name"
+    recipe = models.RecipeModel(
+        id=1,
+        title="test_title",
+        description="test_description",
+    )
+    request = ChatByRecipeRequest(
+        id=id,
+        username=username,
+        name=name,
+        messages=[
+            ChatByRecipeMessage(role=ChatByRecipeRole.USER, text="user text"),
+        ],
+    )
+    expected_responses = [
+        ChatByRecipeStreamResponse(
+            header=ChatByRecipeStreamHeader(
+                role=ChatByRecipeRole.ASSISTANT,
+            ),
+        ),
+        ChatByRecipeStreamResponse(
+            content=ChatByRecipeStreamContent(
+                text="assistant response",
+            ),
+        ),
+    ]
+
+    async def stream(*args):
+        yield models.ChatStreamHeaderModel(role=models.ChatRoleModel.ASSISTANT)
+        yield models.ChatStreamContentModel(text="assistant response")
+
+    mocker.patch(
+        "domain.controllers.get_recipe_and_user_profile",
+        return_value=(recipe, None),
+    )
+    mock_chat = mocker.patch(
+        "domain.controllers.chat_by_recipe_stream_async",
+        side_effect=stream,
+    )
+
+    context = mocker.MagicMock()
+
+    async def collect():
+        servicer = AsyncRecipeSearchServicer()
+        return [
+            response
+            async for response in servicer.ChatByRecipeStream(
+                request, context
+            )
+        ]
+
+    assert asyncio.run(collect()) == expected_responses
+    mock_chat.assert_called_once_with(
+        name, username, recipe, None, mocker.ANY
+    )
+
+
+def test_chat_by_recipe_stream_async_recipe_not_found(
+    mocker: pytest_mock.MockerFixture,
+):
+    id = 1
+    username = "test_username"
+    request = ChatByRecipeRequest(
+        id=id,
+        username=username,
+        name="test_name",
+    )
+
+    mock_get_recipe = mocker.patch(
+        "domain.controllers.get_recipe_and_user_profile",
+        side_effect=NoResultFound(),
+    )
+
+    context = mocker.MagicMock()
+    context.abort = mocker.AsyncMock(side_effect=grpc.RpcError)
+
+    async def first():
+        servicer = AsyncRecipeSearchServicer()
+        return await anext(servicer.ChatByRecipeStream(request, context))
+
+    with pytest.raises(grpc.RpcError):
+        asyncio.run(first())
+
+    mock_get_recipe.assert_called_once_with(id, username)
     context.abort.assert_called_once_with(
         grpc.StatusCode.NOT_FOUND,
         f"Recipe with ID {id} not found",
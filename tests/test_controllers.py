@@ -0,0 +1,228 @@
+import importlib.util
+import os
+from types import ModuleType
+
+import numpy as np
+import pytest
+import pytest_mock
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import domain
+from infra import db, models
+
+controllers_path = os.path.join(
+    os.path.dirname(domain.__file__), "controllers.py"
+)
+
+
+@pytest.fixture
+def controllers() -> ModuleType:
+    # conftest replaces domain.controllers with the mock, so the real module
+    # is loaded on its own, with fresh caches for every test
+    spec = importlib.util.spec_from_file_location(
+        "domain.controllers", controllers_path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def engine(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+) -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    ).execution_options(schema_translate_map={"public": None})
+    models.Base.metadata.create_all(engine)
+    mocker.patch.object(controllers, "engine", engine)
+    mocker.patch.object(controllers.notifications, "notify")
+    return engine
+
+
+def make_result(id: int) -> models.TypesenseResult:
+    return models.TypesenseResult(
+        recipe=models.RecipeModel(
+            id=id,
+            title=f"test_title {id}",
+            description=f"test_description {id}",
+            ingredients=[],
+        ),
+        highlights=[],
+    )
+
+
+def test_search_cache_hit(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    search = mocker.patch.object(
+        controllers, "_search_recipes", return_value=[make_result(1)]
+    )
+
+    first = controllers.search_recipes([" Apple", "banana "], "alice")
+    second = controllers.search_recipes(["banana", "apple"], "alice")
+
+    assert second is first
+    search.assert_called_once_with(
+        ["apple", "banana"], "alice", None, 1, mocker.ANY, False
+    )
+
+
+def test_search_cache_stats_reported(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    mocker.patch.object(controllers, "_search_recipes", return_value=[])
+
+    controllers.search_recipes(["apple"], "alice")
+    controllers.search_recipes(["apple"], "alice")
+
+    stats = controllers.stats.report()
+    assert stats["Search cache"]["hits"] == 1
+    assert stats["Search cache"]["misses"] == 1
+    assert "cached_rate" in stats["Chat prompt usage"]
+
+
+def test_search_cache_recipes_generation(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    search = mocker.patch.object(
+        controllers, "_search_recipes", return_value=[make_result(1)]
+    )
+
+    controllers.search_recipes(["apple"], "alice")
+    controllers.generations.bump(controllers.RECIPES_GENERATION)
+    controllers.search_recipes(["apple"], "alice")
+
+    assert search.call_count == 2
+
+
+def test_search_cache_user_profile_generation(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    search = mocker.patch.object(
+        controllers, "_search_recipes", return_value=[make_result(1)]
+    )
+
+    controllers.search_recipes(["apple"], "alice")
+    controllers.search_recipes(["apple"], "bob")
+    controllers.invalidate_user_profile("alice")
+    controllers.search_recipes(["apple"], "alice")
+    controllers.search_recipes(["apple"], "bob")
+
+    assert [call.args[1] for call in search.call_args_list] == [
+        "alice",
+        "bob",
+        "alice",
+    ]
+
+
+def test_search_cache_all_user_profiles_generation(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    search = mocker.patch.object(
+        controllers, "_search_recipes", return_value=[make_result(1)]
+    )
+
+    controllers.search_recipes(["apple"], "alice")
+    controllers.invalidate_user_profile(None)
+    controllers.search_recipes(["apple"], "alice")
+
+    assert search.call_count == 2
+
+
+def test_search_recipes_include_detail_drops_missing(
+    controllers: ModuleType,
+    mocker: pytest_mock.MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    mocker.patch.object(controllers, "get_user_profile", return_value=None)
+    search_engine = mocker.patch.object(
+        controllers.searches, "get_search_engine"
+    ).return_value
+    search_engine.search_recipes.return_value = [
+        make_result(1),
+        make_result(2),
+        make_result(3),
+    ]
+    details = {id: make_result(id).recipe for id in (1, 3)}
+    get_recipes = mocker.patch.object(
+        controllers, "get_recipes", return_value=[details[3], details[1]]
+    )
+
+    results = controllers.search_recipes(
+        ["apple"], "alice", include_detail=True
+    )
+
+    assert list(get_recipes.call_args.args[0]) == [1, 2, 3]
+    assert [result.recipe for result in results] == [details[1], details[3]]
+    assert "ids=[2]" in caplog.text
+
+
+def test_set_user_profile_updates_embedding_length(
+    controllers: ModuleType, engine: Engine
+):
+    with Session(engine) as session:
+        session.add(
+            models.UserProfileModel(
+                username="alice",
+                veggie_identity=models.UserProfileModelVeggieIdentity.NONE,
+                prefer=[],
+                dislike=[],
+                embedding=[],
+            )
+        )
+        session.commit()
+
+    controllers.set_user_profile(
+        models.UserProfileModel(
+            username="alice",
+            veggie_identity=models.UserProfileModelVeggieIdentity.VEGAN,
+            prefer=["apple"],
+            dislike=[],
+            embedding=np.ones(768, dtype=np.float32),
+        )
+    )
+
+    with Session(engine) as session:
+        profile = session.get(models.UserProfileModel, "alice")
+        assert profile.veggie_identity == (
+            models.UserProfileModelVeggieIdentity.VEGAN
+        )
+        np.testing.assert_array_equal(profile.embedding, np.ones(768))
+
+
+def test_search_recipes_no_session_during_remote_calls(
+    controllers: ModuleType, mocker: pytest_mock.MockerFixture
+):
+    def without_session(*args, **kwargs):
+        assert db._unit_of_work.get() is None
+        return [make_result(1)]
+
+    def with_session(ids):
+        assert db._unit_of_work.get() is not None
+        return [make_result(id).recipe for id in ids]
+
+    def profile_with_session(username):
+        assert db._unit_of_work.get() is not None
+        return None
+
+    mocker.patch.object(
+        controllers, "get_user_profile", side_effect=profile_with_session
+    )
+    mocker.patch.object(
+        controllers.embeddings, "model"
+    ).return_value.embed.side_effect = without_session
+    mocker.patch.object(
+        controllers.searches, "get_search_engine"
+    ).return_value.search_recipes.side_effect = without_session
+    mocker.patch.object(controllers, "get_recipes", side_effect=with_session)
+
+    results = controllers.search_recipes(
+        ["apple"], "alice", extra_terms="sweet", include_detail=True
+    )
+
+    assert [result.recipe.id for result in results] == [1]
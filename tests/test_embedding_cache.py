@@ -0,0 +1,129 @@
+from typing import List, Sequence
+
+import pytest
+import pytest_mock
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from domain.embeddings import cache as cache_module
+from domain.embeddings.base import BaseEmbedding
+from domain.embeddings.cache import CachedEmbedding, EmbeddingCache
+from infra import models
+
+MODEL = "test-model"
+NUM_DIM = 2
+
+
+@pytest.fixture(autouse=True)
+def engine(mocker: pytest_mock.MockerFixture):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    ).execution_options(schema_translate_map={"public": None})
+    models.Base.metadata.create_all(engine)
+    mocker.patch.object(cache_module, "engine", engine)
+    return engine
+
+
+@pytest.fixture
+def cache(mocker: pytest_mock.MockerFixture) -> EmbeddingCache:
+    cache = EmbeddingCache(
+        max_size=10, bulk_max_size=10, persistent=True, persistent_size=100
+    )
+    mocker.patch.object(cache_module, "cache", cache)
+    return cache
+
+
+class FakeEmbedding(BaseEmbedding):
+    """Embedding model recording the texts it embeds"""
+
+    texts: List[str]
+
+    def __init__(self):
+        self.texts = []
+
+    @staticmethod
+    def model_name() -> str:
+        """Get the name of the model."""
+        return MODEL
+
+    @staticmethod
+    def num_dim() -> int:
+        """Get the number of dimensions."""
+        return NUM_DIM
+
+    def is_healthy(self) -> bool:
+        """Check if the model is healthy."""
+        return True
+
+    def embed(self, text: str) -> List[float]:
+        """Embed the text."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed the texts by length."""
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class CachedFakeEmbedding(CachedEmbedding, FakeEmbedding):
+    """Fake embedding model served through the embedding cache"""
+
+
+def test_embedding_cache_tiers(cache: EmbeddingCache):
+    cache.set("a", MODEL, NUM_DIM, [1.0, 2.0])
+    assert cache.memory.stats()["size"] == 1
+
+    cache.clear()
+
+    assert cache.get_many(["a", "b"]) == [[1.0, 2.0], None]
+    assert cache.memory.stats()["size"] == 1
+    assert cache.get("a") == [1.0, 2.0]
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["persistent"]["hits"] == 1
+    assert stats["persistent"]["misses"] == 1
+
+
+def test_embedding_cache_memory_only():
+    cache = EmbeddingCache(max_size=10)
+
+    assert cache.get("a") is None
+    cache.set("a", MODEL, NUM_DIM, [1.0, 2.0])
+    assert cache.get("a") == [1.0, 2.0]
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_embedding_embed_many(
+    cache: EmbeddingCache, mocker: pytest_mock.MockerFixture
+):
+    embedding = CachedFakeEmbedding()
+
+    first = embedding.embed_many(["apple", "pie", "apple"])
+    cache.bulk_memory.clear()
+    second = embedding.embed_many(["apple", "pie"])
+    query = mocker.spy(cache_module, "Session")
+    third = embedding.embed_many(["apple", "pie"])
+
+    assert first == [[5.0, 1.0], [3.0, 1.0], [5.0, 1.0]]
+    assert second == third == first[:2]
+    assert embedding.texts == ["apple", "pie"]
+    # The persistent hits were kept in the bulk tier, not the query tier
+    query.assert_not_called()
+    assert cache.persistent_hits == 2
+    assert cache.memory.stats()["size"] == 0
+
+
+def test_cached_embedding_embed(cache: EmbeddingCache):
+    embedding = CachedFakeEmbedding()
+
+    assert embedding.embed("apple") == [5.0, 1.0]
+    assert embedding.embed("apple") == [5.0, 1.0]
+
+    assert embedding.texts == ["apple"]
+    assert cache.memory.hits == 1
@@ -1,12 +1,37 @@
+import time
+
 import pytest_mock
 
 from apis.servicer import RecipeSearchServicer
+from domain.model_types import StartupState
 from protos.health_pb2 import HealthCheck, HealthRequest, HealthStatus
 
 
+def mock_checks(
+    mocker: pytest_mock.MockerFixture,
+    healthy: bool,
+    startup_state: StartupState = StartupState.READY,
+):
+    mocker.patch(
+        "domain.controllers.get_startup_state",
+        return_value=startup_state,
+    )
+    return [
+        mocker.patch("infra.db.check_health", return_value=healthy),
+        mocker.patch(
+            "domain.controllers.is_typesense_healthy", return_value=healthy
+        ),
+        mocker.patch(
+            "domain.controllers.is_ollama_healthy", return_value=healthy
+        ),
+        mocker.patch(
+            "domain.controllers.is_azure_openai_healthy", return_value=healthy
+        ),
+    ]
+
+
 def test_get_health_healthy(mocker: pytest_mock.MockerFixture):
-    mocker.patch("infra.db.check_health", return_value=True)
-    mocker.patch("domain.controllers.is_typesense_healthy", return_value=True)
+    mock_checks(mocker, True)
 
     servicer = RecipeSearchServicer()
     request = HealthRequest()
@@ -14,21 +39,17 @@ def test_get_health_healthy(mocker: pytest_mock.MockerFixture):
     response = servicer.GetHealth(request, context)
 
     assert response.status == HealthStatus.HEALTHY
-    assert len(response.checks) == 2
-
-    assert response.checks[0] == HealthCheck(
-        name="PostgreSQL",
-        status=HealthStatus.HEALTHY,
-    )
-    assert response.checks[1] == HealthCheck(
-        name="Typesense",
-        status=HealthStatus.HEALTHY,
-    )
+    assert list(response.checks) == [
+        HealthCheck(name="Startup", status=HealthStatus.HEALTHY),
+        HealthCheck(name="PostgreSQL", status=HealthStatus.HEALTHY),
+        HealthCheck(name="Typesense", status=HealthStatus.HEALTHY),
+        HealthCheck(name="Ollama", status=HealthStatus.HEALTHY),
+        HealthCheck(name="Azure OpenAI", status=HealthStatus.HEALTHY),
+    ]
 
 
 def test_get_health_unhealthy(mocker: pytest_mock.MockerFixture):
-    mocker.patch("infra.db.check_health", return_value=False)
-    mocker.patch("domain.controllers.is_typesense_healthy", return_value=False)
+    mock_checks(mocker, False)
 
     servicer = RecipeSearchServicer()
     request = HealthRequest()
@@ -36,13 +57,87 @@ def test_get_health_unhealthy(mocker: pytest_mock.MockerFixture):
     response = servicer.GetHealth(request, context)
 
     assert response.status == HealthStatus.UNHEALTHY
-    assert len(response.checks) == 2
+    assert list(response.checks) == [
+        HealthCheck(name="Startup", status=HealthStatus.HEALTHY),
+        HealthCheck(name="PostgreSQL", status=HealthStatus.UNHEALTHY),
+        HealthCheck(name="Typesense", status=HealthStatus.UNHEALTHY),
+        HealthCheck(name="Ollama", status=HealthStatus.UNHEALTHY),
+        HealthCheck(name="Azure OpenAI", status=HealthStatus.UNHEALTHY),
+    ]
+
+
+def test_get_health_external_unhealthy(mocker: pytest_mock.MockerFixture):
+    mock_checks(mocker, True)
+    mocker.patch("domain.controllers.is_ollama_healthy", return_value=False)
+    mocker.patch(
+        "domain.controllers.is_azure_openai_healthy", return_value=False
+    )
 
+    servicer = RecipeSearchServicer()
+    request = HealthRequest()
+    context = mocker.MagicMock()
+    response = servicer.GetHealth(request, context)
+
+    assert response.status == HealthStatus.DEGRADED
+    assert list(response.checks)[3:] == [
+        HealthCheck(name="Ollama", status=HealthStatus.UNHEALTHY),
+        HealthCheck(name="Azure OpenAI", status=HealthStatus.UNHEALTHY),
+    ]
+
+
+def test_get_health_starting(mocker: pytest_mock.MockerFixture):
+    mock_checks(mocker, True, StartupState.STARTING)
+
+    servicer = RecipeSearchServicer()
+    request = HealthRequest()
+    context = mocker.MagicMock()
+    response = servicer.GetHealth(request, context)
+
+    assert response.status == HealthStatus.DEGRADED
     assert response.checks[0] == HealthCheck(
-        name="PostgreSQL",
-        status=HealthStatus.UNHEALTHY,
+        name="Startup",
+        status=HealthStatus.DEGRADED,
+    )
+
+
+def test_get_health_timeout_and_latency(mocker: pytest_mock.MockerFixture):
+    mock_checks(mocker, True)
+    mocker.patch(
+        "domain.controllers.is_typesense_healthy",
+        side_effect=lambda: time.sleep(1) or True,
     )
-    assert response.checks[1] == HealthCheck(
+    mocker.patch(
+        "domain.controllers.is_ollama_healthy",
+        side_effect=lambda: time.sleep(0.1) or True,
+    )
+
+    servicer = RecipeSearchServicer()
+    servicer.health_checker.timeout = 0.5
+    servicer.health_checker.degraded = 0.05
+    request = HealthRequest()
+    context = mocker.MagicMock()
+    response = servicer.GetHealth(request, context)
+
+    assert response.status == HealthStatus.UNHEALTHY
+    assert response.checks[2] == HealthCheck(
         name="Typesense",
         status=HealthStatus.UNHEALTHY,
     )
+    assert response.checks[3] == HealthCheck(
+        name="Ollama",
+        status=HealthStatus.DEGRADED,
+    )
+
+
+def test_get_health_cached(mocker: pytest_mock.MockerFixture):
+    mocks = mock_checks(mocker, True)
+
+    servicer = RecipeSearchServicer()
+    request = HealthRequest()
+    context = mocker.MagicMock()
+    first = servicer.GetHealth(request, context)
+    second = servicer.GetHealth(request, context)
+
+    assert first == second
+    for mock in mocks:
+        mock.assert_called_once_with()
@@ -3,6 +3,7 @@ import pytest
 import pytest_mock
 from sqlalchemy.exc import NoResultFound
 
+from apis.async_servicer import AsyncRecipeSearchServicer
 from apis.servicer import RecipeSearchServicer
 from infra import models
 from protos.recipe_pb2 import RecipeRequest
@@ -64,6 +65,57 @@ def test_get_recipe_success(
     assert response.nutrition.carbs == recipe.nutrition.carbs.to_proto()
 
 
+def test_get_recipe_reuses_response(
+    mocker: pytest_mock.MockerFixture,
+):
+    recipe = models.RecipeModel(
+        id=1,
+        title="test_title",
+        description="test_description",
+        ingredients=[],
+        directions=[],
+        tips=[],
+        utensils=[],
+        nutrition=models.RecipeModelNutrition(
+            calories=models.RecipeModelNutritionValue.high,
+            fat=models.RecipeModelNutritionValue.low,
+            protein=models.RecipeModelNutritionValue.medium,
+            carbs=models.RecipeModelNutritionValue.none,
+        ),
+    )
+    request = RecipeRequest(
+        id=recipe.id,
+    )
+
+    mock_get_recipe = mocker.patch(
+        "domain.controllers.get_recipe",
+        return_value=recipe,
+    )
+
+    context = mocker.MagicMock()
+
+    servicer = RecipeSearchServicer()
+    first = servicer.GetRecipe(request, context)
+    second = servicer.GetRecipe(request, context)
+
+    assert second is first
+
+    mock_get_recipe.return_value = models.RecipeModel(
+        id=recipe.id,
+        title="new_title",
+        description="test_description",
+        ingredients=[],
+        directions=[],
+        tips=[],
+        utensils=[],
+        nutrition=recipe.nutrition,
+    )
+    third = servicer.GetRecipe(request, context)
+
+    assert third is not first
+    assert third.title == "new_title"
+
+
 def test_get_recipe_not_found(
     mocker: pytest_mock.MockerFixture,
 ):
@@ -89,3 +141,24 @@ def test_get_recipe_not_found(
         grpc.StatusCode.NOT_FOUND,
         f"Recipe with ID {id} not found",
     )
+
+
+def test_get_recipe_not_found_async(
+    mocker: pytest_mock.MockerFixture,
+):
+    mocker.patch(
+        "domain.controllers.get_recipe",
+        side_effect=NoResultFound(),
+    )
+
+    # The context of a synchronous method on grpc.aio does not raise
+    context = mocker.MagicMock()
+
+    servicer = AsyncRecipeSearchServicer()
+    with pytest.raises(grpc.RpcError):
+        servicer.GetRecipe(RecipeRequest(id=1), context)
+
+    context.abort.assert_called_once_with(
+        grpc.StatusCode.NOT_FOUND,
+        "Recipe with ID 1 not found",
+    )
@@ -0,0 +1,73 @@
+import threading
+
+import grpc
+import pytest
+import pytest_mock
+
+from apis.lanes import IsolatedServicer, RpcLane, RpcLimiter
+from apis.servicer import RecipeSearchServicer
+
+
+def test_rpc_limiter_rejects_full_lane(mocker: pytest_mock.MockerFixture):
+    limiter = RpcLimiter("test", 1)
+    # The context of a synchronous method on grpc.aio does not raise
+    context = mocker.MagicMock()
+    inner_calls = []
+
+    def method(request, context):
+        inner_calls.append(request)
+        with pytest.raises(grpc.RpcError):
+            wrapped("rejected", context)
+        return "response"
+
+    wrapped = limiter.wrap(method)
+
+    assert wrapped("accepted", context) == "response"
+    assert inner_calls == ["accepted"]
+    context.abort.assert_called_once_with(
+        grpc.StatusCode.RESOURCE_EXHAUSTED,
+        "Server is busy, please try again later",
+    )
+    # The rejected RPC did not release a slot it never took
+    assert limiter._slots.acquire(blocking=False)
+    assert not limiter._slots.acquire(blocking=False)
+
+
+def test_rpc_limiter_stream(mocker: pytest_mock.MockerFixture):
+    limiter = RpcLimiter("test", 1)
+    context = mocker.MagicMock()
+
+    def method(request, context):
+        yield from request
+
+    responses = limiter.wrap(method)([1, 2], context)
+
+    assert list(responses) == [1, 2]
+    assert limiter._slots.acquire(blocking=False)
+
+
+def test_rpc_limiter_waits_for_slot(mocker: pytest_mock.MockerFixture):
+    limiter = RpcLimiter("test", 1, timeout=5)
+    context = mocker.MagicMock()
+    limiter._slots.acquire()
+    threading.Timer(0.05, limiter._slots.release).start()
+
+    assert limiter.wrap(lambda request, context: request)(1, context) == 1
+    context.abort.assert_not_called()
+
+
+def test_isolated_servicer_lanes(mocker: pytest_mock.MockerFixture):
+    servicer = RecipeSearchServicer()
+    lanes = {
+        RpcLane.FAST: RpcLimiter(RpcLane.FAST, 1),
+        RpcLane.SLOW: RpcLimiter(RpcLane.SLOW, 1),
+    }
+    wrap = {lane: mocker.spy(lanes[lane], "wrap") for lane in lanes}
+
+    isolated = IsolatedServicer(servicer, lanes)
+
+    assert isolated.GetHealth == servicer.GetHealth
+    isolated.SearchRecipes
+    isolated.ChatByRecipe
+    wrap[RpcLane.FAST].assert_called_once_with(servicer.SearchRecipes)
+    wrap[RpcLane.SLOW].assert_called_once_with(servicer.ChatByRecipe)
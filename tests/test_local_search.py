@@ -0,0 +1,141 @@
+import os
+from typing import List
+
+import numpy as np
+import pytest
+import pytest_mock
+
+from domain.searches.local import LocalIndex, LocalSearchEngine, normalize
+from infra import models
+
+NUM_DIM = 3
+
+
+def make_recipe(
+    id: int, title: str, ingredients: List[str]
+) -> models.RecipeModel:
+    return models.RecipeModel(
+        id=id,
+        title=title,
+        description=f"{title} description",
+        ingredients=[
+            models.RecipeModelIngredient(name=ingredient)
+            for ingredient in ingredients
+        ],
+    )
+
+
+@pytest.fixture
+def search_engine(
+    tmp_path, mocker: pytest_mock.MockerFixture
+) -> LocalSearchEngine:
+    model = mocker.patch("domain.searches.local.embeddings.model")
+    model.num_dim.return_value = NUM_DIM
+    mocker.patch("domain.searches.local.Session")
+
+    return LocalSearchEngine(str(tmp_path / "index"))
+
+
+def add_sample_recipes(search_engine: LocalSearchEngine):
+    search_engine.add_recipes(
+        [
+            make_recipe(1, "Apple pie", ["apple", "flour", "butter"]),
+            make_recipe(2, "Banana bread", ["banana", "flour"]),
+            make_recipe(3, "Apple banana smoothie", ["apple", "banana"]),
+        ],
+        [[1, 0, 0], [0, 1, 0], [0.6, 0.8, 0]],
+    )
+
+
+def test_local_search_save_load(search_engine: LocalSearchEngine):
+    add_sample_recipes(search_engine)
+
+    loaded = LocalSearchEngine(search_engine.path)
+
+    assert loaded.generation == search_engine.generation
+    assert loaded.index.documents == search_engine.index.documents
+    np.testing.assert_allclose(
+        loaded.index.vectors, search_engine.index.vectors
+    )
+    assert loaded.is_healthy()
+
+
+def test_local_search_add_appends(search_engine: LocalSearchEngine):
+    generation = search_engine.generation
+    add_sample_recipes(search_engine)
+    first = search_engine.index
+
+    search_engine.add_recipes(
+        [make_recipe(4, "Cherry tart", ["cherry"])], [[0, 0, 1]]
+    )
+
+    assert search_engine.generation == generation
+    assert search_engine.index.size == 4
+    assert first.size == 3
+    assert first.search_keywords({"cherry"}) == []
+    assert search_engine.index.search_keywords({"cherry"}) == [3]
+    assert LocalSearchEngine(search_engine.path).index.size == 4
+
+
+def test_local_search_remove_all(search_engine: LocalSearchEngine):
+    add_sample_recipes(search_engine)
+    old_vectors_path = search_engine.vectors_path(search_engine.generation)
+
+    search_engine.remove_all_recipes()
+
+    assert search_engine.index.size == 0
+    assert search_engine.search_recipes(["apple"], None) == []
+    assert not os.path.exists(old_vectors_path)
+    assert LocalSearchEngine(search_engine.path).index.size == 0
+
+
+def test_local_search_keywords(search_engine: LocalSearchEngine):
+    add_sample_recipes(search_engine)
+
+    results = search_engine.search_recipes(["apple", "banana"], None)
+
+    assert [result.recipe.id for result in results] == [3, 1, 2]
+    assert results[0].highlights
+
+
+def test_local_search_vector_matches_ingredients_first(
+    search_engine: LocalSearchEngine,
+):
+    add_sample_recipes(search_engine)
+
+    results = search_engine.search_recipes(["banana"], [1, 0, 0])
+
+    assert [result.recipe.id for result in results] == [3, 2, 1]
+
+
+def test_local_search_vector_without_ingredients(
+    search_engine: LocalSearchEngine,
+):
+    add_sample_recipes(search_engine)
+
+    results = search_engine.search_recipes([], [0, 1, 0])
+
+    assert [result.recipe.id for result in results] == [2, 3, 1]
+
+
+def test_local_index_scores_rows_after_lists():
+    rng = np.random.default_rng(0)
+    documents = [
+        {"id": id, "title": "", "description": "", "ingredients": []}
+        for id in range(20)
+    ]
+    index = LocalIndex.create(
+        documents, normalize(rng.normal(size=(20, NUM_DIM)))
+    )
+    index.build_lists(4)
+
+    query = [0, 0, 1]
+    extended = index.extend(
+        [{"id": 20, "title": "", "description": "", "ingredients": []}],
+        normalize(np.vstack([index.vectors, [query]])),
+    )
+
+    assert extended.listed == 20
+    assert extended.needs_lists(4, 0.01)
+    assert not extended.needs_lists(4, 0.1)
+    assert extended.search_vector(query, 1, probes=1)[0] == 20
@@ -0,0 +1,84 @@
+from typing import Dict, List
+
+import ollama
+import pytest
+import pytest_mock
+
+from configs.ollama import configs
+from domain.embeddings import ollama as ollama_module
+from domain.embeddings.ollama import OllamaWorkers
+
+HOSTS = ["http://ollama-a:11434", "http://ollama-b:11434"]
+EMBEDDINGS = [[1.0, 2.0]]
+
+
+@pytest.fixture
+def hosts(mocker: pytest_mock.MockerFixture) -> Dict[str, object]:
+    hosts = {host: mocker.Mock() for host in HOSTS}
+    for client in hosts.values():
+        client.embed.return_value = mocker.Mock(embeddings=EMBEDDINGS)
+    mocker.patch.object(
+        ollama_module.clients, "ollama_client", side_effect=hosts.__getitem__
+    )
+    return hosts
+
+
+@pytest.fixture
+def sleep(mocker: pytest_mock.MockerFixture):
+    return mocker.patch.object(ollama_module.time, "sleep")
+
+
+def delays(sleep) -> List[float]:
+    return [call.args[0] for call in sleep.call_args_list]
+
+
+def test_ollama_workers_retry_on_next_host(hosts, sleep):
+    hosts[HOSTS[0]].embed.side_effect = ollama.ResponseError("busy", 503)
+    workers = OllamaWorkers(HOSTS, workers=1, max_retries=3, backoff=0.5)
+
+    assert workers.embed("apple") == EMBEDDINGS
+
+    hosts[HOSTS[0]].embed.assert_called_once_with(
+        model=configs.ollama_model, input="apple"
+    )
+    hosts[HOSTS[1]].embed.assert_called_once_with(
+        model=configs.ollama_model, input="apple"
+    )
+    assert delays(sleep) == [0.5]
+
+
+@pytest.mark.parametrize("max_retries", [0, 1, 3])
+def test_ollama_workers_max_retries(hosts, sleep, max_retries: int):
+    for client in hosts.values():
+        client.embed.side_effect = ollama.ResponseError("busy", 503)
+    workers = OllamaWorkers(
+        HOSTS, workers=1, max_retries=max_retries, backoff=0.5
+    )
+
+    with pytest.raises(ollama.ResponseError):
+        workers.embed("apple")
+
+    attempts = sum(client.embed.call_count for client in hosts.values())
+    assert attempts == max_retries + 1
+    assert delays(sleep) == [0.5 * 2**i for i in range(max_retries)]
+
+
+def test_ollama_workers_no_retry_on_client_error(hosts, sleep):
+    hosts[HOSTS[0]].embed.side_effect = ollama.ResponseError("bad", 400)
+    workers = OllamaWorkers(HOSTS, workers=1, max_retries=3, backoff=0.5)
+
+    with pytest.raises(ollama.ResponseError):
+        workers.embed("apple")
+
+    hosts[HOSTS[1]].embed.assert_not_called()
+    sleep.assert_not_called()
+
+
+def test_ollama_workers_from_configs():
+    assert ollama_module.workers.hosts == configs.hosts
+    assert ollama_module.workers.max_retries == (
+        configs.ollama_embed_max_retries
+    )
+    assert ollama_module.workers.backoff == (
+        configs.ollama_embed_retry_backoff_seconds
+    )
@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+
+import psycopg_pool
+import pytest
+import pytest_mock
+from sqlalchemy import exc
+
+from infra.pools import PoolMetrics, PsycopgPool, TimedQueuePool
+
+
+def sqlite_connection() -> sqlite3.Connection:
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_timed_queue_pool_records_wait(caplog: pytest.LogCaptureFixture):
+    pool = TimedQueuePool(
+        sqlite_connection,
+        metrics=PoolMetrics(slow_threshold=0.05),
+        pool_size=1,
+        max_overflow=0,
+        timeout=5,
+    )
+    connection = pool.connect()
+    threading.Timer(0.1, connection.close).start()
+
+    pool.connect().close()
+
+    stats = pool.metrics.stats()
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 0
+    assert stats["max_wait"] >= 0.1
+    assert "for a database connection" in caplog.text
+
+
+def test_timed_queue_pool_records_timeout():
+    pool = TimedQueuePool(
+        sqlite_connection,
+        metrics=PoolMetrics(slow_threshold=1),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.01,
+    )
+    connection = pool.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    assert pool.metrics.stats()["timeouts"] == 1
+    assert pool.recreate().metrics is pool.metrics
+
+
+def test_psycopg_pool_lends_connections(mocker: pytest_mock.MockerFixture):
+    psycopg_connection = mocker.MagicMock()
+    connection_pool = mocker.MagicMock()
+    connection_pool.getconn.return_value = psycopg_connection
+    pool = PsycopgPool(connection_pool, PoolMetrics(slow_threshold=1))
+
+    connection = pool.connect()
+    assert connection.dbapi_connection is psycopg_connection
+    connection.close()
+
+    connection_pool.putconn.assert_called_once_with(psycopg_connection)
+    psycopg_connection.close.assert_not_called()
+    assert pool.metrics.stats()["checkouts"] == 1
+    assert pool.recreate().pool is connection_pool
+
+
+def test_psycopg_pool_records_timeout(mocker: pytest_mock.MockerFixture):
+    connection_pool = mocker.MagicMock()
+    connection_pool.getconn.side_effect = psycopg_pool.PoolTimeout()
+    pool = PsycopgPool(connection_pool, PoolMetrics(slow_threshold=1))
+
+    with pytest.raises(psycopg_pool.PoolTimeout):
+        pool.connect()
+
+    assert pool.metrics.stats() == {
+        "checkouts": 0,
+        "timeouts": 1,
+        "average_wait": 0.0,
+        "max_wait": 0.0,
+    }
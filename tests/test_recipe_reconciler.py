@@ -0,0 +1,131 @@
+from typing import Dict, Iterable
+
+import pytest
+import pytest_mock
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from domain.searches.typesense import RecipeReconciler
+from infra import models
+
+COLLECTION = "recipes_v1"
+
+
+def make_recipe(id: int, title: str) -> models.RecipeModel:
+    return models.RecipeModel(
+        id=id,
+        title=title,
+        description=f"{title} description",
+        ingredients=[],
+        directions=[],
+        tips=[],
+        utensils=[],
+        nutrition=models.RecipeModelNutrition(
+            calories=models.RecipeModelNutritionValue.none,
+            fat=models.RecipeModelNutritionValue.none,
+            protein=models.RecipeModelNutritionValue.none,
+            carbs=models.RecipeModelNutritionValue.none,
+        ),
+        veggie_identity=models.UserProfileModelVeggieIdentity.NONE,
+    )
+
+
+@pytest.fixture
+def engine(mocker: pytest_mock.MockerFixture) -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    ).execution_options(schema_translate_map={"public": None})
+    models.Base.metadata.create_all(engine)
+    mocker.patch("domain.searches.typesense.engine", engine)
+
+    with Session(engine) as session:
+        session.add_all(
+            [
+                make_recipe(1, "Apple pie"),
+                make_recipe(2, "Banana bread"),
+                make_recipe(3, "Cherry tart"),
+            ]
+        )
+        session.commit()
+
+    return engine
+
+
+def test_recipe_reconciler(
+    engine: Engine, mocker: pytest_mock.MockerFixture
+):
+    model = mocker.patch("domain.searches.typesense.embeddings.model")
+    model.return_value.recipe_hash.side_effect = (
+        lambda recipe: f"hash {recipe.title}"
+    )
+    model.return_value.embed_recipes.side_effect = lambda recipes: [
+        [float(recipe.id)] for recipe in recipes
+    ]
+
+    indexed_hashes = {1: "hash Apple pie", 2: "hash Old banana bread"}
+
+    def content_hashes(
+        ids: Iterable[int], collection: str
+    ) -> Dict[int, str]:
+        return {
+            id: indexed_hashes[id] for id in ids if id in indexed_hashes
+        }
+
+    search_engine = mocker.MagicMock()
+    search_engine.content_hashes.side_effect = content_hashes
+    search_engine.all_ids.return_value = {1, 2, 4}
+
+    reconciler = RecipeReconciler(search_engine, COLLECTION, batch_size=2)
+    reconciler.reconcile()
+
+    imported = [
+        ([recipe.id for recipe in call.args[0]], call.args[1], call.args[2])
+        for call in search_engine.import_recipes.call_args_list
+    ]
+    assert imported == [
+        ([2], [[2.0]], COLLECTION),
+        ([3], [[3.0]], COLLECTION),
+    ]
+    search_engine.remove_recipes.assert_called_once_with({4}, COLLECTION)
+    search_engine.recipes_count.refresh.assert_called_once()
+    assert reconciler.checkpoint == 0
+
+    with Session(engine) as session:
+        assert dict(
+            session.execute(
+                select(models.RecipeModel.id, models.RecipeModel.content_hash)
+            ).all()
+        ) == {
+            1: "hash Apple pie",
+            2: "hash Banana bread",
+            3: "hash Cherry tart",
+        }
+
+
+def test_recipe_reconciler_unchanged(
+    engine: Engine, mocker: pytest_mock.MockerFixture
+):
+    model = mocker.patch("domain.searches.typesense.embeddings.model")
+    model.return_value.recipe_hash.side_effect = (
+        lambda recipe: f"hash {recipe.title}"
+    )
+
+    search_engine = mocker.MagicMock()
+    indexed_hashes = {
+        1: "hash Apple pie",
+        2: "hash Banana bread",
+        3: "hash Cherry tart",
+    }
+    search_engine.content_hashes.side_effect = lambda ids, collection: {
+        id: indexed_hashes[id] for id in ids
+    }
+    search_engine.all_ids.return_value = {1, 2, 3}
+
+    RecipeReconciler(search_engine, COLLECTION, batch_size=2).reconcile()
+
+    search_engine.import_recipes.assert_not_called()
+    model.return_value.embed_recipes.assert_not_called()
+    search_engine.remove_recipes.assert_called_once_with(set(), COLLECTION)
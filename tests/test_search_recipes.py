@@ -2,6 +2,7 @@ import grpc
 import pytest
 import pytest_mock
 
+from apis.async_servicer import AsyncRecipeSearchServicer
 from apis.servicer import RecipeSearchServicer
 from configs.domain import configs
 from infra import models
@@ -473,3 +474,23 @@ def test_search_recipes_per_page_zero(
         grpc.StatusCode.INVALID_ARGUMENT,
         "Per page must be a positive integer",
     )
+
+
+def test_search_recipes_empty_ingredients_async(
+    mocker: pytest_mock.MockerFixture,
+):
+    mock_search_recipes = mocker.patch("domain.controllers.search_recipes")
+    request = SearchRecipesRequest(username="test_username", ingredients=[])
+
+    # The context of a synchronous method on grpc.aio does not raise
+    context = mocker.MagicMock()
+
+    servicer = AsyncRecipeSearchServicer()
+    with pytest.raises(grpc.RpcError):
+        servicer.SearchRecipes(request, context)
+
+    mock_search_recipes.assert_not_called()
+    context.abort.assert_called_once_with(
+        grpc.StatusCode.INVALID_ARGUMENT,
+        "Ingredients cannot be empty",
+    )
@@ -0,0 +1,21 @@
+import logging
+
+import pytest
+
+from domain.stats import StatsReporter
+
+
+def test_stats_reporter_logs_sources(caplog: pytest.LogCaptureFixture):
+    caplog.set_level(logging.INFO)
+
+    def failing():
+        raise RuntimeError("unavailable")
+
+    reporter = StatsReporter(
+        [("Failing", failing), ("Database pool", lambda: {"checkouts": 1})],
+        interval=None,
+    )
+
+    assert reporter.report() == {"Database pool": {"checkouts": 1}}
+    assert "Database pool stats: {'checkouts': 1}" in caplog.text
+    assert "Failed to get the Failing stats: unavailable" in caplog.text
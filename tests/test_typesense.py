@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+import pytest
+
+from domain.searches.typesense import DocumentCounter, VectorQueryFormatter
+
+
+def test_document_counter_refreshes_after_invalidate():
+    fetched = []
+
+    def fetch() -> int:
+        fetched.append(True)
+        return 3
+
+    counter = DocumentCounter(fetch, ttl=60, count=3)
+    # Re-adding 2 indexed documents
+    counter.add(2)
+    counter.invalidate()
+
+    assert counter.get() == 5
+
+    deadline = time.monotonic() + 5
+    while counter.get() != 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert counter.get() == 3
+    assert fetched == [True]
+
+
+@pytest.mark.parametrize("precision", [3, 6])
+def test_vector_query_formatter_precision(precision: int):
+    formatter = VectorQueryFormatter(
+        "embedding", precision=precision, cache_size=10
+    )
+    embedding = np.random.default_rng(0).normal(size=768) * 1e-3
+
+    query = formatter.format(embedding)
+
+    assert query.startswith("embedding:([") and query.endswith("])")
+    values = [
+        float(value) for value in query[len("embedding:([") : -2].split(",")
+    ]
+    np.testing.assert_allclose(
+        values, embedding.astype(np.float32), rtol=10 ** (1 - precision)
+    )
+
+
+def test_vector_query_formatter_cache():
+    formatter = VectorQueryFormatter("embedding", precision=6, cache_size=10)
+
+    first = formatter.format([0.1, 0.2, 0.3])
+    second = formatter.format(np.array([0.1, 0.2, 0.3], dtype=np.float32))
+    formatter.format([0.3, 0.2, 0.1])
+
+    assert second == first
+    assert formatter.cache.hits == 1
+    assert formatter.cache.misses == 2